@@ -7,7 +7,7 @@ import os
 from flask import Flask
 from flask_login import LoginManager
 from flask_sqlalchemy import SQLAlchemy
-from importlib import import_module
+from apps.startup import import_profiled, profile_step
 
 db = SQLAlchemy()
 login_manager = LoginManager()
@@ -18,10 +18,21 @@ def register_extensions(app):
 
 def register_blueprints(app):
     for module_name in ('authentication', 'home', 'dyn_dt', 'charts', ):
-        module = import_module('apps.{}.routes'.format(module_name))
+        module = import_profiled('apps.{}.routes'.format(module_name))
         app.register_blueprint(module.blueprint)
 
-from apps.authentication.oauth import github_blueprint, google_blueprint
+def register_commands(app):
+    for module_name in ('home', ):
+        module = import_profiled('apps.{}.commands'.format(module_name))
+        for command in module.commands:
+            app.cli.add_command(command)
+
+def register_oauth(app, config):
+    # flask_dance blueprints are only loaded when a provider is configured
+    if getattr(config, 'SOCIAL_AUTH_GITHUB', False) or getattr(config, 'SOCIAL_AUTH_GOOGLE', False):
+        from apps.authentication.oauth import github_blueprint, google_blueprint
+        app.register_blueprint(github_blueprint, url_prefix="/login")
+        app.register_blueprint(google_blueprint, url_prefix="/login")
 
 def create_app(config):
 
@@ -38,8 +49,10 @@ def create_app(config):
     app = Flask(__name__, static_url_path=static_prefix, template_folder=TEMPLATES_FOLDER, static_folder=STATIC_FOLDER)
 
     app.config.from_object(config)
-    register_extensions(app)
+    with profile_step('register_extensions'):
+        register_extensions(app)
     register_blueprints(app)
-    app.register_blueprint(github_blueprint, url_prefix="/login")    
-    app.register_blueprint(google_blueprint, url_prefix="/login")    
+    register_commands(app)
+    with profile_step('register_oauth'):
+        register_oauth(app, config)
     return app
@@ -3,13 +3,18 @@
 Copyright (c) 2019 - present AppSeed.us
 """
 
+import time
+
 from flask_login import UserMixin
 
+from sqlalchemy import event
 from sqlalchemy.exc import SQLAlchemyError, IntegrityError
+from sqlalchemy.orm import make_transient_to_detached
 from flask_dance.consumer.storage.sqla import OAuthConsumerMixin
 
 from apps import db, login_manager
 from apps.authentication.util import hash_pass
+from apps.config import Config
 
 class Users(db.Model, UserMixin):
 
@@ -77,14 +82,47 @@ class Users(db.Model, UserMixin):
             raise IntegrityError(error, 422)
         return
 
+# Per-process TTL cache of user rows (column values), keyed by id
+_user_cache = {}
+
+def cache_user(user):
+    _user_cache[user.id] = (time.monotonic(), {
+        column.key: getattr(user, column.key) for column in Users.__mapper__.column_attrs
+    })
+
+def forget_user(id):
+    _user_cache.pop(int(id), None)
+
+@event.listens_for(Users, 'after_update')
+@event.listens_for(Users, 'after_delete')
+def _forget_changed_user(mapper, connection, target):
+    forget_user(target.id)
+
+def load_cached_user(id):
+    entry = _user_cache.get(int(id))
+    if entry and time.monotonic() - entry[0] < Config.USER_CACHE_TTL:
+        # Rebuild a clean instance and attach it to the session without a query
+        user = Users.__mapper__.class_manager.new_instance()
+        for key, value in entry[1].items():
+            setattr(user, key, value)
+        make_transient_to_detached(user)
+        return db.session.merge(user, load=False)
+
+    user = Users.query.filter_by(id=id).first()
+    if user:
+        cache_user(user)
+    return user
+
 @login_manager.user_loader
 def user_loader(id):
-    return Users.query.filter_by(id=id).first()
+    return load_cached_user(id)
 
 @login_manager.request_loader
 def request_loader(request):
     username = request.form.get('username')
-    user = Users.query.filter_by(username=username).first()
+    if not username:
+        return None
+    user = Users.find_by_username(username)
     return user if user else None
 
 class OAuth(OAuthConsumerMixin, db.Model):
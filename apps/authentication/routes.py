@@ -10,13 +10,10 @@ from flask_login import (
     logout_user
 )
 
-from flask_dance.contrib.github import github
-from flask_dance.contrib.google import google
-
 from apps import db, login_manager
 from apps.authentication import blueprint
 from apps.authentication.forms import LoginForm, CreateAccountForm
-from apps.authentication.models import Users
+from apps.authentication.models import Users, forget_user
 from apps.config import Config
 from apps.authentication.util import verify_pass
 
@@ -30,6 +27,8 @@ def route_default():
 @blueprint.route("/github")
 def login_github():
     """ Github login """
+    from flask_dance.contrib.github import github
+
     if not github.authorized:
         return redirect(url_for("github.login"))
 
@@ -40,6 +39,8 @@ def login_github():
 @blueprint.route("/google")
 def login_google():
     """ Google login """
+    from flask_dance.contrib.google import google
+
     if not google.authorized:
         return redirect(url_for("google.login"))
 
@@ -119,6 +120,8 @@ def register():
 
 @blueprint.route('/logout')
 def logout():
+    if current_user.is_authenticated:
+        forget_user(current_user.id)
     logout_user()
     return redirect(url_for('authentication_blueprint.login'))
 
@@ -18,6 +18,39 @@ class Config(object):
     CELERY_RESULT_BACKEND = "redis://localhost:6379"
     CELERY_HOSTMACHINE    = "celery@app-generator"
 
+    # Análise completa executada como job Celery (fallback síncrono se o broker estiver indisponível)
+    ANALISE_ASSINCRONA = os.getenv('ANALISE_ASSINCRONA', 'True') == 'True'
+    # Acompanhamento do job por SSE: intervalo de leitura do estado e duração máxima (s)
+    ANALISE_STREAM_INTERVALO = float(os.getenv('ANALISE_STREAM_INTERVALO', 0.5))
+    ANALISE_STREAM_TIMEOUT = int(os.getenv('ANALISE_STREAM_TIMEOUT', 600))
+    # Streams simultâneos por processo (cada um ocupa uma thread do gunicorn); acima disso, 503 e polling
+    ANALISE_STREAM_MAX = int(os.getenv('ANALISE_STREAM_MAX', max(int(os.getenv('GUNICORN_THREADS', 8)) // 2, 1)))
+
+    # Triagem em lote (/api/triagem-lote e `flask triagem-lote`)
+    TRIAGEM_LOTE_MAX_DOCUMENTOS = int(os.getenv('TRIAGEM_LOTE_MAX_DOCUMENTOS', 50000))
+    TRIAGEM_LOTE_CONCORRENCIA   = int(os.getenv('TRIAGEM_LOTE_CONCORRENCIA', 4))
+
+    # Snapshot do dashboard, recalculado pelo Celery beat ou quando os dados mudam
+    SNAPSHOT_DIR                = os.getenv('SNAPSHOT_DIR', os.path.join(BASE_DIR.parent, 'data', 'snapshots'))
+    SNAPSHOT_INTERVALO_MINUTOS  = int(os.getenv('SNAPSHOT_INTERVALO_MINUTOS', 5))
+    SNAPSHOT_VERSOES_MANTIDAS   = 5
+
+    # Hashes do último snapshot do CEIS/CNEP aplicado por `flask atualizar-sancoes`
+    DELTA_DIR = os.getenv('DELTA_DIR', os.path.join(BASE_DIR.parent, 'data', 'delta'))
+
+    # Dynamic DataTables: settings cache versioned by stamp files shared between workers
+    DYN_DT_CACHE_DIR = os.getenv('DYN_DT_CACHE_DIR', os.path.join(BASE_DIR.parent, 'data', 'cache'))
+    # Seek pagination with opaque cursors (?page=N keeps the OFFSET mode); COUNT cached for N seconds,
+    # at most DYN_DT_COUNT_CACHE_SIZE (table, filters, search) entries per process
+    DYN_DT_KEYSET_PAGINATION = os.getenv('DYN_DT_KEYSET_PAGINATION', 'True') == 'True'
+    DYN_DT_COUNT_TTL         = int(os.getenv('DYN_DT_COUNT_TTL', 60))
+    DYN_DT_COUNT_CACHE_SIZE  = int(os.getenv('DYN_DT_COUNT_CACHE_SIZE', 1024))
+    # Search box backed by SQLite FTS5 / PostgreSQL tsvector indexes (ILIKE otherwise)
+    DYN_DT_FULLTEXT_SEARCH   = os.getenv('DYN_DT_FULLTEXT_SEARCH', 'True') == 'True'
+
+    # Users loaded by Flask-Login are cached per process for N seconds
+    USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 60))
+
     # Set up the App SECRET_KEY
     SECRET_KEY  = os.getenv('SECRET_KEY', 'S3cret_999')
 
@@ -82,7 +115,23 @@ class Config(object):
         SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(BASE_DIR, 'db.sqlite3')
 
     DYNAMIC_DATATB = {
-        "products": "apps.models.Product"
+        "products": "apps.models.Product",
+        "sancoes": "apps.models.Sancao",
+        "contratos": "apps.models.Contrato",
+        "alertas_integridade": "apps.models.AlertaIntegridade",
+        "consultas_integridade": "apps.models.ConsultaIntegridade",
+        "politicos": "apps.models.PoliticoProfile",
+    }
+
+    # Per-table options (large tables): default ordering on an indexed column,
+    # ordering restricted to indexed columns, page size and export row limits.
+    # JSON columns are never listed; they are shown on the detail page only.
+    DYNAMIC_DATATB_OPTIONS = {
+        "sancoes": {"order_by": "cpf_cnpj", "indexed_order_only": True, "max_page_items": 100, "max_export_rows": 200000},
+        "contratos": {"order_by": "cpf_cnpj_contratado", "indexed_order_only": True, "max_page_items": 100, "max_export_rows": 200000},
+        "alertas_integridade": {"order_by": "cpf_cnpj", "indexed_order_only": True, "max_page_items": 100, "max_export_rows": 100000},
+        "consultas_integridade": {"order_by": "id", "indexed_order_only": True, "max_page_items": 50, "max_export_rows": 50000},
+        "politicos": {"order_by": "cpf", "indexed_order_only": True, "max_page_items": 100, "max_export_rows": 100000},
     }
 
     CDN_DOMAIN = os.getenv('CDN_DOMAIN')
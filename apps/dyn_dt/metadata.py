@@ -0,0 +1,160 @@
+# -*- encoding: utf-8 -*-
+"""
+Copyright (c) 2019 - present AppSeed.us
+"""
+
+import fcntl, os, threading
+from pathlib import Path
+from types import SimpleNamespace
+from sqlalchemy import JSON, select, union_all, literal, cast, Integer, String, DateTime, Text
+from apps import db, config
+from apps.dyn_dt.utils import PageItems, HideShowFilter, ModelFilter, get_model_field_names, name_to_class, exclude_auto_gen_fields
+
+DEFAULT_PAGE_ITEMS = 25
+DEFAULT_OPTIONS = {'order_by': 'id', 'indexed_order_only': False, 'max_page_items': None, 'max_export_rows': None}
+
+_model_cache = {}
+_table_cache = {}
+_lock = threading.Lock()
+
+
+def _stamp_path(parent):
+    return Path(config.Config.DYN_DT_CACHE_DIR) / f'dyn_dt-{parent}.stamp'
+
+
+def _stamp(parent):
+    """Version of a table's settings (a counter), shared by all worker processes."""
+    try:
+        return _stamp_path(parent).read_text() or None
+    except FileNotFoundError:
+        return None
+
+
+def model_metadata(aModelClass):
+    """Schema-derived metadata (field lists, types, enum choices), built once per model."""
+    metadata = _model_cache.get(aModelClass)
+    if metadata is not None:
+        return metadata
+
+    json_fields = [field.name for field in aModelClass.__table__.columns if isinstance(field.type, JSON)]
+    db_fields = [
+        field.name for field in aModelClass.__table__.columns
+        if not field.foreign_keys and field.name not in json_fields
+    ]
+
+    indexed_fields = {field.name for field in aModelClass.__table__.columns if field.primary_key or field.index or field.unique}
+    for index in aModelClass.__table__.indexes:
+        indexed_fields.add(list(index.columns)[0].name)
+
+    choices_dict = {}
+    for column in aModelClass.__table__.columns:
+        if isinstance(column.type, db.Enum):
+            choices_dict[column.name] = [(choice.name, choice.value) for choice in column.type.enum_class]
+
+    metadata = {
+        'db_fields': db_fields,
+        'db_field_names': [column.name for column in aModelClass.__table__.columns if column.name not in json_fields],
+        'json_fields': json_fields,
+        'indexed_fields': [name for name in db_fields if name in indexed_fields],
+        'fk_field_names': [relationship.key for relationship in aModelClass.__mapper__.relationships],
+        'choices_dict': choices_dict,
+        'integer_fields': get_model_field_names(aModelClass, Integer),
+        'date_time_fields': get_model_field_names(aModelClass, DateTime),
+        'text_fields': get_model_field_names(aModelClass, Text),
+        'exclude_auto_gen_fields': exclude_auto_gen_fields(aModelClass),
+    }
+    _model_cache[aModelClass] = metadata
+    return metadata
+
+
+def table_options(aPath):
+    """DYNAMIC_DATATB_OPTIONS of a table merged over the defaults."""
+    options = dict(DEFAULT_OPTIONS)
+    options.update(config.Config.DYNAMIC_DATATB_OPTIONS.get(aPath.lower(), {}))
+    return options
+
+
+def _load_table_settings(parent, db_fields):
+    """Reads column visibility, saved filters and page size of a table in one query."""
+    rows = db.session.execute(
+        union_all(
+            select(literal('column').label('kind'), HideShowFilter.id, HideShowFilter.key,
+                   cast(cast(HideShowFilter.value, Integer), String).label('value'))
+                .where(HideShowFilter.parent == parent),
+            select(literal('filter'), ModelFilter.id, ModelFilter.key, ModelFilter.value)
+                .where(ModelFilter.parent == parent),
+            select(literal('page'), PageItems.id, literal('', String), cast(PageItems.items_per_page, String))
+                .where(PageItems.parent == parent),
+        )
+    ).all()
+
+    columns, filters, page_items, page_items_id = {}, [], DEFAULT_PAGE_ITEMS, None
+    for kind, id, key, value in sorted(rows, key=lambda row: row.id):
+        if kind == 'column':
+            columns.setdefault(key, SimpleNamespace(id=id, key=key, value=value == '1'))
+        elif kind == 'filter':
+            filters.append(SimpleNamespace(id=id, key=key, value=value))
+        elif value and (page_items_id is None or id > page_items_id):
+            page_items, page_items_id = int(value), id
+
+    # Columns seen for the first time are stored as visible, in a single commit
+    missing = [HideShowFilter(parent=parent, key=key, value=False) for key in db_fields if key not in columns]
+    if missing:
+        db.session.add_all(missing)
+        db.session.commit()
+        for field in missing:
+            columns[field.key] = SimpleNamespace(id=field.id, key=field.key, value=False)
+
+    return {
+        'field_names': [columns[key] for key in db_fields],
+        'visible_fields': [key for key in db_fields if not columns[key].value],
+        'filter_instance': filters,
+        'page_items': page_items,
+    }
+
+
+def table_metadata(aPath, aModelClass):
+    """Model metadata plus the table's saved settings, cached until invalidated."""
+    parent = aPath.lower()
+    stamp = _stamp(parent)
+
+    cached = _table_cache.get(parent)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    with _lock:
+        metadata = dict(model_metadata(aModelClass))
+        metadata.update(_load_table_settings(parent, metadata['db_fields']))
+        metadata['options'] = options = table_options(parent)
+
+        metadata['orderable_fields'] = metadata['indexed_fields'] if options['indexed_order_only'] else metadata['db_fields']
+        if options['max_page_items']:
+            metadata['page_items'] = min(metadata['page_items'], options['max_page_items'])
+        _table_cache[parent] = (stamp, metadata)
+
+    return metadata
+
+
+def invalidate_table_metadata(aPath):
+    """Drops the cached settings of a table in this and every other worker."""
+    parent = aPath.lower()
+    _table_cache.pop(parent, None)
+
+    # Counter instead of mtime: coarse timestamps or two writes in the same tick
+    # would leave other workers with stale settings
+    path = _stamp_path(parent)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + '.lock'), 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        version = int(_stamp(parent) or 0) + 1
+        tmp = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        tmp.write_text(str(version))
+        os.replace(tmp, path)
+
+
+def warm_table_metadata():
+    """Builds the metadata of every DYNAMIC_DATATB table (requires an app context)."""
+    for aPath, aModelName in config.Config.DYNAMIC_DATATB.items():
+        aModelClass = name_to_class(aModelName)
+        if aModelClass:
+            table_metadata(aPath, aModelClass)
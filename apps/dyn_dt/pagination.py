@@ -0,0 +1,155 @@
+# -*- encoding: utf-8 -*-
+"""
+Copyright (c) 2019 - present AppSeed.us
+"""
+
+import base64, binascii, enum, json, threading, time
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from sqlalchemy import func, select, text, tuple_
+from apps import db, config
+
+
+def _dump_value(value):
+    if isinstance(value, enum.Enum):
+        return ['enum', value.name]
+    if isinstance(value, datetime):
+        return ['datetime', value.isoformat()]
+    if isinstance(value, date):
+        return ['date', value.isoformat()]
+    if isinstance(value, Decimal):
+        return ['decimal', str(value)]
+    return [None, value]
+
+
+def _load_value(column, dumped):
+    kind, value = dumped
+    if kind == 'enum':
+        return column.type.enum_class[value]
+    if kind == 'datetime':
+        return datetime.fromisoformat(value)
+    if kind == 'date':
+        return date.fromisoformat(value)
+    if kind == 'decimal':
+        return Decimal(value)
+    return value
+
+
+def encode_cursor(direction, order_by, item):
+    """Opaque cursor pointing after ('a') or before ('b') an item."""
+    payload = [direction, order_by, _dump_value(getattr(item, order_by)), item.id]
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, aModelClass, order_by):
+    """Returns (direction, order value, id), or None for a missing/invalid cursor."""
+    if not cursor:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        direction, cursor_order_by, dumped, id = payload
+        if direction not in ('a', 'b') or cursor_order_by != order_by:
+            return None
+        return direction, _load_value(aModelClass.__table__.columns[order_by], dumped), int(id)
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        return None
+
+
+def supports_keyset(aModelClass, order_by):
+    """Seek pagination needs a NOT NULL ordering column (id breaks ties)."""
+    column = aModelClass.__table__.columns.get(order_by)
+    return column is not None and (column.primary_key or not column.nullable)
+
+
+_count_cache = OrderedDict()
+_count_lock = threading.Lock()
+
+
+def _table_estimate(aModelClass):
+    """Row estimate from the planner statistics (PostgreSQL), without scanning."""
+    if db.engine.dialect.name != 'postgresql':
+        return None
+    estimate = db.session.execute(
+        text('SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table AS regclass)'),
+        {'table': aModelClass.__tablename__}
+    ).scalar()
+    return estimate if estimate is not None and estimate >= 0 else None
+
+
+def approximate_count(aModelClass, queryset, cache_key, filtered):
+    """
+    Total rows for the page footer: planner statistics for unfiltered tables,
+    otherwise an exact COUNT cached for DYN_DT_COUNT_TTL seconds.
+    """
+    if not filtered:
+        estimate = _table_estimate(aModelClass)
+        if estimate is not None:
+            return estimate
+
+    now = time.monotonic()
+    with _count_lock:
+        cached = _count_cache.get(cache_key)
+        if cached is not None and now - cached[0] < config.Config.DYN_DT_COUNT_TTL:
+            _count_cache.move_to_end(cache_key)
+            return cached[1]
+
+    count = db.session.execute(
+        select(func.count()).select_from(queryset.order_by(None).subquery())
+    ).scalar()
+    with _count_lock:
+        _store_count(cache_key, (now, count))
+    return count
+
+
+def _store_count(cache_key, entry):
+    """LRU insert bounded by DYN_DT_COUNT_CACHE_SIZE; expired entries go first (call under _count_lock)."""
+    _count_cache[cache_key] = entry
+    _count_cache.move_to_end(cache_key)
+
+    expired = entry[0] - config.Config.DYN_DT_COUNT_TTL
+    for key in [key for key, (stamp, _) in _count_cache.items() if stamp <= expired]:
+        del _count_cache[key]
+    while len(_count_cache) > config.Config.DYN_DT_COUNT_CACHE_SIZE:
+        _count_cache.popitem(last=False)
+
+
+class KeysetPagination:
+    """Seek pagination over (order_by, id) with opaque prev/next cursors."""
+
+    is_keyset = True
+
+    def __init__(self, aModelClass, queryset, order_by, per_page, cursor, total):
+        self.per_page = per_page
+        self.total = total
+
+        column = getattr(aModelClass, order_by)
+        position = decode_cursor(cursor, aModelClass, order_by)
+        direction = position[0] if position else 'a'
+
+        if order_by == 'id':
+            key, ordering = aModelClass.id, [aModelClass.id]
+            bound = lambda value, id: id
+        else:
+            key, ordering = tuple_(column, aModelClass.id), [column, aModelClass.id]
+            bound = lambda value, id: tuple_(value, id)
+
+        if position and direction == 'a':
+            queryset = queryset.filter(key > bound(position[1], position[2]))
+        elif position:
+            queryset = queryset.filter(key < bound(position[1], position[2]))
+            ordering = [field.desc() for field in ordering]
+
+        items = queryset.order_by(None).order_by(*ordering).limit(per_page + 1).all()
+        more = len(items) > per_page
+        items = items[:per_page]
+
+        if direction == 'b':
+            items.reverse()
+            self.has_prev, self.has_next = more, True
+        else:
+            self.has_prev, self.has_next = position is not None, more
+
+        self.items = items
+        self.prev_cursor = encode_cursor('b', order_by, items[0]) if self.has_prev and items else None
+        self.next_cursor = encode_cursor('a', order_by, items[-1]) if self.has_next and items else None
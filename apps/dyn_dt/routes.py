@@ -6,15 +6,20 @@ Copyright (c) 2019 - present AppSeed.us
 import json, csv, io
 from flask_login import login_required
 from apps.dyn_dt import blueprint
-from flask import render_template, request, redirect, url_for, jsonify, make_response
-from apps.dyn_dt.utils import get_model_field_names, get_model_fk_values, name_to_class, user_filter, exclude_auto_gen_fields
+from flask import render_template, request, redirect, url_for, jsonify, make_response, Response, stream_with_context
+from apps.dyn_dt.utils import get_model_field_names, get_model_fk_models, name_to_class, user_filter, exclude_auto_gen_fields
 from apps import db, config
 from apps.dyn_dt.utils import *
+from apps.dyn_dt.metadata import table_metadata, invalidate_table_metadata
+from apps.dyn_dt.pagination import KeysetPagination, approximate_count, supports_keyset
+from apps.dyn_dt.search import indexed_search, search_backend
 from sqlalchemy import and_
+from sqlalchemy.orm import defer, selectinload
 from sqlalchemy import Integer, DateTime, String, Text
 from datetime import datetime
 
 @blueprint.route('/dynamic-dt')
+@login_required
 def dynamic_dt():
     context = {
         'routes': config.Config.DYNAMIC_DATATB.keys(),
@@ -23,6 +28,7 @@ def dynamic_dt():
     return render_template('dyn_dt/index.html', **context)
 
 @blueprint.route('/create_filter/<model_name>', methods=["POST"])
+@login_required
 def create_filter(model_name):
     model_name = model_name.lower()
     if request.method == "POST":
@@ -38,10 +44,12 @@ def create_filter(model_name):
             db.session.add(filter_instance)
         
         db.session.commit()
+        invalidate_table_metadata(model_name)
         return redirect(url_for('table_blueprint.model_dt', aPath=model_name))
 
 
 @blueprint.route('/create_page_items/<model_name>', methods=["POST"])
+@login_required
 def create_page_items(model_name):
     model_name = model_name.lower()
     if request.method == 'POST':
@@ -53,10 +61,12 @@ def create_page_items(model_name):
             page_items = PageItems(parent=model_name, items_per_page=items)
         db.session.add(page_items)
         db.session.commit()
+        invalidate_table_metadata(model_name)
         return redirect(url_for('table_blueprint.model_dt', aPath=model_name))
 
 
 @blueprint.route('/create_hide_show_filter/<model_name>', methods=["POST"])
+@login_required
 def create_hide_show_filter(model_name):
     model_name = model_name.lower()
     if request.method == "POST":
@@ -71,22 +81,26 @@ def create_hide_show_filter(model_name):
         
         db.session.add(filter_instance)
         db.session.commit()
+        invalidate_table_metadata(model_name)
 
         return jsonify({'message': 'Model updated successfully'})
 
 
 @blueprint.route('/delete_filter/<model_name>/<int:id>', methods=["GET"])
+@login_required
 def delete_filter(model_name, id):
     model_name = model_name.lower()
     filter_instance = ModelFilter.query.filter_by(id=id, parent=model_name).first()
     if filter_instance:
         db.session.delete(filter_instance)
         db.session.commit()
+        invalidate_table_metadata(model_name)
         return redirect(url_for('table_blueprint.model_dt', aPath=model_name))
     return jsonify({'error': 'Filter not found'}), 404
 
 
 @blueprint.route('/dynamic-dt/<aPath>', methods=['GET', 'POST'])
+@login_required
 def model_dt(aPath):
     aModelName = None
     aModelClass = None
@@ -98,86 +112,102 @@ def model_dt(aPath):
     if not aModelClass:
         return f'ERR: Getting ModelClass for path: {aPath}', 404
 
-    # db_fields = [field.name for field in aModelClass.__table__.columns]
-    db_fields = [field.name for field in aModelClass.__table__.columns if not field.foreign_keys]
-    fk_fields = get_model_fk_values(aModelClass)
-    db_filters = []
-    for f in db_fields:
-        if f not in fk_fields.keys():
-            db_filters.append( f )
-
-    choices_dict = {}
-    for column in aModelClass.__table__.columns:
-        if isinstance(column.type, db.Enum):
-            choices_dict[column.name] = [(choice.name, choice.value) for choice in column.type.enum_class]
-
-    field_names = []
-    for field_name in db_fields:
-        field = HideShowFilter.query.filter_by(parent=aPath.lower(), key=field_name).first()
-        if field:
-            field_names.append(field)
-        else:
-            field = HideShowFilter(parent=aPath.lower(), key=field_name)
-            db.session.add(field)
-            db.session.commit()
-
-            field_names.append(field)
+    metadata = table_metadata(aPath, aModelClass)
+    db_fields = metadata['db_fields']
+    fk_fields = get_model_fk_models(aModelClass)
+    db_filters = [f for f in db_fields if f not in fk_fields.keys()]
 
-    filter_string = []
-    filter_instance = ModelFilter.query.filter_by(parent=aPath.lower()).all()
-    for filter_data in filter_instance:
-        if filter_data.key in db_fields:
-            filter_string.append(getattr(aModelClass, filter_data.key).like(f"%{filter_data.value}%"))
+    filter_instance = metadata['filter_instance']
+    filter_string = model_filters(aModelClass, filter_instance, db_fields)
 
-    order_by = request.args.get('order_by', 'id')
-    if order_by not in db_fields:
-        order_by = 'id'
+    options = metadata['options']
+    order_by = request.args.get('order_by', options['order_by'])
+    if order_by not in metadata['orderable_fields']:
+        order_by = options['order_by']
 
-    queryset = aModelClass.query.filter(and_(*filter_string)).order_by(order_by)
+    # JSON columns are only loaded by the detail page; FK targets shown in the edit
+    # modal are loaded with one IN query per relationship instead of one per row
+    deferred = [defer(getattr(aModelClass, field)) for field in metadata['json_fields']]
+    eager = [selectinload(getattr(aModelClass, field)) for field in fk_fields]
+    queryset = aModelClass.query.options(*deferred, *eager).filter(and_(*filter_string)).order_by(order_by)
 
     # Pagination
-    page_items = PageItems.query.filter_by(parent=aPath.lower()).order_by(PageItems.id.desc()).first()
-    p_items = 25
-    if page_items:
-        p_items = page_items.items_per_page
+    p_items = metadata['page_items']
 
-    page = request.args.get('page', 1, type=int)
     queryset = user_filter(request, queryset, db_fields, fk_fields.keys())
-    pagination = queryset.paginate(page=page, per_page=p_items, error_out=False)
+
+    # Keyset (seek) pagination unless an explicit page number is requested
+    search = request.args.get('search')
+    ranked = indexed_search(search) and 'order_by' not in request.args and search_backend(aModelClass)
+    if config.Config.DYN_DT_KEYSET_PAGINATION and 'page' not in request.args and not ranked and supports_keyset(aModelClass, order_by):
+        count_key = (aPath.lower(), tuple((f.key, f.value) for f in filter_instance), search)
+        total = approximate_count(aModelClass, queryset, count_key, bool(filter_string or search))
+        pagination = KeysetPagination(aModelClass, queryset, order_by, p_items, request.args.get('cursor'), total)
+    else:
+        page = request.args.get('page', 1, type=int)
+        pagination = queryset.paginate(page=page, per_page=p_items, error_out=False)
     items = pagination.items
 
-    # Read-only and field types
+    # Read-only fields
     read_only_fields = ('id', 'user_id', 'date_created', 'date_modified', )
-    integer_fields = get_model_field_names(aModelClass, Integer)
-    date_time_fields = get_model_field_names(aModelClass, DateTime)
-    text_fields = get_model_field_names(aModelClass, Text)
     email_fields = []
 
     # Context
     context = {
         'page_title': f'Dynamic DataTable - {aPath.lower().title()}',
         'link': aPath,
-        'field_names': field_names,
+        'field_names': metadata['field_names'],
         'db_field_names': db_fields,
         'db_filters': db_filters,
         'items': items,
         'pagination': pagination,
         'page_items': p_items,
+        'max_page_items': options['max_page_items'],
         'filter_instance': filter_instance,
         'read_only_fields': read_only_fields,
-        'integer_fields': integer_fields,
-        'date_time_fields': date_time_fields,
+        'integer_fields': metadata['integer_fields'],
+        'date_time_fields': metadata['date_time_fields'],
         'email_fields': email_fields,
-        'text_fields': text_fields,
+        'text_fields': metadata['text_fields'],
         'fk_fields_keys': fk_fields.keys(),
         'fk_fields': fk_fields,
         'segment': 'dynamic_dt',
-        'choices_dict': choices_dict,
-        'exclude_auto_gen_fields': exclude_auto_gen_fields(aModelClass)
+        'choices_dict': metadata['choices_dict'],
+        'exclude_auto_gen_fields': metadata['exclude_auto_gen_fields']
     }
     return render_template('dyn_dt/model.html', **context)
 
 
+@blueprint.route('/dynamic-dt/<aPath>/<int:id>', methods=['GET'])
+@login_required
+def model_detail(aPath, id):
+    aModelClass = None
+
+    if aPath in config.Config.DYNAMIC_DATATB:
+        aModelName = config.Config.DYNAMIC_DATATB[aPath]
+        aModelClass = name_to_class(aModelName)
+
+    if not aModelClass:
+        return f'ERR: Getting ModelClass for path: {aPath}', 404
+
+    item = db.session.get(aModelClass, id)
+    if not item:
+        return 'Item not found', 404
+
+    metadata = table_metadata(aPath, aModelClass)
+
+    context = {
+        'page_title': f'Dynamic DataTable - {aPath.lower().title()} #{id}',
+        'link': aPath,
+        'item': item,
+        'field_names': [column.name for column in aModelClass.__table__.columns],
+        'json_fields': metadata['json_fields'],
+        'choices_dict': metadata['choices_dict'],
+        'segment': 'dynamic_dt',
+    }
+    return render_template('dyn_dt/detail.html', **context)
+
+
 @blueprint.route('/create/<aPath>', methods=["POST"])
 @login_required
 def create(aPath):
@@ -192,16 +222,12 @@ def create(aPath):
 
     if request.method == 'POST':
         data = {}
-        fk_fields = get_model_fk_values(aModelClass)
+        fk_fields = get_model_fk_models(aModelClass)
+        fk_values = resolve_fk_values(request.form, fk_fields)
 
         for attribute, value in request.form.items():
-            if attribute in fk_fields.keys():
-                table_name = None
-                for product in fk_fields[attribute]:
-                    table_name = product.__class__.__tablename__
-                if table_name:
-                    model_name = config.Config.DYNAMIC_DATATB[table_name]
-                    value = name_to_class(model_name).query.filter_by(id=value).first()
+            if attribute in fk_fields:
+                value = fk_values[attribute]
 
             data[attribute] = value if value else ''
 
@@ -248,18 +274,15 @@ def update(aPath, id):
     if not item:
         return 'Item not found', 404
 
-    fk_fields = get_model_fk_values(aModelClass)
+    fk_fields = get_model_fk_models(aModelClass)
 
     if request.method == 'POST':
+        fk_values = resolve_fk_values(request.form, fk_fields)
+
         for attribute, value in request.form.items():
             if hasattr(item, attribute) and getattr(item, attribute, value) is not None:
-                if attribute in fk_fields.keys():
-                    table_name = None
-                    for product in fk_fields[attribute]:
-                        table_name = product.__class__.__tablename__
-                    if table_name:
-                        model_name = config.Config.DYNAMIC_DATATB[table_name]
-                        value = name_to_class(model_name).query.filter_by(id=value).first()
+                if attribute in fk_fields:
+                    value = fk_values[attribute]
 
                 setattr(item, attribute, value)
         
@@ -268,7 +291,30 @@ def update(aPath, id):
     return redirect(request.referrer)
 
 
+@blueprint.route('/dynamic-dt/<aPath>/fk/<field>', methods=['GET'])
+@login_required
+def fk_autocomplete(aPath, field):
+    aModelClass = None
+
+    if aPath in config.Config.DYNAMIC_DATATB:
+        aModelName = config.Config.DYNAMIC_DATATB[aPath]
+        aModelClass = name_to_class(aModelName)
+
+    if not aModelClass:
+        return jsonify({'error': f'Getting ModelClass for path: {aPath}'}), 404
+
+    related_model = get_model_fk_models(aModelClass).get(field)
+    if not related_model:
+        return jsonify({'error': f'{field} is not a foreign key of {aPath}'}), 404
+
+    search = request.args.get('q', '').strip()
+    page = max(request.args.get('page', 1, type=int), 1)
+
+    return jsonify(fk_choices(related_model, search, page))
+
+
 @blueprint.route('/export/<aPath>', methods=['GET'])
+@login_required
 def export_csv(aPath):
     aModelName = None
     aModelClass = None
@@ -280,47 +326,40 @@ def export_csv(aPath):
     if not aModelClass:
         return ' > ERR: Getting ModelClass for path: ' + aPath, 400
 
-    db_field_names = [column.name for column in aModelClass.__table__.columns]
-    fk_fields = get_model_fk_values(aModelClass)
-
-    fields = []
-    show_fields = HideShowFilter.query.filter_by(value=False, parent=aPath.lower()).all()
-    for field in show_fields:
-        if field.key in db_field_names:
-            fields.append(field.key)
-        else:
-            print(f"Field {field.key} does not exist in {aModelClass} model.")
-
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow(fields)
+    metadata = table_metadata(aPath, aModelClass)
+    db_field_names = metadata['db_field_names']
+    fk_fields = metadata['fk_field_names']
+    fields = metadata['visible_fields'] or metadata['db_fields']
 
     # Filtering
-    filter_string = {}
-    filter_instance = ModelFilter.query.filter_by(parent=aPath.lower()).all()
-    for filter_data in filter_instance:
-        filter_string[f'{filter_data.key}__icontains'] = filter_data.value
+    filter_string = model_filters(aModelClass, metadata['filter_instance'], db_field_names)
 
     # Ordering
-    order_by = request.args.get('order_by', 'id')
-    query = aModelClass.query.filter_by(**filter_string).order_by(order_by)
-    items = user_filter(request, query, db_field_names, fk_fields)
-
-    # Write rows to CSV
-    for item in items:
-        row_data = []
-        for field in fields:
-            try:
-                row_data.append(getattr(item, field))
-            except AttributeError:
-                row_data.append('')
-        writer.writerow(row_data)
-
-    # Prepare response with CSV content
-    response = make_response(output.getvalue())
-    response.headers['Content-Type'] = 'text/csv'
-    response.headers['Content-Disposition'] = f'attachment; filename="{aPath.lower()}.csv"'
+    options = metadata['options']
+    order_by = request.args.get('order_by', options['order_by'])
+    if order_by not in metadata['orderable_fields']:
+        order_by = options['order_by']
+
+    # Only the exported columns are selected, streamed from a server-side cursor
+    query = db.session.query(*[getattr(aModelClass, field) for field in fields]) \
+        .filter(and_(*filter_string)) \
+        .order_by(getattr(aModelClass, order_by))
+    query = user_filter(request, query, db_field_names, fk_fields, aModelClass)
+    if options['max_export_rows']:
+        query = query.limit(options['max_export_rows'])
+    query = query.yield_per(1000)
+
+    chunks = stream_csv(fields, query)
+    filename = f'{aPath.lower()}.csv'
+    mimetype = 'text/csv'
+
+    if request.args.get('gzip') == '1':
+        chunks = gzip_stream(chunks)
+        filename += '.gz'
+        mimetype = 'application/gzip'
+
+    response = Response(stream_with_context(chunks), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename="{filename}"'
 
     return response
 
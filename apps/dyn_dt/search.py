@@ -0,0 +1,195 @@
+# -*- encoding: utf-8 -*-
+"""
+Copyright (c) 2019 - present AppSeed.us
+"""
+
+import fcntl, re, threading
+from contextlib import contextmanager
+from pathlib import Path
+from sqlalchemy import Index, Integer, Numeric, String, Text, column, func, literal_column, table, text
+from apps import db, config
+from apps.dyn_dt.utils import name_to_class
+
+_indexes = {}
+_lock = threading.Lock()
+
+MIN_INDEXED_LENGTH = 3
+
+
+def search_columns(aModelClass):
+    """Columns covered by the search index: text, enum and numeric, without FKs."""
+    return [
+        field for field in aModelClass.__table__.columns
+        if not field.foreign_keys
+        and isinstance(field.type, (String, Text, Integer, Numeric))
+    ]
+
+
+def _tokens(value):
+    return [token for token in re.split(r'\W+', value) if token]
+
+
+def indexed_search(value):
+    """
+    Whether a search term goes through the index. The index matches token
+    prefixes, so numeric terms (CPF/CNPJ, contract numbers) and short terms
+    keep the ILIKE substring scan.
+    """
+    tokens = _tokens(value or '')
+    return bool(tokens) and len(value.strip()) >= MIN_INDEXED_LENGTH \
+        and not any(token.isdigit() for token in tokens)
+
+
+def _registered(aModelClass):
+    return any(aModelClass is name_to_class(name) for name in config.Config.DYNAMIC_DATATB.values())
+
+
+@contextmanager
+def _ddl_lock():
+    """Serializes index DDL between the worker processes of this host (all warm up at once)."""
+    path = Path(config.Config.DYN_DT_CACHE_DIR) / 'dyn_dt-search.lock'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+# SQLite: FTS5 external-content table kept in sync by triggers
+
+def _sqlite_ensure(aModelClass):
+    with db.engine.connect() as conn:
+        if not conn.execute(text("SELECT sqlite_compileoption_used('ENABLE_FTS5')")).scalar():
+            return False
+
+    name = aModelClass.__tablename__
+    fts = f'{name}_fts'
+    cols = [field.name for field in search_columns(aModelClass)]
+    quoted = ', '.join(f'"{c}"' for c in cols)
+    new = ', '.join(f'new."{c}"' for c in cols)
+    old = ', '.join(f'old."{c}"' for c in cols)
+
+    with _ddl_lock(), db.engine.begin() as conn:
+        triggers = conn.execute(
+            text("SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name IN (:i, :d, :u)"),
+            {'i': f'{fts}_a_i', 'd': f'{fts}_a_d', 'u': f'{fts}_a_u'}
+        ).scalar()
+        if triggers == 3:
+            return True
+
+        # Index never built, or table recreated (its triggers dropped with it)
+        conn.execute(text(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS "{fts}" USING fts5({quoted}, content=\'{name}\', content_rowid=\'id\', '
+            f'tokenize=\'unicode61 remove_diacritics 2\')'
+        ))
+        conn.execute(text(
+            f'CREATE TRIGGER IF NOT EXISTS "{fts}_a_i" AFTER INSERT ON "{name}" BEGIN '
+            f'INSERT INTO "{fts}"(rowid, {quoted}) VALUES (new.id, {new}); END'
+        ))
+        conn.execute(text(
+            f'CREATE TRIGGER IF NOT EXISTS "{fts}_a_d" AFTER DELETE ON "{name}" BEGIN '
+            f'INSERT INTO "{fts}"("{fts}", rowid, {quoted}) VALUES (\'delete\', old.id, {old}); END'
+        ))
+        conn.execute(text(
+            f'CREATE TRIGGER IF NOT EXISTS "{fts}_a_u" AFTER UPDATE ON "{name}" BEGIN '
+            f'INSERT INTO "{fts}"("{fts}", rowid, {quoted}) VALUES (\'delete\', old.id, {old}); '
+            f'INSERT INTO "{fts}"(rowid, {quoted}) VALUES (new.id, {new}); END'
+        ))
+        conn.execute(text(f'INSERT INTO "{fts}"("{fts}") VALUES (\'rebuild\')'))
+    return True
+
+
+def _sqlite_filter(aModelClass, query, value, rank):
+    fts_name = f'{aModelClass.__tablename__}_fts'
+    fts = table(fts_name, column('rowid'), column('rank'))
+    match = ' '.join('"{}"*'.format(token.replace('"', '""')) for token in _tokens(value))
+
+    query = query.join(fts, fts.c.rowid == aModelClass.id) \
+        .filter(literal_column(f'"{fts_name}"').op('MATCH')(match))
+    if rank:
+        query = query.order_by(None).order_by(fts.c.rank, aModelClass.id)
+    return query
+
+
+# PostgreSQL: GIN index on a tsvector expression (maintained by the database itself).
+# Index expressions must be IMMUTABLE, and concat_ws and enum-to-text casts are
+# only STABLE, so the document is built by an IMMUTABLE SQL function per table.
+
+def _pg_function(aModelClass):
+    return f'{aModelClass.__tablename__}_search_document'
+
+
+def _pg_document(aModelClass):
+    return getattr(func, _pg_function(aModelClass))(*search_columns(aModelClass))
+
+
+def _pg_ensure(aModelClass):
+    fields = search_columns(aModelClass)
+    types = ', '.join(field.type.compile(dialect=db.engine.dialect) for field in fields)
+    values = ', '.join(f'${position}::text' for position in range(1, len(fields) + 1))
+
+    with db.engine.begin() as conn:
+        # Workers on other hosts share the database: lock there, released at commit
+        conn.execute(text('SELECT pg_advisory_xact_lock(hashtext(:name))'), {'name': _pg_function(aModelClass)})
+        conn.execute(text(
+            f'CREATE OR REPLACE FUNCTION "{_pg_function(aModelClass)}"({types}) RETURNS tsvector '
+            f'LANGUAGE sql IMMUTABLE PARALLEL SAFE AS '
+            f'$$ SELECT to_tsvector(\'simple\'::regconfig, concat_ws(\' \', {values})) $$'
+        ))
+        index = Index(f'ix_{aModelClass.__tablename__}_search', _pg_document(aModelClass), postgresql_using='gin')
+        index.create(conn, checkfirst=True)
+    return True
+
+
+def _pg_filter(aModelClass, query, value, rank):
+    document = _pg_document(aModelClass)
+    tsquery = func.to_tsquery('simple', ' & '.join(f'{token}:*' for token in _tokens(value)))
+
+    query = query.filter(document.op('@@')(tsquery))
+    if rank:
+        query = query.order_by(None).order_by(func.ts_rank(document, tsquery).desc(), aModelClass.id)
+    return query
+
+
+BACKENDS = {
+    'sqlite': (_sqlite_ensure, _sqlite_filter),
+    'postgresql': (_pg_ensure, _pg_filter),
+}
+
+
+def search_backend(aModelClass):
+    """
+    Filter function of the model's search index, built on first use; None falls
+    back to ILIKE (feature disabled, model not registered, dialect or SQLite
+    build without full-text support). Errors building the index are raised.
+    """
+    if aModelClass in _indexes:
+        return _indexes[aModelClass]
+
+    with _lock:
+        if aModelClass not in _indexes:
+            backend = None
+            if config.Config.DYN_DT_FULLTEXT_SEARCH and _registered(aModelClass):
+                ensure, search = BACKENDS.get(db.engine.dialect.name, (None, None))
+                if ensure and ensure(aModelClass):
+                    backend = search
+            _indexes[aModelClass] = backend
+
+    return _indexes[aModelClass]
+
+
+def fulltext_filter(aModelClass, query, value, rank=False):
+    """Applies the indexed search (ranked if `rank`), or returns None to keep the ILIKE scan."""
+    if not indexed_search(value):
+        return None
+    backend = search_backend(aModelClass)
+    if backend is None:
+        return None
+    return backend(aModelClass, query, value, rank)
+
+
+def ensure_search_indexes():
+    """Builds the search index of every DYNAMIC_DATATB model (requires an app context)."""
+    for aModelName in config.Config.DYNAMIC_DATATB.values():
+        aModelClass = name_to_class(aModelName)
+        if aModelClass:
+            search_backend(aModelClass)
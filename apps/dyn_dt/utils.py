@@ -3,9 +3,9 @@
 Copyright (c) 2019 - present AppSeed.us
 """
 
-import importlib
+import csv, io, importlib, zlib
 from sqlalchemy import or_
-from sqlalchemy import DateTime, func
+from sqlalchemy import DateTime, String, func
 from apps import db 
 
 class PageItems(db.Model):
@@ -31,8 +31,9 @@ class ModelFilter(db.Model):
     value = db.Column(db.String(255), nullable=False)
 
 
-def get_model_fk_values(aModelClass):
-    fk_values = {}
+def get_model_fk_models(aModelClass):
+    """Returns {relationship name: related model} for the many-to-one FKs of a model."""
+    fk_models = {}
 
     current_table_name = aModelClass.__tablename__
 
@@ -43,11 +44,57 @@ def get_model_fk_values(aModelClass):
             referenced_table_name = list(foreign_key_column.foreign_keys)[0].column.table.name
 
             if referenced_table_name != current_table_name:
-                field_name = relationship.key
-                related_instances = related_model.query.all()
-                fk_values[field_name] = related_instances
+                fk_models[relationship.key] = related_model
 
-    return fk_values
+    return fk_models
+
+
+def fk_label_column(related_model):
+    """First non-key text column of a model, used to search FK choices."""
+    for column in related_model.__table__.columns:
+        if isinstance(column.type, String) and not column.primary_key and not column.foreign_keys:
+            return getattr(related_model, column.name)
+    return None
+
+
+def fk_choices(related_model, search='', page=1, per_page=20):
+    """One page of FK choices matching a prefix of the label column (or the id)."""
+    label = fk_label_column(related_model)
+    query = related_model.query
+
+    if search:
+        conditions = [label.ilike(f"{search}%")] if label is not None else []
+        if search.isdigit():
+            conditions.append(related_model.id == int(search))
+        query = query.filter(or_(*conditions)) if conditions else query.filter(False)
+
+    ordering = [label, related_model.id] if label is not None else [related_model.id]
+    rows = query.order_by(*ordering).offset((page - 1) * per_page).limit(per_page + 1).all()
+
+    return {
+        'results': [{'id': row.id, 'text': str(row)} for row in rows[:per_page]],
+        'has_more': len(rows) > per_page,
+    }
+
+
+def resolve_fk_values(form, fk_models):
+    """Loads the submitted FK ids with one IN query per related model."""
+    ids_by_model = {}
+    for attribute, related_model in fk_models.items():
+        value = form.get(attribute)
+        if value and str(value).isdigit():
+            ids_by_model.setdefault(related_model, set()).add(int(value))
+
+    instances = {}
+    for related_model, ids in ids_by_model.items():
+        for instance in related_model.query.filter(related_model.id.in_(ids)).all():
+            instances[(related_model, instance.id)] = instance
+
+    return {
+        attribute: instances.get((related_model, int(form[attribute])))
+        if str(form.get(attribute, '')).isdigit() else None
+        for attribute, related_model in fk_models.items() if attribute in form
+    }
 
 
 def get_model_field_names(model, field_type):
@@ -70,21 +117,63 @@ def name_to_class(name: str):
         return None
 
 
-def user_filter(request, query, fields, fk_fields=[]):
+def user_filter(request, query, fields, fk_fields=[], aModelClass=None):
     value = request.args.get('search')
 
     if value:
+        from apps.dyn_dt.search import fulltext_filter
+
         dynamic_filter = []
+        entity = aModelClass or query.column_descriptions[0]['entity']
+
+        # Indexed search for registered models, ranked unless an order was chosen
+        indexed = fulltext_filter(entity, query, value, rank='order_by' not in request.args)
+        if indexed is not None:
+            return indexed
 
         for field in fields:
             if field not in fk_fields:
-                dynamic_filter.append(getattr(query.column_descriptions[0]['entity'], field).ilike(f"%{value}%"))
+                dynamic_filter.append(getattr(entity, field).ilike(f"%{value}%"))
 
         query = query.filter(or_(*dynamic_filter))
 
     return query
 
 
+def model_filters(aModelClass, filter_instance, fields):
+    """LIKE predicates of the saved ModelFilter rows that apply to `fields`."""
+    return [
+        getattr(aModelClass, filter_data.key).like(f"%{filter_data.value}%")
+        for filter_data in filter_instance if filter_data.key in fields
+    ]
+
+
+def stream_csv(header, rows, flush_size=64 * 1024):
+    """Yields CSV text in chunks of ~flush_size, keeping memory constant."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+
+    for row in rows:
+        writer.writerow(row)
+        if buffer.tell() >= flush_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def gzip_stream(chunks):
+    """Gzip-compresses a stream of text chunks on the fly."""
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
 def exclude_auto_gen_fields(aModelClass):
     exclude_fields = [
         field.name for field in aModelClass.__table__.columns 
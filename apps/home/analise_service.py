@@ -0,0 +1,94 @@
+"""
+Serviço de análise completa (múltiplas fontes) com registro no histórico
+"""
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from apps.home.api_services import (
+    consultar_multiplas_fontes,
+    calcular_nivel_risco,
+    only_digits
+)
+from apps.models import AnaliseCompleta, RISK_LEVEL
+
+
+def montar_resultado(dados: dict[str, Any], avaliacao: dict[str, Any]) -> dict[str, Any]:
+    """Monta o resultado exibido na página de análise completa"""
+    return {
+        "documento": dados.get("documento"),
+        "tipo": dados.get("tipo"),
+        "documento_formatado": dados.get("documento_formatado"),
+        "fontes": dados.get("fontes", {}),
+        "avaliacao": avaliacao
+    }
+
+
+def registrar_analise_completa(
+    cpf_cnpj: str,
+    dados: dict[str, Any],
+    avaliacao: dict[str, Any],
+    usuario_id: int | None = None,
+    ip_origem: str | None = None
+) -> AnaliseCompleta:
+    """
+    Persiste uma análise completa no histórico e retorna o registro salvo
+    """
+    # Determinar nível de risco
+    nivel_risco_str = avaliacao.get('nivel_risco', 'medio')
+    try:
+        nivel_risco = RISK_LEVEL[nivel_risco_str]
+    except KeyError:
+        nivel_risco = RISK_LEVEL.medio
+
+    fontes = dados.get("fontes", {})
+
+    analise = AnaliseCompleta(
+        cpf_cnpj=only_digits(cpf_cnpj),
+        tipo_documento=dados.get("tipo", "DESCONHECIDO"),
+        nivel_risco=nivel_risco,
+        pontuacao_risco=avaliacao.get('pontuacao', 0),
+        total_ceis=fontes.get("ceis", {}).get("total", 0),
+        total_cnep=fontes.get("cnep", {}).get("total", 0),
+        total_cepim=fontes.get("cepim", {}).get("total", 0),
+        total_contratos=fontes.get("contratos", {}).get("total", 0),
+        total_convenios=fontes.get("convenios", {}).get("total", 0),
+        total_pncp=fontes.get("pncp", {}).get("total", 0),
+        dados_ceis=fontes.get("ceis", {}).get("dados", []),
+        dados_cnep=fontes.get("cnep", {}).get("dados", []),
+        dados_cepim=fontes.get("cepim", {}).get("dados", []),
+        dados_contratos=fontes.get("contratos", {}).get("dados", []),
+        dados_convenios=fontes.get("convenios", {}).get("dados", []),
+        dados_pncp=fontes.get("pncp", {}).get("dados", []),
+        dados_receita_federal=fontes.get("receita_federal", {}),
+        dados_tse={
+            "candidaturas": fontes.get("tse_candidaturas", {}),
+            "bens": fontes.get("tse_bens", {})
+        },
+        resultado_completo=montar_resultado(dados, avaliacao),
+        avaliacao=avaliacao,
+        alertas=avaliacao.get('alertas', []),
+        usuario_id=usuario_id,
+        ip_origem=ip_origem
+    )
+
+    analise.save()
+    return analise
+
+
+def executar_analise_completa(
+    cpf_cnpj: str,
+    usuario_id: int | None = None,
+    ip_origem: str | None = None,
+    progresso: Callable[[str, dict[str, Any]], None] | None = None
+) -> tuple[dict[str, Any], AnaliseCompleta]:
+    """
+    Consulta todas as fontes, calcula o risco e registra a análise
+
+    Retorna (resultado, analise). Requer contexto de aplicação Flask.
+    """
+    dados = consultar_multiplas_fontes(cpf_cnpj, progresso=progresso)
+    avaliacao = calcular_nivel_risco(dados)
+
+    analise = registrar_analise_completa(cpf_cnpj, dados, avaliacao, usuario_id, ip_origem)
+    return montar_resultado(dados, avaliacao), analise
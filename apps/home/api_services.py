@@ -6,7 +6,8 @@ from __future__ import annotations
 import json
 import os
 import re
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Iterator
 from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode, quote
 from urllib.request import Request, urlopen
@@ -18,6 +19,31 @@ def only_digits(value: str) -> str:
     return re.sub(r"\D", "", value or "")
 
 
+def validar_cpf(doc: str) -> bool:
+    """Valida tamanho e dígitos verificadores de um CPF"""
+    doc = only_digits(doc)
+    if len(doc) != 11 or doc == doc[0] * 11:
+        return False
+    for n in (9, 10):
+        soma = sum(int(doc[i]) * (n + 1 - i) for i in range(n))
+        if (soma * 10) % 11 % 10 != int(doc[n]):
+            return False
+    return True
+
+
+def validar_cnpj(doc: str) -> bool:
+    """Valida tamanho e dígitos verificadores de um CNPJ"""
+    doc = only_digits(doc)
+    if len(doc) != 14 or doc == doc[0] * 14:
+        return False
+    pesos = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    for n in (12, 13):
+        resto = sum(int(doc[i]) * pesos[i + 13 - n] for i in range(n)) % 11
+        if (0 if resto < 2 else 11 - resto) != int(doc[n]):
+            return False
+    return True
+
+
 def format_cpf_cnpj(doc: str) -> str:
     """Formata CPF ou CNPJ"""
     doc = only_digits(doc)
@@ -230,12 +256,77 @@ class TSEAPI:
         }
 
 
-def consultar_multiplas_fontes(cpf_cnpj: str) -> dict[str, Any]:
+def tipo_documento(doc: str) -> str:
+    """Retorna CPF, CNPJ ou INVALIDO conforme a quantidade de dígitos"""
+    doc = only_digits(doc)
+    return "CPF" if len(doc) == 11 else "CNPJ" if len(doc) == 14 else "INVALIDO"
+
+
+def fontes_para_documento(doc: str, tipo: str) -> list[tuple[str, Callable[[], dict[str, Any]]]]:
+    """
+    Lista as fontes aplicáveis ao documento como pares (nome, consulta)
+    """
+    pt_api = PortalTransparenciaAPI()
+    
+    # Portal da Transparência
+    fontes = [
+        ("ceis", lambda: pt_api.buscar_ceis(doc)),
+        ("cnep", lambda: pt_api.buscar_cnep(doc)),
+        ("cepim", lambda: pt_api.buscar_cepim(doc)),
+        ("contratos", lambda: pt_api.buscar_contratos(doc)),
+        ("convenios", lambda: pt_api.buscar_convenios(doc)),
+    ]
+    
+    # CNPJ específico
+    if tipo == "CNPJ":
+        rf_api = ReceitaFederalAPI()
+        pncp_api = PNCPAPI()
+        fontes.append(("receita_federal", lambda: rf_api.consultar_cnpj(doc)))
+        fontes.append(("pncp", lambda: pncp_api.buscar_contratos(doc)))
+    
+    # TSE (CPF)
+    if tipo == "CPF":
+        tse_api = TSEAPI()
+        fontes.append(("tse_candidaturas", lambda: tse_api.buscar_candidaturas(doc)))
+        fontes.append(("tse_bens", lambda: tse_api.buscar_bens_declarados(doc)))
+    
+    return fontes
+
+
+def iterar_fontes(doc: str, tipo: str, paralelo: bool = True) -> Iterator[tuple[str, dict[str, Any]]]:
+    """
+    Consulta as fontes do documento em paralelo, produzindo (nome, resultado)
+    na ordem em que cada uma responde
+    
+    Com `paralelo=False` as fontes são consultadas uma a uma, para chamadores
+    que já limitam a concorrência (triagem em lote).
+    """
+    fontes = fontes_para_documento(doc, tipo)
+    
+    if not paralelo:
+        for nome, consulta in fontes:
+            yield nome, consulta()
+        return
+    
+    with ThreadPoolExecutor(max_workers=len(fontes)) as executor:
+        futuros = {executor.submit(consulta): nome for nome, consulta in fontes}
+        for futuro in as_completed(futuros):
+            yield futuros[futuro], futuro.result()
+
+
+def consultar_multiplas_fontes(
+    cpf_cnpj: str,
+    progresso: Callable[[str, dict[str, Any]], None] | None = None,
+    paralelo: bool = True
+) -> dict[str, Any]:
     """
     Consulta um CPF/CNPJ em múltiplas fontes de dados abertos
+    
+    Se informado, `progresso(nome, resultado)` é chamado ao fim de cada fonte.
+    `paralelo` é repassado a `iterar_fontes`.
     """
     doc = only_digits(cpf_cnpj)
-    tipo = "CPF" if len(doc) == 11 else "CNPJ" if len(doc) == 14 else "INVALIDO"
+    tipo = tipo_documento(doc)
     
     if tipo == "INVALIDO":
         return {
@@ -251,28 +342,14 @@ def consultar_multiplas_fontes(cpf_cnpj: str) -> dict[str, Any]:
         "fontes": {}
     }
     
-    # Portal da Transparência
-    pt_api = PortalTransparenciaAPI()
-    
-    resultado["fontes"]["ceis"] = pt_api.buscar_ceis(doc)
-    resultado["fontes"]["cnep"] = pt_api.buscar_cnep(doc)
-    resultado["fontes"]["cepim"] = pt_api.buscar_cepim(doc)
-    resultado["fontes"]["contratos"] = pt_api.buscar_contratos(doc)
-    resultado["fontes"]["convenios"] = pt_api.buscar_convenios(doc)
+    # Mantém a ordem de declaração das fontes, mesmo consultando em paralelo
+    for nome, _ in fontes_para_documento(doc, tipo):
+        resultado["fontes"][nome] = {}
     
-    # CNPJ específico
-    if tipo == "CNPJ":
-        rf_api = ReceitaFederalAPI()
-        resultado["fontes"]["receita_federal"] = rf_api.consultar_cnpj(doc)
-        
-        pncp_api = PNCPAPI()
-        resultado["fontes"]["pncp"] = pncp_api.buscar_contratos(doc)
-    
-    # TSE (CPF)
-    if tipo == "CPF":
-        tse_api = TSEAPI()
-        resultado["fontes"]["tse_candidaturas"] = tse_api.buscar_candidaturas(doc)
-        resultado["fontes"]["tse_bens"] = tse_api.buscar_bens_declarados(doc)
+    for nome, dados_fonte in iterar_fontes(doc, tipo, paralelo):
+        resultado["fontes"][nome] = dados_fonte
+        if progresso:
+            progresso(nome, dados_fonte)
     
     return resultado
 
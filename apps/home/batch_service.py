@@ -0,0 +1,195 @@
+"""
+Triagem em lote de CPFs/CNPJs contra o CEIS local e, opcionalmente, as APIs públicas
+"""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, TextIO
+
+from politicos.engine import sniff_dialect
+from politicos.engine.sources import SAMPLE_SIZE
+
+from apps.home.api_services import (
+    only_digits,
+    tipo_documento,
+    validar_cpf,
+    validar_cnpj,
+    consultar_multiplas_fontes,
+    calcular_nivel_risco
+)
+from apps.home.sanction_index import obter_indice_sancoes
+
+# Colunas aceitas como documento em CSVs enviados (a primeira encontrada é usada)
+COLUNAS_DOCUMENTO = ("cpf_cnpj", "cnpj_cpf", "cnpj", "cpf", "documento")
+
+COLUNAS_SAIDA = [
+    "documento",
+    "tipo",
+    "valido",
+    "erro",
+    "sancoes_ceis_local",
+    "nivel_risco",
+    "pontuacao_apis",
+    "alertas",
+]
+
+
+def ler_documentos_csv(arquivo: TextIO, delimitador: str = ",") -> Iterator[str]:
+    """
+    Lê documentos de um CSV linha a linha
+
+    Usa a coluna de documento do cabeçalho, se houver; senão, a primeira coluna.
+    """
+    reader = csv.reader(arquivo, delimiter=delimitador)
+    primeira = next(reader, None)
+    if primeira is None:
+        return
+
+    cabecalho = [c.strip().lower() for c in primeira]
+    coluna = next((cabecalho.index(c) for c in COLUNAS_DOCUMENTO if c in cabecalho), None)
+    if coluna is None:
+        coluna = 0
+        yield primeira[0] if primeira else ""
+
+    for row in reader:
+        if len(row) > coluna:
+            yield row[coluna]
+
+
+def ler_documentos_binario(arquivo: BinaryIO) -> Iterator[str]:
+    """
+    Lê documentos de um CSV em bytes (upload, arquivo ou stdin)
+
+    Codificação (UTF-8 ou latin-1/cp1252 do Excel e do Portal) e separador são
+    detectados como nos loaders do motor `politicos.engine`.
+    """
+    if arquivo.seekable():
+        amostra = arquivo.read(SAMPLE_SIZE)
+        arquivo.seek(0)
+    else:
+        amostra = arquivo.peek(SAMPLE_SIZE)
+    dialeto = sniff_dialect(amostra)
+
+    texto = io.TextIOWrapper(arquivo, encoding=dialeto.encoding, newline="")
+    yield from ler_documentos_csv(texto, dialeto.delimiter)
+
+
+def normalizar_documentos(documentos: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    Normaliza, valida e remove duplicatas de uma sequência de documentos
+
+    Documentos vazios e repetidos são descartados silenciosamente.
+    """
+    vistos = set()
+    for entrada in documentos:
+        doc = only_digits(str(entrada))
+        if not doc or doc in vistos:
+            continue
+        vistos.add(doc)
+
+        tipo = tipo_documento(doc)
+        erro = None
+        if tipo == "INVALIDO":
+            erro = "Documento deve ter 11 (CPF) ou 14 (CNPJ) dígitos"
+        elif not (validar_cpf(doc) if tipo == "CPF" else validar_cnpj(doc)):
+            erro = "Dígitos verificadores inválidos"
+
+        yield {"documento": doc, "tipo": tipo, "valido": erro is None, "erro": erro}
+
+
+def _triagem_local(item: Dict[str, Any], indice) -> Dict[str, Any]:
+    """Confere o documento no índice do CEIS local"""
+    if item["tipo"] == "INVALIDO":
+        item["sancoes_ceis_local"] = 0
+        item["nivel_risco"] = None
+        return item
+
+    sancoes = indice.buscar(item["documento"]) if indice is not None else []
+    item["sancoes_ceis_local"] = len(sancoes)
+    item["nivel_risco"] = "alto" if sancoes else "baixo"
+    return item
+
+
+def _triagem_apis(item: Dict[str, Any]) -> Dict[str, Any]:
+    """Consulta as APIs públicas e combina a avaliação com o resultado local"""
+    # Fontes em série: a concorrência do lote já é limitada por `max_concorrencia`
+    dados = consultar_multiplas_fontes(item["documento"], paralelo=False)
+    avaliacao = calcular_nivel_risco(dados)
+
+    item["pontuacao_apis"] = avaliacao.get("pontuacao", 0)
+    item["alertas"] = avaliacao.get("alertas", [])
+    if avaliacao.get("nivel_risco") == "critico" or item["nivel_risco"] != "alto":
+        item["nivel_risco"] = avaliacao.get("nivel_risco")
+    return item
+
+
+def triar_documentos(
+    documentos: Iterable[str],
+    consultar_apis: bool = False,
+    max_concorrencia: int = 4,
+    limite: int | None = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Triagem em lote, devolvendo cada resultado assim que fica pronto
+
+    `limite` conta documentos distintos: repetições e linhas vazias não
+    consomem o limite do lote.
+
+    A entrada é consumida de forma preguiçosa e no máximo `max_concorrencia`
+    documentos (cada um com uma requisição por vez) ficam em andamento, então
+    a memória e o número de requisições às APIs não crescem com o lote.
+    """
+    indice = obter_indice_sancoes()
+    itens = islice(normalizar_documentos(documentos), limite)
+
+    if not consultar_apis:
+        for item in itens:
+            yield _triagem_local(item, indice)
+        return
+
+    with ThreadPoolExecutor(max_workers=max_concorrencia) as executor:
+        pendentes = set()
+        for item in itens:
+            item = _triagem_local(item, indice)
+            if not item["valido"]:
+                yield item
+                continue
+
+            pendentes.add(executor.submit(_triagem_apis, item))
+            if len(pendentes) >= max_concorrencia:
+                prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                for futuro in prontos:
+                    yield futuro.result()
+
+        while pendentes:
+            prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in prontos:
+                yield futuro.result()
+
+
+def formatar_ndjson(resultados: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """Um objeto JSON por linha"""
+    for item in resultados:
+        yield json.dumps(item, ensure_ascii=False, default=str) + "\n"
+
+
+def formatar_csv(resultados: Iterable[Dict[str, Any]]) -> Iterator[str]:
+    """CSV com cabeçalho fixo (COLUNAS_SAIDA), uma linha por resultado"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=COLUNAS_SAIDA, extrasaction="ignore")
+
+    writer.writeheader()
+    for item in resultados:
+        linha = dict(item)
+        linha["alertas"] = "; ".join(item.get("alertas", []))
+        writer.writerow(linha)
+
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    yield buffer.getvalue()
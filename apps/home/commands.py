@@ -0,0 +1,71 @@
+# -*- encoding: utf-8 -*-
+"""
+Copyright (c) 2019 - present AppSeed.us
+"""
+
+import sys
+import click
+
+from apps.config import Config
+from apps.home.sanction_delta import atualizar_sancoes as aplicar_snapshot_sancoes
+from apps.home.sanction_index import caminho_ceis_local, carregar_indice_sancoes
+from apps.home.shared_index import caminho_segmento
+from apps.home.batch_service import (
+    ler_documentos_binario,
+    triar_documentos,
+    formatar_ndjson,
+    formatar_csv
+)
+
+
+@click.command('triagem-lote')
+@click.argument('arquivo', type=click.File('rb'))
+@click.option('--apis', is_flag=True, help='Consulta também as APIs públicas (mais lento)')
+@click.option('--formato', type=click.Choice(['ndjson', 'csv']), default='ndjson', show_default=True)
+@click.option('--concorrencia', type=int, default=Config.TRIAGEM_LOTE_CONCORRENCIA, show_default=True,
+              help='Máximo de consultas simultâneas às APIs')
+@click.option('--saida', type=click.File('w', encoding='utf-8'), default='-', help='Arquivo de saída (padrão: stdout)')
+def triagem_lote(arquivo, apis, formato, concorrencia, saida):
+    """Triagem em lote dos CPFs/CNPJs de ARQUIVO (CSV ou um documento por linha; '-' para stdin)"""
+    resultados = triar_documentos(
+        ler_documentos_binario(arquivo),
+        consultar_apis=apis,
+        max_concorrencia=concorrencia,
+        limite=Config.TRIAGEM_LOTE_MAX_DOCUMENTOS
+    )
+
+    formatar = formatar_csv if formato == 'csv' else formatar_ndjson
+    for linha in formatar(resultados):
+        saida.write(linha)
+        if saida is sys.stdout:
+            saida.flush()
+
+
+@click.command('publicar-indice-ceis')
+@click.option('--arquivo', type=click.Path(exists=True, dir_okay=False), default=None,
+              help='CSV do CEIS (padrão: CEIS_CSV ou data/raw/ceis.csv)')
+def publicar_indice_ceis(arquivo):
+    """Reconstrói o índice do CEIS e publica o segmento compartilhado usado pelos demais processos"""
+    path = arquivo or caminho_ceis_local()
+    indice = carregar_indice_sancoes(path, forcar=True)
+
+    segmento = caminho_segmento(path)
+    click.echo(f'{len(indice)} sanções indexadas de {path}')
+    click.echo(f'Segmento: {segmento} (versão {indice.colunas.versao})' if segmento else 'Segmento compartilhado desativado')
+
+
+@click.command('atualizar-sancoes')
+@click.option('--arquivo', type=click.Path(exists=True, dir_okay=False), default=None,
+              help='Snapshot completo do CEIS/CNEP, CSV ou ZIP do Portal (padrão: CEIS_CSV ou data/raw/ceis.csv)')
+def atualizar_sancoes(arquivo):
+    """Aplica à tabela sancoes e ao índice do CEIS só o que mudou desde o snapshot anterior"""
+    path = arquivo or caminho_ceis_local()
+    resumo = aplicar_snapshot_sancoes(path, Config.DELTA_DIR)
+
+    click.echo(f'{resumo["registros"]} sanções em {path} ({resumo["segundos"]}s)')
+    click.echo(f'Inseridas: {resumo["inserted"]}  removidas: {resumo["removed"]}  '
+               f'alteradas: {resumo["changed"]}  sem mudança: {resumo["unchanged"]}')
+    click.echo(f'Índice: {resumo["indice"]}')
+
+
+commands = [triagem_lote, publicar_indice_ceis, atualizar_sancoes]
@@ -3,49 +3,64 @@ Serviço de cruzamento de dados para detectar irregularidades
 """
 from __future__ import annotations
 
-import csv
-from datetime import datetime, date
+import hashlib
+import logging
+from datetime import datetime, date, timezone
 from pathlib import Path
 from typing import Any, List, Dict
 import os
 
+from politicos.engine import (
+    CONTRACT_ALIASES,
+    SANCTION_ALIASES,
+    canonical_row,
+    day_number,
+    iter_rows,
+    normalize_document,
+    overlap_groups,
+    parse_date as engine_parse_date,
+    parse_decimal,
+)
+
 from apps.home.api_services import only_digits
 
+logger = logging.getLogger(__name__)
+
 
 def parse_date(date_str: str) -> date | None:
-    """Converte string de data para objeto date"""
-    if not date_str:
-        return None
-    
-    formats = ["%Y-%m-%d", "%d/%m/%Y", "%Y%m%d"]
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_str, fmt).date()
-        except (ValueError, TypeError):
-            continue
-    return None
+    """Converte string de data para objeto date (mesmos formatos da CLI politicos)"""
+    return engine_parse_date(date_str)
+
+
+def backend_cruzamento() -> str:
+    """Backend do motor de cruzamento: CRUZAMENTO_BACKEND (auto, python, numpy ou pandas)"""
+    return os.getenv("CRUZAMENTO_BACKEND", "auto").lower()
 
 
 def load_ceis_csv(path: str | Path) -> List[Dict[str, Any]]:
     """
     Carrega dados do CEIS de arquivo CSV
+    
+    Aceita os mesmos nomes de coluna (e apelidos) da CLI politicos, inclusive
+    o ZIP do Portal (latin-1, separado por ";") sem extraí-lo
     """
     path = Path(path)
     if not path.exists():
         return []
     
     registros = []
-    with path.open("r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            registros.append({
-                "cpf_cnpj": only_digits(row.get("cnpj_cpf", "")),
-                "nome": row.get("name", ""),
-                "data_inicio": parse_date(row.get("sanction_start", "")),
-                "data_fim": parse_date(row.get("sanction_end", "")),
-                "tipo_sancao": row.get("sanction_type", ""),
-                "orgao": row.get("orgao_sancionador", ""),
-            })
+    for linha, row in enumerate(iter_rows(path), start=1):
+        row = canonical_row(row, SANCTION_ALIASES)
+        registros.append({
+            # Código da sanção do Portal; sem ele, a linha no arquivo
+            "id": row.get("codigo_da_sancao") or str(linha),
+            "cpf_cnpj": normalize_document(row.get("cnpj_cpf", "")),
+            "nome": row.get("name", ""),
+            "data_inicio": parse_date(row.get("sanction_start", "")),
+            "data_fim": parse_date(row.get("sanction_end", "")),
+            "tipo_sancao": row.get("sanction_type", ""),
+            "orgao": row.get("orgao_sancionador", ""),
+        })
     
     return registros
 
@@ -53,52 +68,47 @@ def load_ceis_csv(path: str | Path) -> List[Dict[str, Any]]:
 def load_contratos_csv(path: str | Path) -> List[Dict[str, Any]]:
     """
     Carrega dados de contratos de arquivo CSV
+    
+    Lê tanto o contracts.csv da CLI (supplier_document, contract_date, ...)
+    quanto os nomes em português (cpf_cnpj, data_assinatura, ...), em CSV
+    simples ou dentro de ZIP. Valores aceitam vírgula decimal ("1.234,56");
+    os que não puderem ser lidos ficam como None e são registrados no log
     """
     path = Path(path)
     if not path.exists():
         return []
     
     registros = []
-    with path.open("r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            registros.append({
-                "cpf_cnpj": only_digits(row.get("cpf_cnpj", "")),
-                "nome": row.get("nome", ""),
-                "numero_contrato": row.get("numero", ""),
-                "orgao": row.get("orgao", ""),
-                "valor": float(row.get("valor", 0) or 0),
-                "data_assinatura": parse_date(row.get("data_assinatura", "")),
-                "objeto": row.get("objeto", ""),
-            })
+    invalidos = []
+    for linha, row in enumerate(iter_rows(path), start=1):
+        row = canonical_row(row, CONTRACT_ALIASES)
+        texto = (row.get("contract_value") or "").strip()
+        valor = parse_decimal(texto) if texto else None
+        if texto and valor is None:
+            invalidos.append((linha, texto))
+        registros.append({
+            "cpf_cnpj": normalize_document(row.get("supplier_document", "")),
+            "nome": row.get("supplier_name", ""),
+            "numero_contrato": row.get("contract_number", ""),
+            "orgao": row.get("organ", ""),
+            "valor": valor,
+            "data_assinatura": parse_date(row.get("contract_date", "")),
+            "objeto": row.get("objeto", ""),
+        })
+    
+    if invalidos:
+        linha, texto = invalidos[0]
+        logger.warning(
+            "%s: %d valor(es) de contrato ilegíveis ignorados (linha %d: %r)",
+            path, len(invalidos), linha, texto,
+        )
     
     return registros
 
 
-def verificar_sobreposicao_datas(
-    data_contrato: date,
-    data_inicio_sancao: date | None,
-    data_fim_sancao: date | None
-) -> bool:
-    """
-    Verifica se a data do contrato está dentro do período de sanção
-    """
-    if not data_contrato:
-        return False
-    
-    if not data_inicio_sancao:
-        return False
-    
-    # Se começou depois da sanção começar
-    if data_contrato < data_inicio_sancao:
-        return False
-    
-    # Se não tem data fim, considera sanção ativa
-    if not data_fim_sancao:
-        return True
-    
-    # Se contrato foi assinado antes do fim da sanção
-    return data_contrato <= data_fim_sancao
+def _unir(valores) -> str:
+    """Valores distintos e não vazios, na ordem em que aparecem"""
+    return ", ".join(dict.fromkeys(v for v in valores if v))
 
 
 def cruzar_sancoes_contratos(
@@ -108,58 +118,94 @@ def cruzar_sancoes_contratos(
     """
     Cruza dados de sanções com contratos para identificar irregularidades
     
-    Retorna lista de contratos firmados durante período de sanção ativa
+    Retorna lista de contratos firmados durante período de sanção ativa. As
+    sanções sobrepostas de um mesmo documento são unidas em intervalos
+    disjuntos: cada contrato aparece uma única vez, com todas as sanções
+    vigentes na data em `sancoes`.
     """
     irregularidades = []
     
-    # Indexar sanções por CPF/CNPJ para busca rápida
-    index_sancoes = {}
-    for sancao in sancoes:
-        doc = sancao["cpf_cnpj"]
-        if doc not in index_sancoes:
-            index_sancoes[doc] = []
-        index_sancoes[doc].append(sancao)
+    # Contratos e sanções que os cobrem, pelo motor compartilhado com a CLI
+    posicoes_contrato, grupos = overlap_groups(
+        [c["cpf_cnpj"] for c in contratos],
+        [day_number(c.get("data_assinatura")) for c in contratos],
+        [s["cpf_cnpj"] for s in sancoes],
+        [day_number(s.get("data_inicio")) for s in sancoes],
+        [day_number(s.get("data_fim")) for s in sancoes],
+        backend=backend_cruzamento(),
+    )
     
-    # Verificar cada contrato
-    for contrato in contratos:
-        doc = contrato["cpf_cnpj"]
-        
-        # Buscar sanções deste documento
-        sancoes_doc = index_sancoes.get(doc, [])
-        
-        for sancao in sancoes_doc:
-            # Verificar se contrato foi firmado durante sanção
-            if verificar_sobreposicao_datas(
-                contrato.get("data_assinatura"),
-                sancao.get("data_inicio"),
-                sancao.get("data_fim")
-            ):
-                irregularidades.append({
-                    "cpf_cnpj": doc,
-                    "nome": contrato.get("nome"),
-                    "numero_contrato": contrato.get("numero_contrato"),
-                    "orgao_contratante": contrato.get("orgao"),
-                    "valor_contrato": contrato.get("valor", 0),
-                    "data_contrato": contrato.get("data_assinatura"),
-                    "tipo_sancao": sancao.get("tipo_sancao"),
-                    "orgao_sancionador": sancao.get("orgao"),
-                    "data_inicio_sancao": sancao.get("data_inicio"),
-                    "data_fim_sancao": sancao.get("data_fim"),
-                    "status": "CONTRATO DURANTE SANÇÃO ATIVA",
-                    "nivel_risco": "CRÍTICO"
-                })
+    for posicao_contrato, grupo in zip(posicoes_contrato, grupos):
+        contrato = contratos[posicao_contrato]
+        vigentes = [sancoes[posicao] for posicao in grupo]
+        fins = [s.get("data_fim") for s in vigentes]
+        irregularidades.append({
+            "cpf_cnpj": contrato["cpf_cnpj"],
+            "nome": contrato.get("nome"),
+            "numero_contrato": contrato.get("numero_contrato"),
+            "orgao_contratante": contrato.get("orgao"),
+            "valor_contrato": contrato.get("valor"),
+            "data_contrato": contrato.get("data_assinatura"),
+            "tipo_sancao": _unir(s.get("tipo_sancao") for s in vigentes),
+            "orgao_sancionador": _unir(s.get("orgao") for s in vigentes),
+            "data_inicio_sancao": min(s["data_inicio"] for s in vigentes),
+            "data_fim_sancao": None if None in fins else max(fins),
+            "sancoes": [
+                {
+                    "id": s.get("id"),
+                    "tipo_sancao": s.get("tipo_sancao"),
+                    "orgao_sancionador": s.get("orgao"),
+                    "data_inicio": s.get("data_inicio"),
+                    "data_fim": s.get("data_fim"),
+                }
+                for s in vigentes
+            ],
+            "status": "CONTRATO DURANTE SANÇÃO ATIVA",
+            "nivel_risco": "CRÍTICO"
+        })
     
     return irregularidades
 
 
+def caminhos_dados_locais() -> tuple[Path, Path]:
+    """Arquivos de CEIS e contratos usados no cruzamento local"""
+    base_dir = Path(__file__).resolve().parents[2]
+    return (
+        base_dir / "old" / "data" / "raw" / "ceis.csv",
+        base_dir / "old" / "data" / "raw" / "contracts.csv",
+    )
+
+
+def impressao_digital_dados() -> tuple[str, datetime | None]:
+    """
+    Identifica a versão dos dados de entrada sem lê-los
+    
+    Retorna (hash de caminho/tamanho/mtime dos arquivos, data da última modificação)
+    """
+    digest = hashlib.sha256()
+    ultima_modificacao = None
+    
+    for path in caminhos_dados_locais():
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            digest.update(f"{path}:ausente\n".encode())
+            continue
+        
+        digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+        modificado = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+        if ultima_modificacao is None or modificado > ultima_modificacao:
+            ultima_modificacao = modificado
+    
+    return digest.hexdigest(), ultima_modificacao
+
+
 def analisar_dados_locais() -> Dict[str, Any]:
     """
     Analisa dados de CEIS e contratos locais e retorna estatísticas
     """
     # Caminhos dos arquivos
-    base_dir = Path(__file__).resolve().parents[2]
-    ceis_path = base_dir / "old" / "data" / "raw" / "ceis.csv"
-    contratos_path = base_dir / "old" / "data" / "raw" / "contracts.csv"
+    ceis_path, contratos_path = caminhos_dados_locais()
     
     # Carregar dados
     sancoes = load_ceis_csv(ceis_path)
@@ -169,8 +215,8 @@ def analisar_dados_locais() -> Dict[str, Any]:
     irregularidades = cruzar_sancoes_contratos(sancoes, contratos)
     
     # Calcular estatísticas
-    valor_total_contratos = sum(c.get("valor", 0) for c in contratos)
-    valor_irregular = sum(i.get("valor_contrato", 0) for i in irregularidades)
+    valor_total_contratos = sum(c.get("valor") or 0 for c in contratos)
+    valor_irregular = sum(i.get("valor_contrato") or 0 for i in irregularidades)
     
     # Agrupar por empresa
     empresas_irregulares = {}
@@ -184,7 +230,7 @@ def analisar_dados_locais() -> Dict[str, Any]:
                 "valor_total": 0
             }
         empresas_irregulares[doc]["contratos"].append(irreg)
-        empresas_irregulares[doc]["valor_total"] += irreg.get("valor_contrato", 0)
+        empresas_irregulares[doc]["valor_total"] += irreg.get("valor_contrato") or 0
     
     return {
         "total_sancoes": len(sancoes),
@@ -0,0 +1,66 @@
+"""
+GET condicional (ETag/Last-Modified) para rotas derivadas dos dados locais
+"""
+from __future__ import annotations
+
+import hashlib
+from datetime import datetime
+from functools import wraps
+
+from flask import request, make_response
+from flask_login import current_user
+
+from apps.home.snapshot_service import snapshot_atual
+
+
+def _nao_modificado(etag: str, ultima_modificacao) -> bool:
+    """Avalia If-None-Match (prioritário) e If-Modified-Since"""
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+
+    if request.if_modified_since and ultima_modificacao:
+        # HTTP-date tem resolução de segundos
+        return ultima_modificacao.replace(microsecond=0) <= request.if_modified_since
+
+    return False
+
+
+def condicional_por_dados(por_usuario: bool = False):
+    """
+    Responde 304 sem executar a rota quando os dados de entrada não mudaram
+
+    O ETag forte é a impressão digital dos arquivos de CEIS/contratos a partir
+    dos quais o snapshot servido foi calculado; `por_usuario` inclui o usuário
+    no ETag (páginas HTML personalizadas).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            try:
+                snapshot = snapshot_atual()
+            except Exception:
+                return view(*args, **kwargs)
+
+            etag = snapshot["impressao_digital"]
+            ultima_modificacao = snapshot.get("ultima_modificacao")
+            if ultima_modificacao:
+                ultima_modificacao = datetime.fromisoformat(ultima_modificacao)
+            if por_usuario:
+                usuario = current_user.get_id() if current_user.is_authenticated else ''
+                etag = hashlib.sha256(f"{etag}:{usuario}".encode()).hexdigest()
+
+            if _nao_modificado(etag, ultima_modificacao):
+                resposta = make_response('', 304)
+            else:
+                resposta = make_response(view(*args, **kwargs))
+                if resposta.status_code != 200:
+                    return resposta
+
+            resposta.set_etag(etag)
+            resposta.last_modified = ultima_modificacao
+            resposta.headers['Cache-Control'] = 'private, no-cache'
+            if por_usuario:
+                resposta.vary.add('Cookie')
+            return resposta
+        return wrapper
+    return decorator
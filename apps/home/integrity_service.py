@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import csv
 import json
 import os
 import re
@@ -10,6 +9,8 @@ from urllib.error import HTTPError, URLError
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
 
+from apps.home.sanction_index import obter_indice_sancoes
+
 
 TRANSPARENCIA_BASE_URL = "https://api.portaldatransparencia.gov.br/api-de-dados"
 
@@ -93,22 +94,8 @@ def consultar_ceis_local(documento: str) -> dict[str, Any]:
         }
 
     try:
-        matches: list[dict[str, Any]] = []
-        with ceis_path.open("r", encoding="utf-8", newline="") as file_handle:
-            reader = csv.DictReader(file_handle)
-            for row in reader:
-                row_doc = only_digits(row.get("cnpj_cpf", ""))
-                if row_doc == doc:
-                    matches.append(
-                        {
-                            "source_id": row.get("source_id", "CEIS"),
-                            "cnpj_cpf": row.get("cnpj_cpf", ""),
-                            "name": row.get("name", ""),
-                            "sanction_start": row.get("sanction_start", ""),
-                            "sanction_end": row.get("sanction_end", ""),
-                            "sanction_type": row.get("sanction_type", ""),
-                        }
-                    )
+        # Índice em memória (compartilhado entre workers no modo preload) em vez de varrer o CSV
+        matches = obter_indice_sancoes(ceis_path).buscar(doc)
 
         return {
             "ok": True,
@@ -4,19 +4,31 @@ Copyright (c) 2019 - present AppSeed.us
 """
 
 from apps.home import blueprint
-from flask import render_template, request, jsonify
+from flask import render_template, request, jsonify, url_for, Response, stream_with_context
 from flask_login import login_required, current_user
 from jinja2 import TemplateNotFound
 import re
 import json
+import threading
+import time
 
 from apps.home.integrity_service import analisar_integridade
-from apps.home.api_services import consultar_multiplas_fontes, calcular_nivel_risco
-from apps.home.data_crossing_service import (
-    analisar_dados_locais,
-    detectar_padroes_suspeitos
+from apps.home.api_services import (
+    consultar_multiplas_fontes,
+    calcular_nivel_risco,
+    tipo_documento
 )
+from apps.home.analise_service import executar_analise_completa
+from apps.home.http_cache import condicional_por_dados
+from apps.home.batch_service import (
+    ler_documentos_binario,
+    triar_documentos,
+    formatar_ndjson,
+    formatar_csv
+)
+from apps.home.snapshot_service import snapshot_atual
 from apps.models import ConsultaIntegridade, AnaliseCompleta, RISK_LEVEL
+from apps.config import Config
 from apps import db
 
 def _determinar_tipo_documento(documento: str) -> str:
@@ -37,12 +49,14 @@ def _obter_ip_cliente() -> str:
 
 @blueprint.route('/index')
 @login_required
+@condicional_por_dados(por_usuario=True)
 def index():
     """Dashboard principal com estatísticas"""
     try:
-        # Carregar estatísticas dos dados locais
-        analise = analisar_dados_locais()
-        padroes = detectar_padroes_suspeitos(analise)
+        # Estatísticas pré-calculadas (snapshot mais recente)
+        snapshot = snapshot_atual()
+        analise = snapshot["analise"]
+        padroes = snapshot["padroes"]
         
         return render_template(
             'home/index.html',
@@ -145,6 +159,31 @@ def monitor_integridade():
         )
 
 
+def _enfileirar_analise(cpf_cnpj: str):
+    """Enfileira a análise completa no Celery; retorna None se o broker estiver indisponível"""
+    if not Config.ANALISE_ASSINCRONA:
+        return None
+
+    from celery.utils import uuid
+    from apps.tasks import analise_completa_job, set_job_owner  # Celery carregado só quando usado
+    try:
+        # Dono gravado antes do envio: o status nunca é consultado sem ele
+        job_id = uuid()
+        set_job_owner(job_id, current_user.id)
+        return analise_completa_job.apply_async(
+            task_id=job_id,
+            args=(cpf_cnpj,),
+            kwargs={
+                "usuario_id": current_user.id if current_user.is_authenticated else None,
+                "ip_origem": _obter_ip_cliente()
+            },
+            retry=False
+        )
+    except Exception as e:
+        print(f"[ANALISE] Broker indisponível, executando de forma síncrona: {e}")
+        return None
+
+
 @blueprint.route('/analise-completa', methods=['GET', 'POST'])
 @login_required
 def analise_completa():
@@ -153,6 +192,7 @@ def analise_completa():
     cpf_cnpj = ""
     erro = None
     historico = []
+    job_id = None
 
     try:
         if request.method == 'POST':
@@ -160,73 +200,25 @@ def analise_completa():
             cpf_cnpj_limpo = re.sub(r'\D', '', cpf_cnpj)
             
             try:
-                print(f"[ANALISE] Iniciando análise completa para: {cpf_cnpj}")
-                
-                # Consultar múltiplas fontes
-                dados = consultar_multiplas_fontes(cpf_cnpj)
-                
-                # Calcular nível de risco
-                avaliacao = calcular_nivel_risco(dados)
-                
-                resultado = {
-                    "documento": dados.get("documento"),
-                    "tipo": dados.get("tipo"),
-                    "documento_formatado": dados.get("documento_formatado"),
-                    "fontes": dados.get("fontes", {}),
-                    "avaliacao": avaliacao
-                }
-                
-                print(f"[ANALISE] Análise concluída - Nível de risco: {avaliacao.get('nivel_risco')}")
-                
-                # Determinar nível de risco
-                nivel_risco_str = avaliacao.get('nivel_risco', 'medio')
-                try:
-                    nivel_risco = RISK_LEVEL[nivel_risco_str]
-                except KeyError:
-                    nivel_risco = RISK_LEVEL.medio
-                
-                # Extrair contadores de registros
-                fontes = dados.get("fontes", {})
-                
-                # Criar registro de análise
-                print(f"[ANALISE] Salvando análise no banco de dados")
-                analise = AnaliseCompleta(
-                    cpf_cnpj=cpf_cnpj_limpo,
-                    tipo_documento=dados.get("tipo", "DESCONHECIDO"),
-                    nivel_risco=nivel_risco,
-                    pontuacao_risco=avaliacao.get('pontuacao', 0),
-                    total_ceis=fontes.get("ceis", {}).get("total", 0),
-                    total_cnep=fontes.get("cnep", {}).get("total", 0),
-                    total_cepim=fontes.get("cepim", {}).get("total", 0),
-                    total_contratos=fontes.get("contratos", {}).get("total", 0),
-                    total_convenios=fontes.get("convenios", {}).get("total", 0),
-                    total_pncp=fontes.get("pncp", {}).get("total", 0),
-                    dados_ceis=fontes.get("ceis", {}).get("dados", []),
-                    dados_cnep=fontes.get("cnep", {}).get("dados", []),
-                    dados_cepim=fontes.get("cepim", {}).get("dados", []),
-                    dados_contratos=fontes.get("contratos", {}).get("dados", []),
-                    dados_convenios=fontes.get("convenios", {}).get("dados", []),
-                    dados_pncp=fontes.get("pncp", {}).get("dados", []),
-                    dados_receita_federal=fontes.get("receita_federal", {}),
-                    dados_tse={
-                        "candidaturas": fontes.get("tse_candidaturas", {}),
-                        "bens": fontes.get("tse_bens", {})
-                    },
-                    resultado_completo=resultado,
-                    avaliacao=avaliacao,
-                    alertas=avaliacao.get('alertas', []),
-                    usuario_id=current_user.id if current_user.is_authenticated else None,
-                    ip_origem=_obter_ip_cliente()
-                )
-                
-                # Salvar no banco de dados
-                analise.save()
-                print(f"[ANALISE] Salvo com sucesso - ID: {analise.id}")
+                if tipo_documento(cpf_cnpj_limpo) == "INVALIDO":
+                    raise ValueError("Documento inválido. Informe CPF (11 dígitos) ou CNPJ (14 dígitos)")
+
+                job = _enfileirar_analise(cpf_cnpj_limpo)
+                if job is not None:
+                    # A página acompanha o progresso e carrega o resultado ao final
+                    print(f"[ANALISE] Job {job.id} enfileirado para: {cpf_cnpj}")
+                    job_id = job.id
+                else:
+                    print(f"[ANALISE] Iniciando análise completa para: {cpf_cnpj}")
+                    resultado, analise = executar_analise_completa(
+                        cpf_cnpj_limpo,
+                        usuario_id=current_user.id if current_user.is_authenticated else None,
+                        ip_origem=_obter_ip_cliente()
+                    )
+                    print(f"[ANALISE] Salvo com sucesso - ID: {analise.id} - Nível de risco: {resultado['avaliacao'].get('nivel_risco')}")
                 
-                # Carregar histórico
-                print(f"[ANALISE] Buscando histórico para {cpf_cnpj_limpo}")
-                historico = AnaliseCompleta.find_by_cpf_cnpj(cpf_cnpj_limpo)
-                print(f"[ANALISE] Encontrados {len(historico)} registros no histórico")
+                    # Carregar histórico
+                    historico = AnaliseCompleta.find_by_cpf_cnpj(cpf_cnpj_limpo)
                 
             except Exception as e:
                 import traceback
@@ -235,13 +227,24 @@ def analise_completa():
                 print(f"[ERROR] Traceback:\n{traceback.format_exc()}")
                 erro = f"Erro ao processar análise: {str(e)}"
 
+        elif request.args.get('analise', type=int):
+            # Resultado de um job concluído
+            analise = AnaliseCompleta.find_by_id(request.args.get('analise', type=int))
+            if analise and analise.visivel_para(current_user.id):
+                resultado = analise.resultado_completo
+                cpf_cnpj = analise.cpf_cnpj
+                historico = AnaliseCompleta.find_by_cpf_cnpj(analise.cpf_cnpj)
+            else:
+                erro = "Análise não encontrada"
+
         return render_template(
             'home/analise_completa.html',
             segment='analise_completa',
             resultado=resultado,
             cpf_cnpj=cpf_cnpj,
             erro=erro,
-            historico=historico or []
+            historico=historico or [],
+            job_id=job_id
         )
         
     except Exception as e:
@@ -259,12 +262,145 @@ def analise_completa():
         )
 
 
+@blueprint.route('/api/analise-completa', methods=['POST'])
+@login_required
+def api_analise_completa():
+    """API JSON que enfileira uma análise completa e retorna o id do job"""
+    dados = request.get_json(silent=True) or request.form
+    cpf_cnpj = re.sub(r'\D', '', dados.get('cpf_cnpj', ''))
+
+    if tipo_documento(cpf_cnpj) == "INVALIDO":
+        return jsonify({"erro": "Documento inválido. Informe CPF (11 dígitos) ou CNPJ (14 dígitos)"}), 400
+
+    job = _enfileirar_analise(cpf_cnpj)
+    if job is None:
+        return jsonify({"erro": "Fila de análises indisponível"}), 503
+
+    return jsonify({
+        "job_id": job.id,
+        "status_url": url_for('home_blueprint.api_analise_status', job_id=job.id)
+    }), 202
+
+
+def _job_do_usuario(job_id: str):
+    """
+    Resposta de erro (404/503) se o job não for do usuário atual, senão None
+
+    Jobs de outros usuários (ou desconhecidos) não são expostos, em qualquer estado.
+    """
+    from apps.tasks import get_job_owner
+
+    try:
+        dono = get_job_owner(job_id)
+    except Exception as e:
+        print(f"[ANALISE] Backend de resultados indisponível: {e}")
+        return jsonify({"erro": "Fila de análises indisponível"}), 503
+    if dono != str(current_user.id):
+        return jsonify({"erro": "Job não encontrado"}), 404
+    return None
+
+
+def _estado_job(job_id: str, resultados: bool = False) -> dict:
+    """
+    Estado e progresso por fonte de um job de análise completa
+
+    Com `resultados`, inclui o resultado de cada fonte já concluída.
+    """
+    from apps.tasks import celery_app
+
+    job = celery_app.AsyncResult(job_id)
+    info = job.info if isinstance(job.info, dict) else {}
+
+    estado = {
+        "job_id": job_id,
+        "estado": job.state,
+        "total": info.get('total', 0),
+        "concluidas": info.get('concluidas', 0),
+        "fontes": info.get('fontes', {})
+    }
+    if resultados:
+        estado["resultados"] = info.get('resultados', {})
+
+    if job.state == 'SUCCESS':
+        estado["analise_id"] = info.get('analise_id')
+        estado["nivel_risco"] = info.get('nivel_risco')
+        estado["avaliacao"] = info.get('avaliacao')
+        estado["url_resultado"] = url_for('home_blueprint.analise_completa', analise=info.get('analise_id'))
+    elif job.state == 'FAILURE':
+        estado["erro"] = str(job.info)
+
+    return estado
+
+
+@blueprint.route('/api/analise-completa/<job_id>')
+@login_required
+def api_analise_status(job_id):
+    """Progresso por fonte de uma análise completa enfileirada"""
+    erro = _job_do_usuario(job_id)
+    if erro:
+        return erro
+
+    return jsonify(_estado_job(job_id))
+
+
+# Cada stream aberto ocupa uma thread do gunicorn até o fim do job
+_streams_analise = threading.BoundedSemaphore(Config.ANALISE_STREAM_MAX)
+
+
+@blueprint.route('/api/analise-completa/<job_id>/stream')
+@login_required
+def api_analise_stream(job_id):
+    """
+    Resultados de uma análise completa enfileirada como Server-Sent Events
+
+    A consulta e o registro acontecem no worker Celery; aqui só se acompanha o
+    estado do job, emitindo `fonte` com o resultado de cada fonte assim que ela
+    responde, `progresso` a cada mudança e `fim` com o estado final (SUCCESS
+    ou FAILURE). Acima de ANALISE_STREAM_MAX streams no processo responde 503 e
+    a página passa a consultar o status periodicamente.
+    """
+    erro = _job_do_usuario(job_id)
+    if erro:
+        return erro
+    if not _streams_analise.acquire(blocking=False):
+        return jsonify({"erro": "Muitos acompanhamentos simultâneos; consulte o status"}), 503, {'Retry-After': '1'}
+
+    def eventos():
+        anterior = None
+        enviadas = set()
+        limite = time.monotonic() + Config.ANALISE_STREAM_TIMEOUT
+        while time.monotonic() < limite:
+            estado = _estado_job(job_id, resultados=True)
+            for nome, resultado in estado.pop("resultados").items():
+                if nome not in enviadas:
+                    enviadas.add(nome)
+                    yield _evento_sse('fonte', {"nome": nome, "resultado": resultado})
+            if estado["estado"] in ('SUCCESS', 'FAILURE'):
+                yield _evento_sse('fim', estado)
+                return
+            if estado != anterior:
+                yield _evento_sse('progresso', estado)
+                anterior = estado
+            time.sleep(Config.ANALISE_STREAM_INTERVALO)
+        yield _evento_sse('fim', {**(anterior or {}), "erro": "Tempo de acompanhamento esgotado"})
+
+    resposta = Response(
+        stream_with_context(eventos()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    # Liberado quando o servidor fecha a resposta (fim do job, timeout ou cliente desconectado)
+    resposta.call_on_close(_streams_analise.release)
+    return resposta
+
+
 @blueprint.route('/sancoes-contratos')
 @login_required
+@condicional_por_dados(por_usuario=True)
 def sancoes_contratos():
     """Visualização de sanções vs contratos"""
     try:
-        analise = analisar_dados_locais()
+        analise = snapshot_atual()["analise"]
         
         return render_template(
             'home/sancoes_contratos.html',
@@ -282,10 +418,11 @@ def sancoes_contratos():
 
 @blueprint.route('/api/estatisticas')
 @login_required
+@condicional_por_dados()
 def api_estatisticas():
     """API JSON com estatísticas"""
     try:
-        analise = analisar_dados_locais()
+        analise = snapshot_atual()["analise"]
         return jsonify(analise)
     except Exception as e:
         return jsonify({"erro": str(e)}), 500
@@ -305,6 +442,47 @@ def api_consultar(cpf_cnpj):
 
 
 
+def _evento_sse(evento: str, dados) -> str:
+    """Formata uma mensagem Server-Sent Events"""
+    return f"event: {evento}\ndata: {json.dumps(dados, ensure_ascii=False, default=str)}\n\n"
+
+
+@blueprint.route('/api/triagem-lote', methods=['POST'])
+@login_required
+def api_triagem_lote():
+    """
+    Triagem em lote de CPFs/CNPJs
+
+    Aceita JSON {"documentos": [...]} ou um CSV no campo `arquivo`.
+    Parâmetros: `apis=1` para consultar as APIs públicas, `formato=ndjson|csv`.
+    """
+    dados = request.get_json(silent=True) or {}
+    formato = request.args.get('formato', dados.get('formato', 'ndjson'))
+    consultar_apis = str(request.args.get('apis', dados.get('apis', ''))).lower() in ('1', 'true', 'sim')
+
+    if 'arquivo' in request.files:
+        documentos = ler_documentos_binario(request.files['arquivo'].stream)
+    else:
+        documentos = dados.get('documentos')
+        if not isinstance(documentos, list):
+            return jsonify({"erro": "Envie {\"documentos\": [...]} ou um CSV no campo 'arquivo'"}), 400
+
+    resultados = triar_documentos(
+        documentos,
+        consultar_apis=consultar_apis,
+        max_concorrencia=Config.TRIAGEM_LOTE_CONCORRENCIA,
+        limite=Config.TRIAGEM_LOTE_MAX_DOCUMENTOS
+    )
+
+    if formato == 'csv':
+        return Response(
+            stream_with_context(formatar_csv(resultados)),
+            mimetype='text/csv',
+            headers={'Content-Disposition': 'attachment; filename="triagem.csv"'}
+        )
+    return Response(stream_with_context(formatar_ndjson(resultados)), mimetype='application/x-ndjson')
+
+
 @blueprint.route('/<template>')
 @login_required
 def route_template(template):
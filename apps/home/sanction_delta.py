@@ -0,0 +1,197 @@
+"""
+Atualização incremental das sanções (CEIS/CNEP) a partir do snapshot diário do Portal
+
+Cada linha normalizada vira um par (chave, hash); o conjunto do snapshot
+anterior fica em DELTA_DIR como dois arrays ordenados pela chave, e só as
+linhas inseridas, removidas ou alteradas chegam à tabela `sancoes` e ao
+índice do CEIS em memória.
+"""
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import time
+from itertools import chain, islice
+from pathlib import Path
+from typing import Any, Dict, Iterator, Tuple
+
+from politicos.engine import (
+    SANCTION_ALIASES,
+    Delta,
+    HashSet,
+    build_hash_set,
+    canonical_row,
+    compare,
+    iter_rows,
+    load_hash_set,
+    row_hash,
+    save_hash_set,
+)
+
+from apps.config import Config
+from apps.home.api_services import only_digits
+from apps.home.data_crossing_service import parse_date
+from apps.home.sanction_index import (
+    aplicar_delta_colunas,
+    assinatura_arquivo,
+    chave_sancao,
+    chave_unica,
+    linha_indice,
+)
+from apps.home.shared_index import (
+    abrir_segmento_digest,
+    caminho_segmento,
+    digest_assinatura,
+    publicar_segmento,
+)
+
+LOTE = 500
+
+
+def caminho_estado(origem: Path, diretorio: str | Path | None = None) -> Path:
+    """Um arquivo de hashes por arquivo de origem"""
+    nome = hashlib.sha1(str(Path(origem).resolve()).encode()).hexdigest()[:12]
+    return Path(diretorio or Config.DELTA_DIR) / f"sancoes-{nome}.delta"
+
+
+def _linhas(path: Path) -> Iterator[Tuple[int, Dict[str, str]]]:
+    """(chave da sanção, linha canônica) das linhas com CPF/CNPJ utilizável"""
+    ocorrencias: Dict[int, int] = {}
+    for row in iter_rows(path):
+        row = canonical_row(row, SANCTION_ALIASES)
+        chave = chave_unica(chave_sancao(row), ocorrencias)
+        cpf_cnpj = row.get("cnpj_cpf") or ""
+        if only_digits(cpf_cnpj) and "*" not in cpf_cnpj:
+            yield chave, row
+
+
+def hashes_snapshot(path: Path) -> HashSet:
+    """Primeira passada: só os pares (chave, hash de todos os campos), sem guardar as linhas"""
+    return build_hash_set(
+        (chave, row_hash(sorted((campo, valor or "") for campo, valor in row.items())))
+        for chave, row in _linhas(path)
+    )
+
+
+def linhas_do_delta(path: Path, chaves: set[int]) -> Dict[int, Dict[str, str]]:
+    """Segunda passada: guarda só as linhas inseridas ou alteradas"""
+    return {chave: row for chave, row in _linhas(path) if chave in chaves}
+
+
+def registro_banco(row: Dict[str, str], chave: int) -> Dict[str, Any]:
+    """Linha canônica do CEIS/CNEP -> colunas da tabela sancoes"""
+    doc = only_digits(row.get("cnpj_cpf", ""))
+    return {
+        "cpf_cnpj": doc[:14],
+        "nome_sancionado": (row.get("name") or "")[:256],
+        "tipo_pessoa": {11: "PF", 14: "PJ"}.get(len(doc)),
+        "tipo_sancao": (row.get("sanction_type") or "")[:100] or None,
+        "orgao_sancionador": (row.get("orgao_sancionador") or "")[:256] or None,
+        "data_inicio_sancao": parse_date(row.get("sanction_start", "")),
+        "data_fim_sancao": parse_date(row.get("sanction_end", "")),
+        "motivo": row.get("fundamentacao_legal") or None,
+        "fonte": (row.get("source_id") or "CEIS")[:50],
+        "chave_delta": chave,
+    }
+
+
+def _lotes(valores, tamanho: int = LOTE) -> Iterator[list]:
+    iterador = iter(valores)
+    while lote := list(islice(iterador, tamanho)):
+        yield lote
+
+
+def aplicar_delta_banco(delta: Delta, linhas: Dict[int, Dict[str, str]], primeira_carga: bool = False) -> None:
+    """
+    Remove as sanções removidas/alteradas e insere as novas versões, numa única transação
+
+    Idempotente: as chaves inseridas também são apagadas antes da inserção, então
+    reaplicar o mesmo delta (execução interrompida antes de gravar os hashes) não
+    duplica linhas. Na primeira carga, as sanções importadas fora do delta (sem
+    `chave_delta`) são substituídas pelo snapshot.
+    """
+    from apps import db
+    from apps.models import Sancao
+
+    try:
+        if primeira_carga:
+            Sancao.query.filter(Sancao.chave_delta.is_(None)).delete(synchronize_session=False)
+        for lote in _lotes(chain(delta.removed, delta.changed, delta.inserted)):
+            Sancao.query.filter(Sancao.chave_delta.in_(lote)).delete(synchronize_session=False)
+        for lote in _lotes(chain(delta.inserted, delta.changed)):
+            db.session.bulk_insert_mappings(Sancao, [registro_banco(linhas[chave], chave) for chave in lote])
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+def aplicar_delta_indice(
+    path: Path,
+    delta: Delta,
+    linhas: Dict[int, Dict[str, str]],
+    digest_anterior: bytes | None
+) -> int | None:
+    """
+    Publica o segmento do índice do CEIS para o arquivo novo a partir do
+    segmento do snapshot anterior, sem reler o arquivo
+
+    Retorna a versão publicada, ou None se não houver segmento anterior
+    compatível (o índice é reconstruído do arquivo na próxima consulta).
+    """
+    destino = caminho_segmento(path)
+    if destino is None:
+        return None
+
+    # Algum processo já reconstruiu o índice a partir do arquivo novo
+    atual = abrir_segmento_digest(destino, digest_assinatura(assinatura_arquivo(path)))
+    if atual is not None:
+        return atual.versao
+
+    colunas = abrir_segmento_digest(destino, digest_anterior) if digest_anterior else None
+    if colunas is None:
+        return None
+
+    novas = (linha_indice(linhas[chave], chave) for chave in chain(delta.inserted, delta.changed))
+    remover = set(chain(delta.removed, delta.changed))
+    atualizadas = aplicar_delta_colunas(colunas, remover, novas)
+
+    with open(destino.with_name(destino.name + ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        return publicar_segmento(atualizadas, destino, assinatura_arquivo(path))
+
+
+def atualizar_sancoes(path: str | Path, diretorio: str | Path | None = None) -> Dict[str, Any]:
+    """
+    Aplica um snapshot completo do CEIS/CNEP como delta do anterior
+
+    Na primeira execução todas as linhas entram como inseridas. Os hashes do
+    snapshot só são gravados depois que banco e índice foram atualizados; se a
+    execução parar antes disso, a próxima reaplica o mesmo delta sem duplicar.
+    """
+    path = Path(path)
+    inicio = time.perf_counter()
+    assinatura = assinatura_arquivo(path)
+    estado = caminho_estado(path, diretorio)
+
+    anterior = load_hash_set(estado)
+    hashes_anteriores, digest_anterior = anterior if anterior else (None, None)
+
+    atual = hashes_snapshot(path)
+    delta = compare(hashes_anteriores, atual)
+
+    chaves = set(chain(delta.inserted, delta.changed))
+    linhas = linhas_do_delta(path, chaves) if chaves else {}
+
+    aplicar_delta_banco(delta, linhas, primeira_carga=hashes_anteriores is None)
+    versao = aplicar_delta_indice(path, delta, linhas, digest_anterior)
+
+    save_hash_set(atual, estado, digest_assinatura(assinatura))
+
+    return {
+        "arquivo": str(path),
+        "registros": len(atual),
+        **delta.summary(),
+        "indice": f"atualizado (versão {versao})" if versao else "reconstruído na próxima consulta",
+        "segundos": round(time.perf_counter() - inicio, 3),
+    }
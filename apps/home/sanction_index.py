@@ -0,0 +1,273 @@
+"""
+Índice em memória das sanções do CEIS local, por CPF/CNPJ
+
+Os arrays vêm do segmento compartilhado do host (shared_index), construído
+por um único processo e mapeado pelos demais.
+"""
+from __future__ import annotations
+
+import heapq
+import os
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from politicos.engine import SANCTION_ALIASES, canonical_row, iter_rows, row_hash
+
+from apps.home.api_services import only_digits
+from apps.home.data_crossing_service import parse_date
+from apps.home.shared_index import ColunasIndice, colunas_compartilhadas
+
+
+def caminho_ceis_local() -> Path:
+    """Arquivo CEIS configurado em CEIS_CSV ou data/raw/ceis.csv na raiz do projeto"""
+    padrao = Path(__file__).resolve().parents[2] / "data" / "raw" / "ceis.csv"
+    return Path(os.getenv("CEIS_CSV", str(padrao)))
+
+
+def assinatura_arquivo(path: Path) -> tuple:
+    """Identifica a versão de um arquivo por caminho, tamanho e data de modificação"""
+    stat = path.stat()
+    return (str(path), stat.st_size, stat.st_mtime_ns)
+
+
+def registro_ceis(row: Dict[str, str]) -> Dict[str, Any]:
+    """Converte uma linha do CSV do CEIS no registro exposto pelas consultas"""
+    return {
+        "source_id": row.get("source_id", "CEIS"),
+        "cnpj_cpf": row.get("cnpj_cpf", ""),
+        "name": row.get("name", ""),
+        "sanction_start": row.get("sanction_start", ""),
+        "sanction_end": row.get("sanction_end", ""),
+        "sanction_type": row.get("sanction_type", ""),
+    }
+
+
+CAMPOS = ("source_id", "cnpj_cpf", "name", "sanction_start", "sanction_end", "sanction_type")
+SEPARADOR = "\x1f"
+
+
+def chave_documento(documento: str) -> int:
+    """Chave inteira de um CPF/CNPJ (inclui o tamanho, para CPF e CNPJ não colidirem)"""
+    return int(documento) * 100 + len(documento)
+
+
+class IndiceSancoes:
+    """
+    Sanções do CEIS ordenadas por documento, em arrays compactos (somente leitura)
+
+    Os registros ficam em um único bloco de bytes com offsets em `array` (ou
+    no segmento compartilhado mapeado em memória), sem um objeto Python por
+    registro: processos criados por fork compartilham as páginas do índice
+    (copy-on-write) sem copiá-las ao consultar.
+    """
+
+    def __init__(self, assinatura: tuple, colunas: ColunasIndice):
+        self.assinatura = assinatura
+        self.colunas = colunas
+        self.chaves = colunas.chaves
+        self.offsets = colunas.offsets
+        self.dados = colunas.dados
+
+    def _registro(self, posicao: int) -> Dict[str, Any]:
+        bloco = bytes(self.dados[self.offsets[posicao]:self.offsets[posicao + 1]])
+        return dict(zip(CAMPOS, bloco.decode("utf-8").split(SEPARADOR)))
+
+    def _intervalo(self, documento: str) -> range:
+        doc = only_digits(documento)
+        if not doc:
+            return range(0)
+        chave = chave_documento(doc)
+        return range(bisect_left(self.chaves, chave), bisect_right(self.chaves, chave))
+
+    def buscar(self, documento: str) -> List[Dict[str, Any]]:
+        """Retorna as sanções de um CPF/CNPJ (lista vazia se não houver)"""
+        return [self._registro(posicao) for posicao in self._intervalo(documento)]
+
+    def sancionado_em(self, documento: str, dia: date) -> bool:
+        """Se o documento tinha sanção vigente no dia (sem data de fim = vigente)"""
+        ordinal = dia.toordinal()
+        for posicao in self._intervalo(documento):
+            inicio, fim = self.colunas.inicio[posicao], self.colunas.fim[posicao]
+            if inicio and inicio <= ordinal and (not fim or ordinal <= fim):
+                return True
+        return False
+
+    def __contains__(self, documento: str) -> bool:
+        return len(self._intervalo(documento)) > 0
+
+    def __len__(self) -> int:
+        return len(self.chaves)
+
+
+def _ordinal(valor: str) -> int:
+    """Data como ordinal (0 = ausente); ISO primeiro, por ser o formato do arquivo"""
+    try:
+        return date.fromisoformat(valor).toordinal()
+    except (TypeError, ValueError):
+        dia = parse_date(valor)
+        return dia.toordinal() if dia else 0
+
+
+def chave_sancao(row: Dict[str, str]) -> int:
+    """
+    Identidade de uma sanção no delta diário (sanction_delta)
+
+    O código da sanção do Portal quando existe; senão fonte, documento, tipo,
+    início e órgão sancionador, já normalizados (ver chave_unica).
+    """
+    codigo = row.get("codigo_da_sancao")
+    if codigo:
+        return row_hash(("codigo", codigo.strip()))
+    return row_hash((
+        row.get("source_id") or "CEIS",
+        only_digits(row.get("cnpj_cpf", "")),
+        (row.get("sanction_type") or "").strip(),
+        _ordinal(row.get("sanction_start", "")),
+        (row.get("orgao_sancionador") or "").strip(),
+    ))
+
+
+def chave_unica(chave: int, ocorrencias: Dict[int, int]) -> int:
+    """Sanções com a mesma identidade no arquivo são distinguidas pela ordem em que aparecem"""
+    vezes = ocorrencias.get(chave, 0)
+    ocorrencias[chave] = vezes + 1
+    return chave if vezes == 0 else row_hash((chave, vezes))
+
+
+def linha_indice(row: Dict[str, str], id_sancao: int) -> tuple[int, int, int, bytes, int] | None:
+    """Linha canônica do CEIS -> (chave do documento, início, fim, registro serializado, chave da sanção)"""
+    doc = only_digits(row.get("cnpj_cpf", ""))
+    if not doc or "*" in row.get("cnpj_cpf", ""):
+        return None
+    registro = registro_ceis(row)
+    texto = SEPARADOR.join(str(registro[campo]).replace(SEPARADOR, " ") for campo in CAMPOS)
+    return (
+        chave_documento(doc),
+        _ordinal(registro["sanction_start"]),
+        _ordinal(registro["sanction_end"]),
+        texto.encode("utf-8"),
+        id_sancao,
+    )
+
+
+def montar_colunas(linhas: Iterable[tuple[int, int, int, bytes, int]]) -> ColunasIndice:
+    """Arrays do índice a partir de linhas já ordenadas por documento"""
+    chaves, ids, inicio, fim = array("q"), array("q"), array("i"), array("i")
+    offsets = array("Q", [0])
+    blocos = []
+    for chave, dia_inicio, dia_fim, bloco, id_sancao in linhas:
+        chaves.append(chave)
+        ids.append(id_sancao)
+        inicio.append(dia_inicio)
+        fim.append(dia_fim)
+        offsets.append(offsets[-1] + len(bloco))
+        blocos.append(bloco)
+    return ColunasIndice(
+        chaves=chaves, inicio=inicio, fim=fim, offsets=offsets, dados=b"".join(blocos), ids=ids
+    )
+
+
+def construir_colunas(path: str | Path) -> ColunasIndice:
+    """Lê o CSV do CEIS uma única vez e monta os arrays do índice, ordenados por documento"""
+    # CSV simples ou ZIP do Portal (latin-1, ";"), lido sem extração
+    linhas = []
+    ocorrencias: Dict[int, int] = {}
+    for row in iter_rows(Path(path)):
+        row = canonical_row(row, SANCTION_ALIASES)
+        linha = linha_indice(row, chave_unica(chave_sancao(row), ocorrencias))
+        if linha is not None:
+            linhas.append(linha)
+
+    # Ordenação estável: sanções do mesmo documento mantêm a ordem do arquivo
+    linhas.sort(key=lambda item: item[0])
+    return montar_colunas(linhas)
+
+
+def aplicar_delta_colunas(
+    colunas: ColunasIndice,
+    remover: set[int],
+    novas: Iterable[tuple[int, int, int, bytes, int]]
+) -> ColunasIndice:
+    """
+    Novo índice a partir do atual: tira as sanções em `remover` e intercala as
+    linhas `novas`, sem reler o arquivo de origem
+    """
+    mantidas = (
+        (
+            colunas.chaves[posicao],
+            colunas.inicio[posicao],
+            colunas.fim[posicao],
+            bytes(colunas.dados[colunas.offsets[posicao]:colunas.offsets[posicao + 1]]),
+            colunas.ids[posicao],
+        )
+        for posicao in range(len(colunas.chaves))
+        if colunas.ids[posicao] not in remover
+    )
+    novas = sorted(novas, key=lambda item: item[0])
+    return montar_colunas(heapq.merge(mantidas, novas, key=lambda item: item[0]))
+
+
+def carregar_indice_sancoes(path: str | Path, forcar: bool = False) -> IndiceSancoes:
+    """
+    Índice do CEIS a partir do segmento compartilhado do host
+
+    Se o segmento não existir ou for de outra versão do arquivo, lê o CSV e
+    publica um novo segmento para os demais processos (`forcar` sempre relê).
+    """
+    path = Path(path)
+    assinatura = assinatura_arquivo(path)
+    colunas = colunas_compartilhadas(path, assinatura, lambda: construir_colunas(path), forcar=forcar)
+    return IndiceSancoes(assinatura, colunas)
+
+
+_indice: IndiceSancoes | None = None
+_indice_lock = threading.Lock()
+_compartilhado = False
+
+
+def obter_indice_sancoes(path: str | Path | None = None) -> IndiceSancoes | None:
+    """
+    Retorna o índice do CEIS local, reconstruindo-o se o arquivo mudou
+
+    Retorna None se o arquivo não existir.
+    """
+    global _indice
+
+    path = Path(path) if path else caminho_ceis_local()
+    if not path.exists():
+        return None
+
+    indice = _indice
+    # Índice herdado do master (gunicorn preload): é trocado por um novo fork, não recarregado aqui
+    if _compartilhado and indice is not None:
+        return indice
+
+    assinatura = assinatura_arquivo(path)
+    if indice is not None and indice.assinatura == assinatura:
+        return indice
+
+    with _indice_lock:
+        if _indice is None or _indice.assinatura != assinatura:
+            _indice = carregar_indice_sancoes(path)
+        return _indice
+
+
+def compartilhar_indice_sancoes(path: str | Path | None = None) -> IndiceSancoes | None:
+    """
+    Monta o índice no processo master antes do fork (gunicorn preload_app)
+
+    Os workers herdam o índice copy-on-write e não o recarregam sozinhos; a
+    atualização dos dados é feita reconstruindo no master e recriando os workers.
+    """
+    global _indice, _compartilhado
+
+    with _indice_lock:
+        _compartilhado = False
+        _indice = None
+    indice = obter_indice_sancoes(path)
+    _compartilhado = indice is not None
+    return indice
@@ -0,0 +1,163 @@
+"""
+Segmento de memória compartilhada (arquivo mapeado) com os arrays do índice do CEIS
+
+Qualquer processo do host (gunicorn, Celery, CLI) mapeia o mesmo arquivo em
+modo somente leitura, sem copiar os dados. O arquivo é publicado de forma
+atômica (`os.replace`): leitores no meio de uma consulta continuam com o
+mapeamento antigo, que só é liberado quando deixam de usá-lo.
+"""
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import time
+from array import array
+from pathlib import Path
+from typing import Callable, NamedTuple, Sequence
+
+MAGIC = b"CEISIDX\0"
+FORMATO = 2
+
+# magic, formato, reservado, assinatura dos dados de origem, versão (ns), registros, bytes de dados
+CABECALHO = struct.Struct("<8sII20s4xQQQ")
+
+
+class ColunasIndice(NamedTuple):
+    """Arrays do índice: chaves ordenadas, intervalos de sanção e registros serializados"""
+    chaves: Sequence[int]
+    inicio: Sequence[int]
+    fim: Sequence[int]
+    offsets: Sequence[int]
+    dados: bytes | memoryview
+    versao: int = 0
+    ids: Sequence[int] = ()  # chave de cada registro no delta diário (sanction_delta)
+
+
+def diretorio_segmentos() -> Path | None:
+    """INDICE_COMPARTILHADO_DIR, ou /dev/shm (memória); vazio desativa o segmento"""
+    padrao = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    diretorio = os.getenv("INDICE_COMPARTILHADO_DIR", padrao)
+    return Path(diretorio) if diretorio else None
+
+
+def caminho_segmento(origem: Path) -> Path | None:
+    """Um segmento por arquivo de origem"""
+    diretorio = diretorio_segmentos()
+    if diretorio is None:
+        return None
+    nome = hashlib.sha1(str(Path(origem).resolve()).encode()).hexdigest()[:12]
+    return diretorio / f"cruzamento-ceis-{nome}.idx"
+
+
+def digest_assinatura(assinatura: tuple) -> bytes:
+    return hashlib.sha1(repr(assinatura).encode()).digest()
+
+
+def _alinhar(posicao: int) -> int:
+    return (posicao + 7) & ~7
+
+
+def _layout(total: int) -> tuple[int, int, int, int, int, int]:
+    chaves = CABECALHO.size
+    ids = chaves + 8 * total
+    inicio = ids + 8 * total
+    fim = inicio + 4 * total
+    offsets = _alinhar(fim + 4 * total)
+    dados = offsets + 8 * (total + 1)
+    return chaves, ids, inicio, fim, offsets, dados
+
+
+def publicar_segmento(colunas: ColunasIndice, destino: Path, assinatura: tuple) -> int:
+    """Grava o segmento em arquivo temporário e o troca atomicamente; retorna a versão"""
+    total = len(colunas.chaves)
+    versao = time.time_ns()
+    layout = _layout(total)
+
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    tmp = destino.with_name(f".{destino.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as f:
+        f.write(CABECALHO.pack(MAGIC, FORMATO, 0, digest_assinatura(assinatura), versao, total, len(colunas.dados)))
+        for posicao, valores, tipo in zip(
+            layout,
+            (colunas.chaves, colunas.ids, colunas.inicio, colunas.fim, colunas.offsets, colunas.dados),
+            ("q", "q", "i", "i", "Q", None),
+        ):
+            f.seek(posicao)
+            f.write(bytes(valores) if tipo is None else array(tipo, valores).tobytes())
+    os.replace(tmp, destino)
+    return versao
+
+
+def abrir_segmento(path: Path, assinatura: tuple) -> ColunasIndice | None:
+    """
+    Mapeia o segmento somente para leitura
+
+    Retorna None se ele não existir, tiver outro formato ou tiver sido gerado
+    a partir de outra versão do arquivo de origem.
+    """
+    return abrir_segmento_digest(path, digest_assinatura(assinatura))
+
+
+def abrir_segmento_digest(path: Path, esperado: bytes) -> ColunasIndice | None:
+    """Como abrir_segmento, conferindo o digest da assinatura já calculado"""
+    try:
+        with path.open("rb") as f:
+            mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    if len(mapa) < CABECALHO.size:
+        return None
+    magic, formato, _, digest, versao, total, tamanho = CABECALHO.unpack_from(mapa)
+    if magic != MAGIC or formato != FORMATO or digest != esperado:
+        return None
+
+    memoria = memoryview(mapa)
+    chaves, ids, inicio, fim, offsets, dados = _layout(total)
+    return ColunasIndice(
+        chaves=memoria[chaves:ids].cast("q"),
+        inicio=memoria[inicio:fim].cast("i"),
+        fim=memoria[fim:fim + 4 * total].cast("i"),
+        offsets=memoria[offsets:dados].cast("Q"),
+        dados=memoria[dados:dados + tamanho],
+        versao=versao,
+        ids=memoria[ids:inicio].cast("q"),
+    )
+
+
+def colunas_compartilhadas(
+    origem: Path,
+    assinatura: tuple,
+    construir: Callable[[], ColunasIndice],
+    forcar: bool = False
+) -> ColunasIndice:
+    """
+    Colunas do índice a partir do segmento do host, publicando-o se necessário
+
+    Só um processo reconstrói por vez (lock de arquivo); os demais esperam e
+    mapeiam o segmento recém-publicado. Sem diretório configurado, apenas constrói.
+    """
+    destino = caminho_segmento(origem)
+    if destino is None:
+        return construir()
+
+    if not forcar:
+        colunas = abrir_segmento(destino, assinatura)
+        if colunas is not None:
+            return colunas
+
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    with open(destino.with_name(destino.name + ".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+
+        colunas = None if forcar else abrir_segmento(destino, assinatura)
+        if colunas is None:
+            construidas = construir()
+            publicar_segmento(construidas, destino, assinatura)
+            colunas = abrir_segmento(destino, assinatura) or construidas
+
+    return colunas
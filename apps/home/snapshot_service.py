@@ -0,0 +1,157 @@
+"""
+Snapshot versionado do dashboard (análise local + padrões suspeitos)
+
+O cálculo roda fora das requisições (Celery beat, mudança nos arquivos de
+entrada ou primeira execução); as rotas apenas leem o snapshot mais recente.
+"""
+from __future__ import annotations
+
+import fcntl
+import json
+import os
+import threading
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict
+
+from apps.config import Config
+from apps.home.data_crossing_service import (
+    analisar_dados_locais,
+    detectar_padroes_suspeitos,
+    impressao_digital_dados
+)
+
+PONTEIRO = "latest.json"
+LOCK = ".lock"
+
+
+def _diretorio() -> Path:
+    path = Path(Config.SNAPSHOT_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _serializar(valor: Any) -> str:
+    if isinstance(valor, (date, datetime)):
+        return valor.isoformat()
+    return str(valor)
+
+
+def _escrever_atomico(path: Path, conteudo: str) -> None:
+    """Escreve em arquivo temporário e renomeia, para leitores nunca verem arquivo parcial"""
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(conteudo, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def gerar_snapshot(forcar: bool = False, esperar: bool = False) -> str | None:
+    """
+    Recalcula o snapshot se os dados de entrada mudaram (ou se `forcar`)
+
+    Retorna a versão publicada, ou None se o snapshot já está atualizado ou se
+    outro processo já está recalculando (com `esperar`, aguarda esse cálculo).
+    """
+    diretorio = _diretorio()
+
+    with open(diretorio / LOCK, "w") as lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX if esperar else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return None
+
+        impressao_digital, ultima_modificacao = impressao_digital_dados()
+        atual = ler_snapshot()
+        if atual and atual["impressao_digital"] == impressao_digital and not forcar:
+            return None
+
+        analise = analisar_dados_locais()
+        padroes = detectar_padroes_suspeitos(analise)
+
+        gerado_em = datetime.now(timezone.utc)
+        versao = f"{gerado_em:%Y%m%dT%H%M%S}-{impressao_digital[:12]}"
+        snapshot = {
+            "versao": versao,
+            "impressao_digital": impressao_digital,
+            "ultima_modificacao": ultima_modificacao.isoformat() if ultima_modificacao else None,
+            "gerado_em": gerado_em.isoformat(),
+            "analise": analise,
+            "padroes": padroes,
+        }
+
+        arquivo = f"dashboard-{versao}.json"
+        _escrever_atomico(diretorio / arquivo, json.dumps(snapshot, ensure_ascii=False, default=_serializar))
+        _escrever_atomico(diretorio / PONTEIRO, json.dumps({"versao": versao, "arquivo": arquivo}))
+
+        # Mantém apenas as versões mais recentes
+        antigos = sorted(diretorio.glob("dashboard-*.json"))[:-Config.SNAPSHOT_VERSOES_MANTIDAS]
+        for path in antigos:
+            path.unlink(missing_ok=True)
+
+        print(f"[SNAPSHOT] Versão {versao} publicada")
+        return versao
+
+
+_cache: Dict[str, Any] = {"chave": None, "snapshot": None}
+_cache_lock = threading.Lock()
+
+
+def ler_snapshot() -> Dict[str, Any] | None:
+    """Lê o snapshot mais recente (em cache no processo até o ponteiro mudar)"""
+    ponteiro = Path(Config.SNAPSHOT_DIR) / PONTEIRO
+    try:
+        stat = ponteiro.stat()
+    except FileNotFoundError:
+        return None
+
+    chave = (stat.st_mtime_ns, stat.st_size)
+    if _cache["chave"] == chave:
+        return _cache["snapshot"]
+
+    with _cache_lock:
+        if _cache["chave"] != chave:
+            info = json.loads(ponteiro.read_text(encoding="utf-8"))
+            snapshot = json.loads((ponteiro.parent / info["arquivo"]).read_text(encoding="utf-8"))
+            _cache["chave"], _cache["snapshot"] = chave, snapshot
+        return _cache["snapshot"]
+
+
+_solicitadas = set()
+
+
+def solicitar_atualizacao(impressao_digital: str) -> None:
+    """
+    Agenda o recálculo no Celery (uma vez por versão dos dados, por processo);
+    sem broker, roda em uma thread em segundo plano
+    """
+    from apps.tasks import atualizar_snapshot_dashboard
+
+    if impressao_digital in _solicitadas:
+        return
+    _solicitadas.add(impressao_digital)
+
+    try:
+        atualizar_snapshot_dashboard.apply_async(retry=False)
+    except Exception:
+        threading.Thread(target=gerar_snapshot, daemon=True).start()
+
+
+def snapshot_atual() -> Dict[str, Any]:
+    """
+    Snapshot para as rotas do dashboard
+
+    Na primeira execução calcula de forma síncrona; se os arquivos de entrada
+    mudaram, devolve o snapshot atual e agenda o recálculo.
+    """
+    snapshot = ler_snapshot()
+    if snapshot is None:
+        gerar_snapshot(esperar=True)
+        snapshot = ler_snapshot()
+        if snapshot is None:
+            raise RuntimeError("Snapshot do dashboard ainda não disponível")
+        return snapshot
+
+    impressao_digital, _ = impressao_digital_dados()
+    if snapshot["impressao_digital"] != impressao_digital:
+        solicitar_atualizacao(impressao_digital)
+
+    return snapshot
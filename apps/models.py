@@ -86,6 +86,7 @@ class Sancao(db.Model):
     data_fim_sancao = db.Column(db.Date)
     motivo = db.Column(db.Text)
     fonte = db.Column(db.String(50))  # 'CEIS', 'CNEP', etc
+    chave_delta = db.Column(db.BigInteger, index=True, unique=True)  # identidade no delta diário (sanction_delta)
     data_importacao = db.Column(db.DateTime, default=dt.datetime.utcnow)
     
     def __repr__(self):
@@ -304,10 +305,22 @@ class AnaliseCompleta(db.Model):
     data_consulta = db.Column(db.DateTime, default=dt.datetime.utcnow, index=True)
     usuario_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
     ip_origem = db.Column(db.String(45))
+    # Análises sem dono só são exibidas a outros usuários quando marcadas como públicas
+    publica = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
     
     def __repr__(self):
         return f"<AnaliseCompleta {self.cpf_cnpj} - {self.nivel_risco.value} - {self.data_consulta}>"
     
+    @classmethod
+    def find_by_id(cls, _id: int) -> "AnaliseCompleta":
+        return cls.query.filter_by(id=_id).first()
+    
+    def visivel_para(self, usuario_id: int | None) -> bool:
+        """Dono exato, ou análise sem dono marcada como pública"""
+        if self.usuario_id is None:
+            return bool(self.publica)
+        return self.usuario_id == usuario_id
+    
     @classmethod
     def find_by_cpf_cnpj(cls, documento: str) -> list:
         """Retorna todas as análises para um documento"""
@@ -0,0 +1,63 @@
+# -*- encoding: utf-8 -*-
+"""
+Copyright (c) 2019 - present AppSeed.us
+"""
+
+import os, sys, time
+from contextlib import contextmanager
+from importlib import import_module
+
+# STARTUP_PROFILE=True prints the time spent importing and initializing each part of the app
+PROFILE = os.getenv('STARTUP_PROFILE', 'False') == 'True'
+
+_steps = []
+
+@contextmanager
+def profile_step(name):
+    if not PROFILE:
+        yield
+        return
+
+    modules = len(sys.modules)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _steps.append((name, time.perf_counter() - start, len(sys.modules) - modules))
+
+def import_profiled(module_name):
+    with profile_step('import ' + module_name):
+        return import_module(module_name)
+
+def report(title='Startup profile'):
+    if not PROFILE or not _steps:
+        return
+
+    print(f' > {title} (pid {os.getpid()})')
+    for name, elapsed, modules in sorted(_steps, key=lambda step: -step[1]):
+        print(f'   {elapsed * 1000:8.1f} ms  {modules:4d} new modules  {name}')
+    _steps.clear()
+
+def warm_up(app):
+    """Loads the data indexes and caches of a fresh worker (run after fork)."""
+    from apps.dyn_dt.metadata import warm_table_metadata
+    from apps.dyn_dt.search import ensure_search_indexes
+    from apps.home.sanction_index import obter_indice_sancoes
+    from apps.home.snapshot_service import ler_snapshot
+
+    steps = (
+        ('dyn_dt metadata', warm_table_metadata),
+        ('dyn_dt search indexes', ensure_search_indexes),
+        ('CEIS index', obter_indice_sancoes),
+        ('dashboard snapshot', ler_snapshot),
+    )
+
+    with app.app_context():
+        for name, warm in steps:
+            try:
+                with profile_step('warm ' + name):
+                    warm()
+            except Exception as e:
+                print(f'> Error: warm-up of {name}: ' + str(e))
+
+    report('Warm-up profile')
@@ -3,7 +3,7 @@
 Copyright (c) 2019 - present AppSeed.us
 """
 
-import json, time
+import json, os, time
 from datetime import datetime
 
 from apps.config import *
@@ -17,14 +17,48 @@ logger = get_task_logger(__name__)
 celery_app = Celery(Config.CELERY_HOSTMACHINE, backend=Config.CELERY_RESULT_BACKEND, broker=Config.CELERY_BROKER_URL)
 
 celery_app.conf.beat_schedule = {
-    'run_celery_beat_test_every_minute': {
-        'task': 'celery_beat_test',
-        'schedule': crontab(minute='*/1'),  # Runs every 1 minute
-        'args': (json.dumps({'test': 'data'}),)
+    'refresh_dashboard_snapshot': {
+        'task': 'atualizar_snapshot_dashboard',
+        'schedule': crontab(minute='*/{}'.format(Config.SNAPSHOT_INTERVALO_MINUTOS)),
     },
 }
 celery_app.conf.timezone = 'UTC'
 
+# Fail fast when Redis is down, so web requests can fall back to sync execution
+celery_app.conf.result_backend_transport_options = {
+    'retry_policy': { 'max_retries': 1, 'interval_start': 0, 'interval_step': 0.5, 'interval_max': 1 }
+}
+
+# Owner of each analysis job, stored apart from the task meta (a FAILURE result
+# replaces the meta with the exception, so it can't carry the owner)
+JOB_OWNER_PREFIX = 'analise-owner-'
+
+def set_job_owner( job_id, usuario_id ):
+
+    celery_app.backend.set( JOB_OWNER_PREFIX + job_id, str( usuario_id ) )
+
+def get_job_owner( job_id ):
+
+    owner = celery_app.backend.get( JOB_OWNER_PREFIX + job_id )
+
+    return owner.decode() if isinstance( owner, bytes ) else owner
+
+
+# Flask app used by tasks that need the DB (created once per worker process)
+_flask_app = None
+
+def get_flask_app():
+
+    global _flask_app
+
+    if _flask_app is None:
+        from apps import create_app
+
+        debug = (os.getenv('DEBUG', 'False') == 'True')
+        _flask_app = create_app(config_dict['Debug' if debug else 'Production'])
+
+    return _flask_app
+
 
 # task used for tests
 @celery_app.task(name="celery_test", bind=True)
@@ -93,7 +127,58 @@ def celery_test( self, task_input ):
     return task_json
 
 
-@celery_app.task(name="celery_beat_test", bind=True)
-def celery_beat_test( self, task_input ):
-    task_json = {'info': 'Beat is running'}
-    return task_json
+@celery_app.task(name="atualizar_snapshot_dashboard", bind=True)
+def atualizar_snapshot_dashboard( self ):
+
+    from apps.home.snapshot_service import gerar_snapshot
+
+    # No-op when the data did not change or another recomputation holds the lock
+    versao = gerar_snapshot()
+
+    return { 'versao': versao }
+
+
+@celery_app.task(name="analise_completa", bind=True)
+def analise_completa_job( self, cpf_cnpj, usuario_id=None, ip_origem=None ):
+
+    from apps.home.api_services import only_digits, tipo_documento, fontes_para_documento
+    from apps.home.analise_service import executar_analise_completa
+
+    doc = only_digits( cpf_cnpj )
+    nomes = [ nome for nome, _ in fontes_para_documento( doc, tipo_documento( doc ) ) ]
+
+    logger.info( '*** Analise completa: ' + doc )
+
+    # Per-source progress, polled by /api/analise-completa/<job_id>; each source's
+    # result is published as soon as it answers (streamed by .../<job_id>/stream)
+    progresso = {
+        'documento'  : doc,
+        'usuario_id' : usuario_id,
+        'total'      : len( nomes ),
+        'concluidas' : 0,
+        'fontes'     : { nome: 'pendente' for nome in nomes },
+        'resultados' : {},
+    }
+
+    self.update_state(state='PROGRESS', meta=progresso)
+
+    def on_fonte( nome, resultado ):
+        progresso['fontes'][nome] = 'ok' if resultado.get('ok') else 'erro'
+        progresso['resultados'][nome] = resultado
+        progresso['concluidas'] += 1
+        self.update_state(state='PROGRESS', meta=progresso)
+
+    with get_flask_app().app_context():
+        resultado, analise = executar_analise_completa( doc, usuario_id=usuario_id,
+                                                        ip_origem=ip_origem, progresso=on_fonte )
+
+        return {
+            'documento'   : doc,
+            'usuario_id'  : usuario_id,
+            'analise_id'  : analise.id,
+            'nivel_risco' : resultado['avaliacao'].get('nivel_risco'),
+            'avaliacao'   : resultado['avaliacao'],
+            'total'       : progresso['total'],
+            'concluidas'  : progresso['concluidas'],
+            'fontes'      : progresso['fontes'],
+        }
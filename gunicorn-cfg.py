@@ -3,9 +3,66 @@
 Copyright (c) 2019 - present AppSeed.us
 """
 
+import os
+
 bind = '0.0.0.0:5005'
-workers = 1
+workers = int(os.getenv('GUNICORN_WORKERS', 1))
+# Long-lived SSE/NDJSON streams hold one thread each; at most ANALISE_STREAM_MAX
+# analysis streams per worker (see apps/config.py), the rest fall back to polling
+threads = int(os.getenv('GUNICORN_THREADS', 8))
 accesslog = '-'
 loglevel = 'debug'
 capture_output = True
 enable_stdio_inheritance = True
+
+# Preload: the master loads the app and the CEIS index before forking, so all
+# workers share one copy-on-write copy. When the CEIS file changes the master
+# rebuilds the index and re-forks the workers (same as `kill -HUP <master>`).
+preload_app = os.getenv('GUNICORN_PRELOAD', 'False') == 'True'
+reload_check_seconds = int(os.getenv('INDICE_RECARGA_SEGUNDOS', 30))
+
+def post_worker_init(worker):
+    # Warm the data indexes of the new worker in the background, so it starts accepting right away
+    import threading
+    from apps.startup import warm_up
+
+    threading.Thread(target=warm_up, args=(worker.wsgi,), daemon=True).start()
+
+def _share_indexes(server):
+    import gc
+    from apps.home.sanction_index import compartilhar_indice_sancoes
+
+    indice = compartilhar_indice_sancoes()
+    server.log.info('CEIS index shared with workers: %s records', len(indice) if indice else 0)
+
+    # Keep the garbage collector from touching (and un-sharing) the inherited pages
+    gc.freeze()
+
+def _watch_data(server):
+    import signal, threading, time
+    from apps.home.sanction_index import caminho_ceis_local, assinatura_arquivo
+
+    def signature():
+        path = caminho_ceis_local()
+        return assinatura_arquivo(path) if path.exists() else None
+
+    def watch():
+        current = signature()
+        while True:
+            time.sleep(reload_check_seconds)
+            latest = signature()
+            if latest != current:
+                current = latest
+                server.log.info('CEIS file changed, reloading workers')
+                os.kill(server.pid, signal.SIGHUP)
+
+    threading.Thread(target=watch, daemon=True).start()
+
+def when_ready(server):
+    if preload_app:
+        _share_indexes(server)
+        _watch_data(server)
+
+def on_reload(server):
+    if preload_app:
+        _share_indexes(server)
@@ -2,10 +2,18 @@ from __future__ import annotations
 
 import argparse
 import json
+from dataclasses import replace
+from datetime import date
 from pathlib import Path
 
 from politicos.config import load_settings
-from politicos.pipeline import run_sanctions_vs_contracts
+from politicos.connectors.columnar import FORMATS
+from politicos.engine import BACKENDS
+from politicos.engine.check import benchmark, check_parity
+from politicos.filters import ScanFilters
+from politicos.partitioned import run_partitioned
+from politicos.pipeline import convert_sources, run_sanctions_vs_contracts
+from politicos.watch import Watcher
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -15,7 +23,7 @@ def build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "command",
-        choices=["scan-sanctions"],
+        choices=["scan-sanctions", "convert", "watch", "engine-check", "engine-bench"],
         help="Comando a executar",
     )
     parser.add_argument(
@@ -24,6 +32,60 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Diretório de saída para arquivos gerados",
     )
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default=None,
+        help="Formato de saída (padrão: OUTPUT_FORMAT ou csv; convert usa parquet)",
+    )
+    parser.add_argument(
+        "--document",
+        action="append",
+        default=None,
+        help="Restringe o scan a um CPF/CNPJ (pode ser repetido)",
+    )
+    parser.add_argument(
+        "--since",
+        type=date.fromisoformat,
+        default=None,
+        help="Data inicial (AAAA-MM-DD) dos contratos analisados",
+    )
+    parser.add_argument(
+        "--until",
+        type=date.fromisoformat,
+        default=None,
+        help="Data final (AAAA-MM-DD) dos contratos analisados",
+    )
+    parser.add_argument(
+        "--partitions",
+        type=int,
+        default=1,
+        help="Divide as entradas por documento em N partições em disco (fora da memória)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processos que cruzam as partições em paralelo (padrão: número de CPUs)",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=["auto", *BACKENDS],
+        default=None,
+        help="Backend do cruzamento (padrão: POLITICOS_ENGINE ou auto); engine-check/bench: só este",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=5.0,
+        help="watch: intervalo em segundos entre verificações das entradas",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=2.0,
+        help="watch: segundos sem novas alterações antes de rodar o scan",
+    )
     return parser
 
 
@@ -32,18 +94,54 @@ def main() -> None:
     args = parser.parse_args()
 
     settings = load_settings()
+
+    if args.command in ("engine-check", "engine-bench"):
+        backends = [args.engine] if args.engine not in (None, "auto") else None
+        if args.command == "engine-check":
+            # O backend python é sempre a referência da paridade
+            result = check_parity(["python", *backends] if backends and backends != ["python"] else None)
+        else:
+            result = benchmark(backends)
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        if not result.get("ok", True):
+            raise SystemExit(1)
+        return
+
+    if args.command == "convert":
+        fmt = args.format or "parquet"
+        if fmt == "csv":
+            parser.error("convert grava parquet ou arrow")
+        output_dir = args.output_dir.resolve() if args.output_dir is not None else None
+        print(json.dumps(convert_sources(settings, fmt, output_dir), indent=2, ensure_ascii=False))
+        return
+
     if args.output_dir is not None:
-        settings = settings.__class__(
-            data_dir=settings.data_dir,
-            ceis_csv=settings.ceis_csv,
-            contracts_csv=settings.contracts_csv,
-            output_dir=args.output_dir.resolve(),
-        )
+        settings = replace(settings, output_dir=args.output_dir.resolve())
+    if args.format is not None:
+        settings = replace(settings, output_format=args.format)
+    if args.engine is not None:
+        settings = replace(settings, engine=args.engine)
+
+    filters = ScanFilters(
+        documents=frozenset(args.document) if args.document else None,
+        since=args.since,
+        until=args.until,
+    )
+
+    if args.command == "watch":
+        try:
+            Watcher(settings, filters).loop(interval=args.interval, debounce=args.debounce)
+        except KeyboardInterrupt:
+            pass
+        return
 
     if args.command == "scan-sanctions":
-        summary = run_sanctions_vs_contracts(settings)
+        if args.partitions > 1:
+            summary = run_partitioned(settings, filters, args.partitions, args.workers)
+        else:
+            summary = run_sanctions_vs_contracts(settings, filters)
         print(json.dumps(summary, indent=2, ensure_ascii=False))
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -11,6 +11,9 @@ class Settings:
     ceis_csv: Path
     contracts_csv: Path
     output_dir: Path
+    output_format: str = "csv"
+    cache_dir: Path | None = None
+    engine: str = "auto"
 
 
 def _path_from_env(key: str, fallback: str) -> Path:
@@ -24,4 +27,7 @@ def load_settings() -> Settings:
         ceis_csv=_path_from_env("CEIS_CSV", str(data_dir / "raw/ceis.csv")),
         contracts_csv=_path_from_env("CONTRACTS_CSV", str(data_dir / "raw/contracts.csv")),
         output_dir=_path_from_env("OUTPUT_DIR", "./data/output"),
-    )
\ No newline at end of file
+        output_format=os.getenv("OUTPUT_FORMAT", "csv").lower(),
+        cache_dir=_path_from_env("CACHE_DIR", str(data_dir / "cache")),
+        engine=os.getenv("POLITICOS_ENGINE", "auto").lower(),
+    )
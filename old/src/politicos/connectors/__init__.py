@@ -1,4 +1,11 @@
-from .ceis import load_ceis
-from .contracts import load_contracts
+from .ceis import iter_ceis, load_ceis, normalize_ceis
+from .contracts import iter_contracts, load_contracts, normalize_contracts
 
-__all__ = ["load_ceis", "load_contracts"]
\ No newline at end of file
+__all__ = [
+    "iter_ceis",
+    "iter_contracts",
+    "load_ceis",
+    "load_contracts",
+    "normalize_ceis",
+    "normalize_contracts",
+]
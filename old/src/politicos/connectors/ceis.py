@@ -1,26 +1,41 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Iterator
 
 import pandas as pd
 
-from politicos.connectors.csv_loader import load_csv, normalize_columns, require_columns
+from politicos.connectors.csv_loader import (
+    apply_schema,
+    iter_table,
+    load_table,
+    normalize_columns,
+    require_columns,
+)
+from politicos.engine.schema import SANCTION_ALIASES, SANCTION_COLUMNS
+from politicos.filters import ScanFilters, filter_sanctions, sanction_predicate
+from politicos.normalize import normalize_documents
 
+SCHEMA = {
+    "source_id": "category",
+    "cnpj_cpf": "string",
+    "name": "string",
+    "sanction_start": "date",
+    "sanction_end": "date",
+    "sanction_type": "category",
+}
 
-def load_ceis(path: Path) -> pd.DataFrame:
-    df = load_csv(path)
+COLUMNS = SANCTION_COLUMNS
+
+ALIASES = SANCTION_ALIASES
+
+
+def prepare_ceis(df: pd.DataFrame) -> pd.DataFrame:
     df = normalize_columns(df)
 
-    aliases = {
-        "cpf_cnpj": "cnpj_cpf",
-        "documento": "cnpj_cpf",
-        "razao_social": "name",
-        "nome_sancionado": "name",
-        "data_inicio_sancao": "sanction_start",
-        "data_fim_sancao": "sanction_end",
-        "tipo_sancao": "sanction_type",
-    }
-    df = df.rename(columns={k: v for k, v in aliases.items() if k in df.columns})
+    df = df.rename(
+        columns={k: v for k, v in ALIASES.items() if k in df.columns and v not in df.columns}
+    )
 
     required = ["cnpj_cpf", "name", "sanction_start"]
     require_columns(df, required, "CEIS")
@@ -32,6 +47,40 @@ def load_ceis(path: Path) -> pd.DataFrame:
     if "sanction_type" not in df.columns:
         df["sanction_type"] = ""
 
-    return df[
-        ["source_id", "cnpj_cpf", "name", "sanction_start", "sanction_end", "sanction_type"]
-    ]
\ No newline at end of file
+    return apply_schema(df[COLUMNS], SCHEMA)
+
+
+def load_ceis(
+    path: Path,
+    filters: ScanFilters | None = None,
+    fmt: str | None = None,
+) -> pd.DataFrame:
+    df = load_table(
+        path,
+        schema=SCHEMA,
+        aliases=ALIASES,
+        predicate=sanction_predicate(filters),
+        fmt=fmt,
+    )
+    return filter_sanctions(prepare_ceis(df), filters)
+
+
+def iter_ceis(
+    path: Path,
+    filters: ScanFilters | None = None,
+    fmt: str | None = None,
+    chunksize: int = 200_000,
+) -> Iterator[pd.DataFrame]:
+    for chunk in iter_table(
+        path,
+        schema=SCHEMA,
+        aliases=ALIASES,
+        predicate=sanction_predicate(filters),
+        fmt=fmt,
+        chunksize=chunksize,
+    ):
+        yield filter_sanctions(prepare_ceis(chunk), filters)
+
+
+def normalize_ceis(df: pd.DataFrame) -> pd.DataFrame:
+    return df.assign(cnpj_cpf=normalize_documents(df["cnpj_cpf"]))
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import shutil
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+import pandas as pd
+
+PARQUET_SUFFIXES = {".parquet", ".pq"}
+ARROW_SUFFIXES = {".arrow", ".feather", ".ipc"}
+FORMATS = ["csv", "parquet", "arrow"]
+SUFFIXES = {"csv": ".csv", "parquet": ".parquet", "arrow": ".arrow"}
+
+# Marca arquivos gravados por `politicos convert`: colunas canônicas, documentos
+# normalizados e datas tipadas, o que permite empurrar filtros para a leitura.
+NORMALIZED_KEY = b"politicos.normalized"
+
+
+def require_pyarrow() -> None:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as exc:
+        raise RuntimeError(
+            "Suporte a Parquet/Arrow requer o pacote pyarrow: "
+            "pip install 'python-politicos[parquet]'"
+        ) from exc
+
+
+def detect_format(path: Path, fmt: str | None = None) -> str:
+    if fmt is not None:
+        if fmt not in FORMATS:
+            raise ValueError(f"Formato desconhecido: {fmt}. Use um de: {', '.join(FORMATS)}")
+        return fmt
+    suffix = path.suffix.lower()
+    if suffix in PARQUET_SUFFIXES:
+        return "parquet"
+    if suffix in ARROW_SUFFIXES:
+        return "arrow"
+    if path.is_dir():
+        arrow_files = any(p.suffix.lower() in ARROW_SUFFIXES for p in path.rglob("*"))
+        return "arrow" if arrow_files else "parquet"
+    return "csv"
+
+
+def _dataset(path: Path, fmt: str) -> Any:
+    require_pyarrow()
+    import pyarrow.dataset as ds
+
+    return ds.dataset(
+        path,
+        format="ipc" if fmt == "arrow" else "parquet",
+        partitioning="hive" if path.is_dir() else None,
+    )
+
+
+def is_normalized(schema: Any) -> bool:
+    return (schema.metadata or {}).get(NORMALIZED_KEY) == b"1"
+
+
+def _scan_options(
+    dataset: Any,
+    wanted: Callable[[str], bool] | None,
+    predicate: Callable[[Any], Any] | None,
+) -> dict:
+    columns = None
+    if wanted is not None:
+        columns = [name for name in dataset.schema.names if wanted(name)]
+    expression = None
+    if predicate is not None and is_normalized(dataset.schema):
+        expression = predicate(dataset.schema)
+    return {"columns": columns, "filter": expression}
+
+
+def read_columnar(
+    path: Path,
+    fmt: str,
+    wanted: Callable[[str], bool] | None = None,
+    predicate: Callable[[Any], Any] | None = None,
+) -> pd.DataFrame:
+    dataset = _dataset(path, fmt)
+    return dataset.to_table(**_scan_options(dataset, wanted, predicate)).to_pandas()
+
+
+def iter_columnar(
+    path: Path,
+    fmt: str,
+    wanted: Callable[[str], bool] | None = None,
+    predicate: Callable[[Any], Any] | None = None,
+    batch_size: int = 200_000,
+) -> Iterator[pd.DataFrame]:
+    dataset = _dataset(path, fmt)
+    options = _scan_options(dataset, wanted, predicate)
+    for batch in dataset.to_batches(batch_size=batch_size, **options):
+        if batch.num_rows:
+            yield batch.to_pandas()
+
+
+def write_columnar(
+    df: pd.DataFrame,
+    path: Path,
+    fmt: str,
+    partition_cols: Iterable[str] | None = None,
+    normalized: bool = False,
+) -> Path:
+    require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if normalized:
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), NORMALIZED_KEY: b"1"})
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    if tmp.is_dir():
+        shutil.rmtree(tmp)
+    elif tmp.exists():
+        tmp.unlink()
+
+    file_format = "ipc" if fmt == "arrow" else "parquet"
+    partition_cols = list(partition_cols or [])
+    if partition_cols:
+        ds.write_dataset(
+            table,
+            tmp,
+            format=file_format,
+            partitioning=partition_cols,
+            partitioning_flavor="hive",
+            basename_template="part-{i}" + SUFFIXES[fmt],
+        )
+        tmp.mkdir(exist_ok=True)
+    elif fmt == "arrow":
+        import pyarrow.feather as feather
+
+        feather.write_feather(table, tmp)
+    else:
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, tmp)
+
+    # Arquivos são trocados atomicamente; diretórios com duas renomeações
+    if path.is_dir():
+        old = path.with_name(f".{path.name}.old")
+        if old.exists():
+            shutil.rmtree(old)
+        path.replace(old)
+        tmp.replace(path)
+        shutil.rmtree(old)
+    else:
+        if tmp.is_dir() and path.exists():
+            path.unlink()
+        tmp.replace(path)
+    return path
@@ -1,28 +1,42 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Iterator
 
 import pandas as pd
 
-from politicos.connectors.csv_loader import load_csv, normalize_columns, require_columns
+from politicos.connectors.csv_loader import (
+    apply_schema,
+    iter_table,
+    load_table,
+    normalize_columns,
+    require_columns,
+)
+from politicos.engine.schema import CONTRACT_ALIASES, CONTRACT_COLUMNS
+from politicos.filters import ScanFilters, contract_predicate, filter_contracts
+from politicos.normalize import normalize_documents
 
+SCHEMA = {
+    "source_id": "category",
+    "supplier_document": "string",
+    "supplier_name": "string",
+    "contract_date": "date",
+    "contract_value": "float64",
+    "contract_number": "string",
+    "organ": "category",
+}
 
-def load_contracts(path: Path) -> pd.DataFrame:
-    df = load_csv(path)
+COLUMNS = CONTRACT_COLUMNS
+
+ALIASES = CONTRACT_ALIASES
+
+
+def prepare_contracts(df: pd.DataFrame) -> pd.DataFrame:
     df = normalize_columns(df)
 
-    aliases = {
-        "cnpj_cpf_fornecedor": "supplier_document",
-        "documento_fornecedor": "supplier_document",
-        "fornecedor_documento": "supplier_document",
-        "fornecedor": "supplier_name",
-        "nome_fornecedor": "supplier_name",
-        "data_contrato": "contract_date",
-        "valor_contrato": "contract_value",
-        "numero_contrato": "contract_number",
-        "orgao": "organ",
-    }
-    df = df.rename(columns={k: v for k, v in aliases.items() if k in df.columns})
+    df = df.rename(
+        columns={k: v for k, v in ALIASES.items() if k in df.columns and v not in df.columns}
+    )
 
     required = ["supplier_document", "supplier_name", "contract_date"]
     require_columns(df, required, "Contratos")
@@ -36,14 +50,40 @@ def load_contracts(path: Path) -> pd.DataFrame:
     if "organ" not in df.columns:
         df["organ"] = ""
 
-    return df[
-        [
-            "source_id",
-            "supplier_document",
-            "supplier_name",
-            "contract_date",
-            "contract_value",
-            "contract_number",
-            "organ",
-        ]
-    ]
\ No newline at end of file
+    return apply_schema(df[COLUMNS], SCHEMA)
+
+
+def load_contracts(
+    path: Path,
+    filters: ScanFilters | None = None,
+    fmt: str | None = None,
+) -> pd.DataFrame:
+    df = load_table(
+        path,
+        schema=SCHEMA,
+        aliases=ALIASES,
+        predicate=contract_predicate(filters),
+        fmt=fmt,
+    )
+    return filter_contracts(prepare_contracts(df), filters)
+
+
+def iter_contracts(
+    path: Path,
+    filters: ScanFilters | None = None,
+    fmt: str | None = None,
+    chunksize: int = 200_000,
+) -> Iterator[pd.DataFrame]:
+    for chunk in iter_table(
+        path,
+        schema=SCHEMA,
+        aliases=ALIASES,
+        predicate=contract_predicate(filters),
+        fmt=fmt,
+        chunksize=chunksize,
+    ):
+        yield filter_contracts(prepare_contracts(chunk), filters)
+
+
+def normalize_contracts(df: pd.DataFrame) -> pd.DataFrame:
+    return df.assign(supplier_document=normalize_documents(df["supplier_document"]))
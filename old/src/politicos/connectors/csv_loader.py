@@ -1,22 +1,138 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Any, Callable, Iterator, Mapping
 
 import pandas as pd
 
+from politicos.connectors.columnar import detect_format, iter_columnar, read_columnar
+from politicos.engine.schema import canonical_name, normalize_name
+from politicos.engine.sources import detect_dialect, open_binary
+from politicos.normalize import parse_dates, parse_decimals
 
-def load_csv(path: Path) -> pd.DataFrame:
+# Tipos declarados pelos conectores: "date" e "float64" são lidos como texto
+# e convertidos depois por parse_dates (ISO primeiro, depois dd/mm/aaaa) e
+# parse_decimals (vírgula decimal do Portal/PNCP)
+READ_DTYPES = {"date": "string", "float64": "string"}
+
+
+def _require_file(path: Path) -> None:
     if not path.exists():
         raise FileNotFoundError(
             "Arquivo não encontrado: "
             f"{path}. "
             "Crie os CSVs em data/raw ou rode `make init-data` para gerar exemplos."
         )
-    return pd.read_csv(path)
+
+
+def _read_options(path: Path) -> dict:
+    # Separador e codificação detectados numa amostra (ZIP, latin-1, ";")
+    dialect = detect_dialect(path)
+    return {"sep": dialect.delimiter, "encoding": dialect.encoding}
+
+
+def load_csv(path: Path) -> pd.DataFrame:
+    _require_file(path)
+    with open_binary(path) as raw:
+        return pd.read_csv(raw, **_read_options(path))
+
+
+def _csv_dtypes(
+    path: Path,
+    schema: Mapping[str, str],
+    aliases: Mapping[str, str],
+    options: Mapping[str, str],
+) -> dict[str, str]:
+    with open_binary(path) as raw:
+        header = pd.read_csv(raw, nrows=0, **options).columns
+    dtypes = {}
+    for name in header:
+        kind = schema.get(canonical_name(name, aliases))
+        if kind is not None:
+            dtypes[name] = READ_DTYPES.get(kind, kind)
+    return dtypes
+
+
+def _csv_options(path: Path, schema: Mapping[str, str] | None, aliases: Mapping[str, str]) -> dict:
+    options = _read_options(path)
+    if schema is not None:
+        dtypes = _csv_dtypes(path, schema, aliases, options)
+        options.update(usecols=list(dtypes), dtype=dtypes)
+    return options
+
+
+def _wanted(schema: Mapping[str, str] | None, aliases: Mapping[str, str]) -> Callable[[str], bool] | None:
+    if schema is None:
+        return None
+    return lambda name: canonical_name(name, aliases) in schema
+
+
+def load_table(
+    path: Path,
+    schema: Mapping[str, str] | None = None,
+    aliases: Mapping[str, str] | None = None,
+    predicate: Callable[[Any], Any] | None = None,
+    fmt: str | None = None,
+) -> pd.DataFrame:
+    # CSV (também dentro de ZIP), Parquet ou Arrow (arquivo ou diretório
+    # particionado). Com `schema`, lê só as colunas declaradas (pelo nome
+    # canônico ou por um alias), já com os tipos declarados no caso do CSV.
+    _require_file(path)
+    aliases = aliases or {}
+
+    fmt = detect_format(path, fmt)
+    if fmt == "csv":
+        options = _csv_options(path, schema, aliases)
+        with open_binary(path) as raw:
+            return pd.read_csv(raw, **options)
+
+    return read_columnar(path, fmt, wanted=_wanted(schema, aliases), predicate=predicate)
+
+
+def iter_table(
+    path: Path,
+    schema: Mapping[str, str] | None = None,
+    aliases: Mapping[str, str] | None = None,
+    predicate: Callable[[Any], Any] | None = None,
+    fmt: str | None = None,
+    chunksize: int = 200_000,
+) -> Iterator[pd.DataFrame]:
+    # Mesma leitura de load_table, em blocos de `chunksize` linhas
+    _require_file(path)
+    aliases = aliases or {}
+
+    fmt = detect_format(path, fmt)
+    if fmt == "csv":
+        options = _csv_options(path, schema, aliases)
+        with open_binary(path) as raw, pd.read_csv(raw, chunksize=chunksize, **options) as reader:
+            yield from reader
+        return
+
+    yield from iter_columnar(
+        path, fmt, wanted=_wanted(schema, aliases), predicate=predicate, batch_size=chunksize
+    )
+
+
+def apply_schema(df: pd.DataFrame, schema: Mapping[str, str]) -> pd.DataFrame:
+    converted = {}
+    for column, kind in schema.items():
+        if column not in df.columns:
+            continue
+        if kind == "date":
+            converted[column] = parse_dates(df[column])
+        elif kind == "float64":
+            converted[column] = parse_decimals(df[column])
+        elif df[column].dtype != kind:
+            converted[column] = df[column].astype(kind)
+    return df.assign(**converted)
+
+
+def memory_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True).sum())
 
 
 def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    renamed = {c: c.strip().lower().replace(" ", "_") for c in df.columns}
+    renamed = {c: normalize_name(c) for c in df.columns}
     return df.rename(columns=renamed)
 
 
@@ -25,4 +141,4 @@ def require_columns(df: pd.DataFrame, required: list[str], context: str) -> None
     if missing:
         raise ValueError(
             f"{context}: colunas obrigatórias ausentes: {', '.join(missing)}"
-        )
\ No newline at end of file
+        )
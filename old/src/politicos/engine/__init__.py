@@ -0,0 +1,51 @@
+from .core import BACKENDS, available_backends, overlap_groups, overlap_pairs, resolve_backend
+from .delta import Delta, HashSet, build_hash_set, compare, load_hash_set, row_hash, save_hash_set
+from .intervals import Intervals, coalesce_intervals, covering_members
+from .schema import (
+    CONTRACT_ALIASES,
+    CONTRACT_COLUMNS,
+    SANCTION_ALIASES,
+    SANCTION_COLUMNS,
+    canonical_name,
+    canonical_row,
+    normalize_name,
+)
+from .sources import SourceDialect, detect_dialect, iter_rows, open_binary, open_text, sniff_dialect
+from .values import DATE_FORMATS, NO_DAY, day_number, normalize_document, parse_date, parse_decimal
+
+__all__ = [
+    "BACKENDS",
+    "CONTRACT_ALIASES",
+    "CONTRACT_COLUMNS",
+    "DATE_FORMATS",
+    "Delta",
+    "HashSet",
+    "Intervals",
+    "NO_DAY",
+    "SANCTION_ALIASES",
+    "SANCTION_COLUMNS",
+    "SourceDialect",
+    "available_backends",
+    "build_hash_set",
+    "canonical_name",
+    "canonical_row",
+    "coalesce_intervals",
+    "compare",
+    "covering_members",
+    "day_number",
+    "detect_dialect",
+    "iter_rows",
+    "load_hash_set",
+    "normalize_document",
+    "normalize_name",
+    "open_binary",
+    "open_text",
+    "overlap_groups",
+    "overlap_pairs",
+    "parse_date",
+    "parse_decimal",
+    "resolve_backend",
+    "row_hash",
+    "save_hash_set",
+    "sniff_dialect",
+]
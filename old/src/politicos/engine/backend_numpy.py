@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from politicos.engine.values import NO_DAY
+
+
+def _keys(values: Sequence[str]) -> np.ndarray:
+    if isinstance(values, np.ndarray) and values.dtype.kind in "US":
+        return values
+    return np.array(["" if key is None else str(key) for key in values], dtype=str)
+
+
+def _days(values: Sequence[int]) -> np.ndarray:
+    if isinstance(values, np.ndarray) and values.dtype == np.int64:
+        return values
+    return np.array([NO_DAY if day is None else day for day in values], dtype=np.int64)
+
+
+def overlap_pairs(
+    contract_keys: Sequence[str],
+    contract_days: Sequence[int],
+    sanction_keys: Sequence[str],
+    start_days: Sequence[int],
+    end_days: Sequence[int],
+) -> tuple[np.ndarray, np.ndarray]:
+    # Contratos ordenados por (documento, dia); cada sanção acha a faixa de
+    # contratos da sua janela com searchsorted, sem produto cartesiano
+    c_keys, c_days = _keys(contract_keys), _days(contract_days)
+    s_keys, starts, ends = _keys(sanction_keys), _days(start_days), _days(end_days)
+
+    empty = np.array([], dtype=np.int64)
+    sanction_rows = np.flatnonzero((s_keys != "") & (starts != NO_DAY))
+    if not len(sanction_rows):
+        return empty, empty
+
+    # Códigos dos documentos a partir das sanções (o lado menor); contratos de
+    # documentos sem sanção saem antes da ordenação
+    known, sanction_codes = np.unique(s_keys[sanction_rows], return_inverse=True)
+    contract_codes = np.minimum(np.searchsorted(known, c_keys), len(known) - 1)
+    contract_rows = np.flatnonzero((known[contract_codes] == c_keys) & (c_days != NO_DAY))
+    if not len(contract_rows):
+        return empty, empty
+
+    c_days, starts, ends = c_days[contract_rows], starts[sanction_rows], ends[sanction_rows]
+    contract_codes = contract_codes[contract_rows].astype(np.int64)
+    sanction_codes = sanction_codes.astype(np.int64)
+
+    open_ended = ends == NO_DAY
+    bounded = ends[~open_ended]
+    low = min(c_days.min(), starts.min(), bounded.min() if len(bounded) else c_days.min())
+    high = max(c_days.max(), starts.max(), bounded.max() if len(bounded) else c_days.max())
+    width = int(high - low) + 2
+
+    composite = contract_codes * width + (c_days - low)
+    order = np.argsort(composite, kind="stable")
+    composite = composite[order]
+    lower = sanction_codes * width + (starts - low)
+    upper = sanction_codes * width + np.where(open_ended, width - 1, ends - low)
+
+    first = np.searchsorted(composite, lower, side="left")
+    last = np.searchsorted(composite, upper, side="right")
+    counts = np.maximum(last - first, 0)
+
+    sanction_pos = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    contract_pos = order[np.repeat(first, counts) + offsets]
+
+    contract_pos, sanction_pos = contract_rows[contract_pos], sanction_rows[sanction_pos]
+    merge_order = np.argsort(contract_pos * len(s_keys) + sanction_pos)
+    return contract_pos[merge_order], sanction_pos[merge_order]
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+import pandas as pd
+
+from politicos.engine.backend_numpy import _days, _keys
+from politicos.engine.values import NO_DAY
+
+CHUNK_SIZE = 200_000
+
+
+def overlap_pairs(
+    contract_keys: Sequence[str],
+    contract_days: Sequence[int],
+    sanction_keys: Sequence[str],
+    start_days: Sequence[int],
+    end_days: Sequence[int],
+) -> tuple[np.ndarray, np.ndarray]:
+    # merge por documento em blocos de contratos (limita o resultado
+    # intermediário) seguido do filtro pela janela da sanção
+    contracts = pd.DataFrame({"key": _keys(contract_keys), "day": _days(contract_days)})
+    contracts["contract"] = np.arange(len(contracts))
+    contracts = contracts[(contracts["key"] != "") & (contracts["day"] != NO_DAY)]
+
+    sanctions = pd.DataFrame(
+        {"key": _keys(sanction_keys), "start": _days(start_days), "end": _days(end_days)}
+    )
+    sanctions["sanction"] = np.arange(len(sanctions))
+    sanctions = sanctions[(sanctions["key"] != "") & (sanctions["start"] != NO_DAY)]
+    sanctions = sanctions[sanctions["key"].isin(contracts["key"])]
+
+    contract_parts, sanction_parts = [], []
+    for offset in range(0, len(contracts), CHUNK_SIZE):
+        merged = contracts.iloc[offset : offset + CHUNK_SIZE].merge(sanctions, on="key")
+        in_window = (merged["start"] <= merged["day"]) & (
+            (merged["end"] == NO_DAY) | (merged["day"] <= merged["end"])
+        )
+        contract_parts.append(merged.loc[in_window, "contract"].to_numpy(dtype=np.int64))
+        sanction_parts.append(merged.loc[in_window, "sanction"].to_numpy(dtype=np.int64))
+
+    if not contract_parts:
+        empty = np.array([], dtype=np.int64)
+        return empty, empty
+    contract_pos, sanction_pos = np.concatenate(contract_parts), np.concatenate(sanction_parts)
+    merge_order = np.lexsort((sanction_pos, contract_pos))
+    return contract_pos[merge_order], sanction_pos[merge_order]
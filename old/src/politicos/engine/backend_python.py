@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+from politicos.engine.values import NO_DAY
+
+
+def _missing(day: object) -> bool:
+    return day is None or day == NO_DAY
+
+
+def overlap_pairs(
+    contract_keys: Sequence[str],
+    contract_days: Sequence[int],
+    sanction_keys: Sequence[str],
+    start_days: Sequence[int],
+    end_days: Sequence[int],
+) -> tuple[list[int], list[int]]:
+    index: dict[str, list[tuple[int, int, int | None]]] = {}
+    for position, key in enumerate(sanction_keys):
+        start = start_days[position]
+        if not key or _missing(start):
+            continue
+        end = end_days[position]
+        index.setdefault(key, []).append((position, start, None if _missing(end) else end))
+
+    contract_pos: list[int] = []
+    sanction_pos: list[int] = []
+    for position, key in enumerate(contract_keys):
+        candidates = index.get(key) if key else None
+        if not candidates:
+            continue
+        day = contract_days[position]
+        if _missing(day):
+            continue
+        for sanction, start, end in candidates:
+            if start <= day and (end is None or day <= end):
+                contract_pos.append(position)
+                sanction_pos.append(sanction)
+    return contract_pos, sanction_pos
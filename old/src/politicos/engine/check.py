@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import random
+import time
+
+from politicos.engine.core import available_backends, overlap_groups, overlap_pairs
+from politicos.engine.values import NO_DAY
+
+
+def synthetic_inputs(contracts: int, sanctions: int, documents: int, seed: int = 0) -> dict:
+    # Entradas com os casos de borda: chave vazia, datas ausentes, sanção sem
+    # fim, documentos repetidos e contratos no primeiro/último dia da janela
+    rng = random.Random(seed)
+    keys = [f"{number:014d}" for number in rng.sample(range(10**13, 10**14), documents)]
+    horizon = 3650
+
+    def key() -> str:
+        return "" if rng.random() < 0.01 else rng.choice(keys)
+
+    def day() -> int:
+        return NO_DAY if rng.random() < 0.01 else rng.randrange(horizon)
+
+    start_days = [day() for _ in range(sanctions)]
+    end_days = []
+    for start in start_days:
+        if rng.random() < 0.2 or start == NO_DAY:
+            end_days.append(NO_DAY)
+        else:
+            end_days.append(start + rng.randrange(0, 720))
+
+    sanction_keys = [key() for _ in range(sanctions)]
+    contract_keys = [key() for _ in range(contracts)]
+    contract_days = [day() for _ in range(contracts)]
+    for position in range(min(contracts, sanctions) // 10):
+        contract_keys[position] = sanction_keys[position]
+        contract_days[position] = rng.choice([start_days[position], end_days[position]])
+
+    return {
+        "contract_keys": contract_keys,
+        "contract_days": contract_days,
+        "sanction_keys": sanction_keys,
+        "start_days": start_days,
+        "end_days": end_days,
+    }
+
+
+def _as_arrays(inputs: dict) -> dict:
+    # Backends vetorizados recebem arrays, como no pipeline da CLI
+    import numpy as np
+
+    return {
+        name: np.array(values, dtype=str if name.endswith("keys") else np.int64)
+        for name, values in inputs.items()
+    }
+
+
+def _pairs(inputs: dict, backend: str) -> list[tuple[int, int]]:
+    contract_pos, sanction_pos = overlap_pairs(**inputs, backend=backend)
+    return list(zip((int(pos) for pos in contract_pos), (int(pos) for pos in sanction_pos)))
+
+
+def _group_pairs(inputs: dict, backend: str) -> list[tuple[int, int]]:
+    # Grupos de overlap_groups expandidos de volta em pares
+    contracts, groups = overlap_groups(**inputs, backend=backend)
+    return [(contract, sanction) for contract, group in zip(contracts, groups) for sanction in group]
+
+
+def _first_mismatch(pairs: list, reference: list) -> int | None:
+    return next(
+        (i for i, (a, b) in enumerate(zip(pairs, reference)) if a != b),
+        None if len(pairs) == len(reference) else min(len(pairs), len(reference)),
+    )
+
+
+def check_parity(
+    backends: list[str] | None = None,
+    contracts: int = 20_000,
+    sanctions: int = 2_000,
+    documents: int = 500,
+    seed: int = 0,
+) -> dict:
+    # Todos os backends precisam devolver exatamente os mesmos pares, na mesma
+    # ordem, também quando o cruzamento passa pelos intervalos unidos
+    backends = backends or available_backends()
+    inputs = synthetic_inputs(contracts, sanctions, documents, seed)
+    reference_name = backends[0]
+    reference = _pairs(inputs, reference_name)
+
+    results = {}
+    for backend in backends:
+        pairs = reference if backend == reference_name else _pairs(inputs, backend)
+        grouped = _group_pairs(inputs, backend)
+        results[backend] = {
+            "pairs": len(pairs),
+            "first_mismatch": _first_mismatch(pairs, reference),
+            "grouped_first_mismatch": _first_mismatch(grouped, reference),
+        }
+
+    return {
+        "reference": reference_name,
+        "contracts": contracts,
+        "sanctions": sanctions,
+        "documents": documents,
+        "seed": seed,
+        "ok": all(
+            result["first_mismatch"] is None and result["grouped_first_mismatch"] is None
+            for result in results.values()
+        ),
+        "backends": results,
+    }
+
+
+def benchmark(
+    backends: list[str] | None = None,
+    contracts: int = 400_000,
+    sanctions: int = 20_000,
+    documents: int = 5_000,
+    repeat: int = 3,
+    seed: int = 0,
+) -> dict:
+    backends = backends or available_backends()
+    inputs = synthetic_inputs(contracts, sanctions, documents, seed)
+
+    results = {}
+    for backend in backends:
+        arguments = inputs if backend == "python" else _as_arrays(inputs)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            contract_pos, _ = overlap_pairs(**arguments, backend=backend)
+            timings.append(time.perf_counter() - started)
+        results[backend] = {"pairs": len(contract_pos), "best_seconds": round(min(timings), 4)}
+
+    return {
+        "contracts": contracts,
+        "sanctions": sanctions,
+        "documents": documents,
+        "repeat": repeat,
+        "backends": results,
+    }
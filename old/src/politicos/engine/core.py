@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import os
+from importlib import import_module
+from typing import Sequence
+
+from politicos.engine.intervals import coalesce_intervals, covering_members
+
+# Backends carregados sob demanda: o backend python não depende de numpy/pandas
+BACKENDS = {
+    "python": "politicos.engine.backend_python",
+    "numpy": "politicos.engine.backend_numpy",
+    "pandas": "politicos.engine.backend_pandas",
+}
+
+AUTO_ORDER = ["numpy", "python"]
+
+
+def _module(name: str):
+    if name not in BACKENDS:
+        raise ValueError(f"Backend desconhecido: {name}. Use um de: auto, {', '.join(BACKENDS)}")
+    return import_module(BACKENDS[name])
+
+
+def available_backends() -> list[str]:
+    available = []
+    for name in BACKENDS:
+        try:
+            _module(name)
+        except ImportError:
+            continue
+        available.append(name)
+    return available
+
+
+def resolve_backend(name: str | None = None) -> str:
+    # None usa POLITICOS_ENGINE; "auto" escolhe numpy quando instalado
+    name = (name or os.getenv("POLITICOS_ENGINE") or "auto").lower()
+    if name != "auto":
+        _module(name)
+        return name
+    for candidate in AUTO_ORDER:
+        try:
+            _module(candidate)
+        except ImportError:
+            continue
+        return candidate
+    return "python"
+
+
+def overlap_pairs(
+    contract_keys: Sequence[str],
+    contract_days: Sequence[int],
+    sanction_keys: Sequence[str],
+    start_days: Sequence[int],
+    end_days: Sequence[int],
+    backend: str | None = None,
+) -> tuple[Sequence[int], Sequence[int]]:
+    # Pares (contrato, sanção) com o mesmo documento e contract_day dentro de
+    # [start_day, end_day]; end_day ausente (NO_DAY/None) é sanção sem fim.
+    # Chave vazia, dia do contrato ausente ou início ausente nunca casam.
+    # Ordem: posição do contrato, depois posição da sanção.
+    module = _module(resolve_backend(backend))
+    return module.overlap_pairs(contract_keys, contract_days, sanction_keys, start_days, end_days)
+
+
+def overlap_groups(
+    contract_keys: Sequence[str],
+    contract_days: Sequence[int],
+    sanction_keys: Sequence[str],
+    start_days: Sequence[int],
+    end_days: Sequence[int],
+    backend: str | None = None,
+) -> tuple[list[int], list[list[int]]]:
+    # Cada contrato é sondado contra os intervalos unidos do seu documento (no
+    # máximo um o contém) e atribuído a todas as sanções que cobrem o dia.
+    # Os pares expandidos são exatamente os de overlap_pairs.
+    intervals = coalesce_intervals(sanction_keys, start_days, end_days)
+    contract_pos, interval_pos = overlap_pairs(
+        contract_keys, contract_days, intervals.keys, intervals.starts, intervals.ends, backend=backend
+    )
+    contracts, groups = [], []
+    for contract, interval in zip(contract_pos, interval_pos):
+        contract, interval = int(contract), int(interval)
+        contracts.append(contract)
+        groups.append(
+            covering_members(contract_days[contract], intervals.members[interval], start_days, end_days)
+        )
+    return contracts, groups
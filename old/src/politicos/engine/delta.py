@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import struct
+from array import array
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Sequence
+
+# Delta entre snapshots diários (CEIS/CNEP completos): cada linha normalizada
+# vira um par (chave, hash) de 63 bits. A chave identifica o registro e o hash
+# cobre todos os campos; o snapshot anterior fica guardado só como esses dois
+# arrays, ordenados pela chave (16 bytes por linha).
+
+MAGIC = b"POLDELTA"
+FORMAT = 1
+# magic, formato, linhas, bytes de metadados
+HEADER = struct.Struct("<8sIQI")
+
+_MASK = (1 << 63) - 1
+_SEPARATOR = "\x1f"
+
+
+def row_hash(values: Sequence[object]) -> int:
+    # 63 bits, para caber em BIGINT/int64 sem sinal negativo
+    text = _SEPARATOR.join("" if value is None else str(value) for value in values)
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") & _MASK
+
+
+@dataclass
+class HashSet:
+    keys: array = field(default_factory=lambda: array("q"))
+    hashes: array = field(default_factory=lambda: array("q"))
+    duplicates: int = 0
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+def build_hash_set(pairs: Iterable[tuple[int, int]]) -> HashSet:
+    # Chaves repetidas no mesmo snapshot: vale a primeira ocorrência
+    ordered = sorted(pairs, key=lambda pair: pair[0])
+    result = HashSet()
+    previous = None
+    for key, value in ordered:
+        if key == previous:
+            result.duplicates += 1
+            continue
+        result.keys.append(key)
+        result.hashes.append(value)
+        previous = key
+    return result
+
+
+@dataclass
+class Delta:
+    inserted: array = field(default_factory=lambda: array("q"))
+    removed: array = field(default_factory=lambda: array("q"))
+    changed: array = field(default_factory=lambda: array("q"))
+    unchanged: int = 0
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "inserted": len(self.inserted),
+            "removed": len(self.removed),
+            "changed": len(self.changed),
+            "unchanged": self.unchanged,
+        }
+
+
+def compare(previous: HashSet | None, current: HashSet) -> Delta:
+    # Percorre os dois arrays ordenados em paralelo (merge), O(n + m)
+    previous = previous or HashSet()
+    delta = Delta()
+    i = j = 0
+    old_keys, old_hashes = previous.keys, previous.hashes
+    new_keys, new_hashes = current.keys, current.hashes
+    while i < len(old_keys) and j < len(new_keys):
+        old, new = old_keys[i], new_keys[j]
+        if old < new:
+            delta.removed.append(old)
+            i += 1
+        elif new < old:
+            delta.inserted.append(new)
+            j += 1
+        else:
+            if old_hashes[i] != new_hashes[j]:
+                delta.changed.append(new)
+            else:
+                delta.unchanged += 1
+            i += 1
+            j += 1
+    delta.removed.extend(old_keys[i:])
+    delta.inserted.extend(new_keys[j:])
+    return delta
+
+
+def save_hash_set(hash_set: HashSet, path: Path, metadata: bytes = b"") -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT, len(hash_set), len(metadata)))
+        f.write(metadata)
+        f.write(hash_set.keys.tobytes())
+        f.write(hash_set.hashes.tobytes())
+    os.replace(tmp, path)
+
+
+def load_hash_set(path: Path) -> tuple[HashSet, bytes] | None:
+    # None se o arquivo não existir ou for de outro formato
+    try:
+        data = Path(path).read_bytes()
+    except FileNotFoundError:
+        return None
+    if len(data) < HEADER.size:
+        return None
+    magic, fmt, rows, size = HEADER.unpack_from(data)
+    if magic != MAGIC or fmt != FORMAT or len(data) != HEADER.size + size + 16 * rows:
+        return None
+
+    start = HEADER.size + size
+    hash_set = HashSet()
+    hash_set.keys.frombytes(data[start:start + 8 * rows])
+    hash_set.hashes.frombytes(data[start + 8 * rows:])
+    return hash_set, data[HEADER.size:start]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Sequence
+
+from politicos.engine.values import NO_DAY
+
+# O CEIS repete sanções do mesmo documento (órgãos diferentes, republicações)
+# com períodos sobrepostos. Elas são unidas em intervalos disjuntos por
+# documento; cada intervalo guarda as sanções que o formam.
+
+
+def _missing(day: object) -> bool:
+    return day is None or day == NO_DAY
+
+
+@dataclass
+class Intervals:
+    keys: list[str] = field(default_factory=list)
+    starts: list[int] = field(default_factory=list)
+    ends: list[int] = field(default_factory=list)  # NO_DAY = sem fim
+    members: list[list[int]] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+def coalesce_intervals(
+    sanction_keys: Sequence[str],
+    start_days: Sequence[int],
+    end_days: Sequence[int],
+) -> Intervals:
+    # Une sanções do mesmo documento que se sobrepõem ou se encostam (dias
+    # consecutivos); sanções sem início ou com fim antes do início não
+    # cobrem nenhum dia e ficam de fora
+    valid = [
+        position
+        for position, key in enumerate(sanction_keys)
+        if key
+        and not _missing(start_days[position])
+        and (_missing(end_days[position]) or end_days[position] >= start_days[position])
+    ]
+    valid.sort(key=lambda position: (sanction_keys[position], start_days[position]))
+
+    intervals = Intervals()
+    current_end: int | None = None
+    for position in valid:
+        key, start = sanction_keys[position], start_days[position]
+        end = None if _missing(end_days[position]) else int(end_days[position])
+
+        same_key = bool(intervals.keys) and intervals.keys[-1] == key
+        if same_key and (current_end is None or start <= current_end + 1):
+            intervals.members[-1].append(position)
+            current_end = None if current_end is None or end is None else max(current_end, end)
+        else:
+            intervals.keys.append(key)
+            intervals.starts.append(int(start))
+            intervals.ends.append(NO_DAY)
+            intervals.members.append([position])
+            current_end = end
+        intervals.ends[-1] = NO_DAY if current_end is None else current_end
+
+    for members in intervals.members:
+        members.sort()
+    return intervals
+
+
+def covering_members(
+    day: int,
+    members: Sequence[int],
+    start_days: Sequence[int],
+    end_days: Sequence[int],
+) -> list[int]:
+    # Sanções do intervalo que de fato cobrem o dia (a união cobre todos os
+    # dias do intervalo, então sempre há ao menos uma)
+    return [
+        position
+        for position in members
+        if start_days[position] <= day and (_missing(end_days[position]) or day <= end_days[position])
+    ]
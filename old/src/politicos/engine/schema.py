@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import unicodedata
+from functools import lru_cache
+from typing import Mapping
+
+# Nomes canônicos das colunas e os apelidos aceitos nos arquivos de entrada,
+# compartilhados pela CLI (pandas) e pela aplicação web (csv.DictReader)
+
+SANCTION_COLUMNS = ["source_id", "cnpj_cpf", "name", "sanction_start", "sanction_end", "sanction_type"]
+
+SANCTION_ALIASES = {
+    "cpf_cnpj": "cnpj_cpf",
+    "documento": "cnpj_cpf",
+    "razao_social": "name",
+    "nome_sancionado": "name",
+    "data_inicio_sancao": "sanction_start",
+    "data_fim_sancao": "sanction_end",
+    "tipo_sancao": "sanction_type",
+    # Cabeçalhos do CEIS/CNEP baixados do Portal da Transparência
+    "cadastro": "source_id",
+    "cpf_ou_cnpj_do_sancionado": "cnpj_cpf",
+    "nome_do_sancionado": "name",
+    "data_final_sancao": "sanction_end",
+    "categoria_da_sancao": "sanction_type",
+}
+
+CONTRACT_COLUMNS = [
+    "source_id",
+    "supplier_document",
+    "supplier_name",
+    "contract_date",
+    "contract_value",
+    "contract_number",
+    "organ",
+]
+
+CONTRACT_ALIASES = {
+    "cnpj_cpf_fornecedor": "supplier_document",
+    "documento_fornecedor": "supplier_document",
+    "fornecedor_documento": "supplier_document",
+    "cpf_cnpj": "supplier_document",
+    "fornecedor": "supplier_name",
+    "nome_fornecedor": "supplier_name",
+    "nome": "supplier_name",
+    "data_contrato": "contract_date",
+    "data_assinatura": "contract_date",
+    "valor_contrato": "contract_value",
+    "valor": "contract_value",
+    "numero_contrato": "contract_number",
+    "numero": "contract_number",
+    "orgao": "organ",
+}
+
+
+@lru_cache(maxsize=1024)
+def normalize_name(name: str) -> str:
+    # "DATA INÍCIO SANÇÃO" -> "data_inicio_sancao"
+    decomposed = unicodedata.normalize("NFKD", name.strip().lower())
+    plain = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return plain.replace(" ", "_")
+
+
+def canonical_name(name: str, aliases: Mapping[str, str]) -> str:
+    normalized = normalize_name(name)
+    return aliases.get(normalized, normalized)
+
+
+def canonical_row(row: Mapping[str, object], aliases: Mapping[str, str]) -> dict[str, object]:
+    # Colunas canônicas têm prioridade sobre apelidos que apontam para elas
+    canonical: dict[str, object] = {}
+    for name, value in row.items():
+        if name is None:
+            continue
+        key = canonical_name(name, aliases)
+        if key not in canonical or normalize_name(name) == key:
+            canonical[key] = value
+    return canonical
@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import codecs
+import csv
+import io
+import zipfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterator, TextIO
+
+# Dumps do Portal da Transparência, PNCP e TSE chegam como ZIP de CSVs em
+# ISO-8859-1 separados por ";". Os arquivos são lidos direto do membro do ZIP,
+# sem extração nem arquivo temporário, e transcodificados em blocos grandes.
+
+BUFFER_SIZE = 1 << 20
+SAMPLE_SIZE = 1 << 20
+DELIMITERS = (";", ",", "\t", "|")
+TEXT_SUFFIXES = (".csv", ".txt")
+
+
+@dataclass(frozen=True)
+class SourceDialect:
+    encoding: str
+    delimiter: str
+
+
+def is_zip(path: Path) -> bool:
+    return path.suffix.lower() == ".zip" or (path.is_file() and zipfile.is_zipfile(path))
+
+
+def zip_member(archive: zipfile.ZipFile, member: str | None = None) -> zipfile.ZipInfo:
+    # Sem `member`, usa o único CSV/TXT do arquivo
+    if member is not None:
+        return archive.getinfo(member)
+    candidates = [
+        info
+        for info in archive.infolist()
+        if not info.is_dir() and info.filename.lower().endswith(TEXT_SUFFIXES)
+    ]
+    if len(candidates) != 1:
+        names = ", ".join(info.filename for info in candidates) or "nenhum"
+        raise ValueError(
+            f"{archive.filename}: esperado um único CSV dentro do ZIP (encontrados: {names})"
+        )
+    return candidates[0]
+
+
+@contextmanager
+def open_binary(path: Path, member: str | None = None) -> Iterator[BinaryIO]:
+    # Fluxo de bytes com buffer grande; membros de ZIP são descompactados sob demanda
+    path = Path(path)
+    if not is_zip(path):
+        with path.open("rb", buffering=BUFFER_SIZE) as raw:
+            yield raw
+        return
+    with zipfile.ZipFile(path) as archive:
+        with archive.open(zip_member(archive, member)) as raw:
+            yield io.BufferedReader(raw, buffer_size=BUFFER_SIZE)
+
+
+def _encoding(sample: bytes) -> str:
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        # final=False: a amostra pode cortar um caractere multibyte no meio
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return "latin-1"
+    return "utf-8"
+
+
+def _delimiter(header: str) -> str:
+    # O separador mais frequente no cabeçalho; vírgula em caso de empate/nenhum
+    counts = {delimiter: header.count(delimiter) for delimiter in DELIMITERS}
+    best = max(DELIMITERS, key=lambda delimiter: counts[delimiter])
+    return best if counts[best] > counts[","] else ","
+
+
+def sniff_dialect(sample: bytes) -> SourceDialect:
+    encoding = _encoding(sample)
+    header = sample.decode(encoding, errors="replace").splitlines()
+    return SourceDialect(encoding=encoding, delimiter=_delimiter(header[0] if header else ""))
+
+
+def detect_dialect(
+    path: Path,
+    member: str | None = None,
+    encoding: str | None = None,
+    delimiter: str | None = None,
+) -> SourceDialect:
+    with open_binary(path, member) as raw:
+        sniffed = sniff_dialect(raw.read(SAMPLE_SIZE))
+    return SourceDialect(
+        encoding=encoding or sniffed.encoding,
+        delimiter=delimiter or sniffed.delimiter,
+    )
+
+
+@contextmanager
+def open_text(
+    path: Path,
+    member: str | None = None,
+    encoding: str | None = None,
+    delimiter: str | None = None,
+) -> Iterator[tuple[TextIO, SourceDialect]]:
+    dialect = detect_dialect(path, member, encoding, delimiter)
+    with open_binary(path, member) as raw:
+        text = io.TextIOWrapper(raw, encoding=dialect.encoding, newline="")
+        # Decodifica em blocos de BUFFER_SIZE em vez dos 8 KiB padrão
+        text._CHUNK_SIZE = BUFFER_SIZE
+        try:
+            yield text, dialect
+        finally:
+            text.detach()
+
+
+def iter_rows(
+    path: Path,
+    member: str | None = None,
+    encoding: str | None = None,
+    delimiter: str | None = None,
+) -> Iterator[dict[str, str]]:
+    # Linhas como dicionários (csv.DictReader) de CSV simples ou dentro de ZIP
+    with open_text(path, member, encoding, delimiter) as (text, dialect):
+        yield from csv.DictReader(text, delimiter=dialect.delimiter)
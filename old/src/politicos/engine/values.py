@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import math
+import re
+from datetime import date, datetime
+
+CPF_LENGTH = 11
+CNPJ_LENGTH = 14
+
+# Dia sem valor (data ausente ou inválida); é também o NaT de datetime64[D]
+NO_DAY = -(2**63)
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Formatos aceitos, na ordem em que são tentados (ISO primeiro)
+DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%d/%m/%Y",
+    "%Y%m%d",
+    "%d-%m-%Y",
+    "%Y/%m/%d",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M:%S",
+    "%d/%m/%Y %H:%M:%S",
+)
+
+_NON_DIGITS = re.compile(r"[^0-9]+")
+_CURRENCY = re.compile(r"R\$|\s")
+
+
+def normalize_document(value: object) -> str:
+    # Só dígitos; CPF/CNPJ que perderam zeros à esquerda voltam a ter 11/14
+    if value is None or value != value:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value)
+    # CPF mascarado do Portal ("***.456.789-**") não identifica ninguém
+    if "*" in text:
+        return ""
+    digits = _NON_DIGITS.sub("", text)
+    if 0 < len(digits) < CPF_LENGTH:
+        return digits.zfill(CPF_LENGTH)
+    if CPF_LENGTH < len(digits) < CNPJ_LENGTH:
+        return digits.zfill(CNPJ_LENGTH)
+    return digits
+
+
+def parse_date(value: object) -> date | None:
+    if value is None or value != value or value == "":
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    # Atalho para o formato mais comum (equivale ao primeiro de DATE_FORMATS)
+    if len(text) == 10 and text[4] == "-" and text[7] == "-":
+        try:
+            return date.fromisoformat(text)
+        except ValueError:
+            pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def parse_decimal(value: object) -> float | None:
+    # Valores do Portal/PNCP vêm com vírgula decimal ("1.234,56"); a vírgula
+    # só é decimal se for única e vier depois do último ponto
+    if value is None or value != value or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        number = float(value)
+    else:
+        text = _CURRENCY.sub("", str(value))
+        if text.count(",") == 1 and text.rfind(",") > text.rfind("."):
+            text = text.replace(".", "").replace(",", ".")
+        else:
+            text = text.replace(",", "")
+            if text.count(".") > 1:
+                text = text.replace(".", "")
+        try:
+            number = float(text)
+        except ValueError:
+            return None
+    return number if math.isfinite(number) else None
+
+
+def day_number(value: object) -> int:
+    # Dias desde 1970-01-01, a unidade comum a todos os backends
+    parsed = parse_date(value)
+    if parsed is None:
+        return NO_DAY
+    return parsed.toordinal() - EPOCH_ORDINAL
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Callable
+
+import pandas as pd
+
+from politicos.normalize import normalize_documents, parse_dates
+
+
+@dataclass(frozen=True)
+class ScanFilters:
+    documents: frozenset[str] | None = None
+    since: date | None = None
+    until: date | None = None
+
+    @property
+    def active(self) -> bool:
+        return bool(self.documents) or self.since is not None or self.until is not None
+
+
+def _document_mask(values: pd.Series, documents: frozenset[str]) -> pd.Series:
+    wanted = set(normalize_documents(pd.Series(sorted(documents), dtype=object)))
+    return normalize_documents(values).isin(wanted)
+
+
+def filter_sanctions(df: pd.DataFrame, filters: ScanFilters | None) -> pd.DataFrame:
+    if filters is None or not filters.active:
+        return df
+
+    mask = pd.Series(True, index=df.index)
+    if filters.documents:
+        mask &= _document_mask(df["cnpj_cpf"], filters.documents)
+    # Sanções vigentes em algum momento do período
+    if filters.until is not None:
+        mask &= parse_dates(df["sanction_start"]) <= pd.Timestamp(filters.until)
+    if filters.since is not None:
+        end = parse_dates(df["sanction_end"])
+        mask &= end.isna() | (end >= pd.Timestamp(filters.since))
+    return df[mask]
+
+
+def filter_contracts(df: pd.DataFrame, filters: ScanFilters | None) -> pd.DataFrame:
+    if filters is None or not filters.active:
+        return df
+
+    mask = pd.Series(True, index=df.index)
+    if filters.documents:
+        mask &= _document_mask(df["supplier_document"], filters.documents)
+    if filters.since is not None or filters.until is not None:
+        contract_date = parse_dates(df["contract_date"])
+        if filters.since is not None:
+            mask &= contract_date >= pd.Timestamp(filters.since)
+        if filters.until is not None:
+            mask &= contract_date <= pd.Timestamp(filters.until)
+    return df[mask]
+
+
+def _scalar(schema: Any, column: str, value: date) -> Any:
+    import pyarrow as pa
+
+    return pa.scalar(pd.Timestamp(value).to_pydatetime(), type=schema.field(column).type)
+
+
+def _documents_expression(column: str, documents: frozenset[str]) -> Any:
+    import pyarrow.compute as pc
+
+    wanted = sorted(set(normalize_documents(pd.Series(sorted(documents), dtype=object))))
+    return pc.field(column).isin(wanted)
+
+
+def sanction_predicate(filters: ScanFilters | None) -> Callable[[Any], Any] | None:
+    # Predicado pyarrow sobre as colunas canônicas de um arquivo normalizado
+    if filters is None or not filters.active:
+        return None
+
+    def build(schema: Any) -> Any:
+        import pyarrow.compute as pc
+
+        expression = pc.scalar(True)
+        if filters.documents:
+            expression &= _documents_expression("cnpj_cpf", filters.documents)
+        if filters.until is not None:
+            expression &= pc.field("sanction_start") <= _scalar(schema, "sanction_start", filters.until)
+        if filters.since is not None:
+            expression &= pc.field("sanction_end").is_null() | (
+                pc.field("sanction_end") >= _scalar(schema, "sanction_end", filters.since)
+            )
+        return expression
+
+    return build
+
+
+def contract_predicate(filters: ScanFilters | None) -> Callable[[Any], Any] | None:
+    if filters is None or not filters.active:
+        return None
+
+    def build(schema: Any) -> Any:
+        import pyarrow.compute as pc
+
+        expression = pc.scalar(True)
+        if filters.documents:
+            expression &= _documents_expression("supplier_document", filters.documents)
+        if filters.since is not None:
+            expression &= pc.field("contract_date") >= _scalar(schema, "contract_date", filters.since)
+        if filters.until is not None:
+            expression &= pc.field("contract_date") <= _scalar(schema, "contract_date", filters.until)
+        return expression
+
+    return build
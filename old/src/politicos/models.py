@@ -6,21 +6,19 @@ from typing import Any
 
 import pandas as pd
 
+from politicos.engine.values import normalize_document, parse_date
+
 
 def _clean_document(value: Any) -> str:
     if pd.isna(value):
         return ""
-    text = str(value)
-    return "".join(ch for ch in text if ch.isdigit())
+    return normalize_document(value)
 
 
 def _to_date(value: Any) -> date | None:
     if pd.isna(value) or value in ("", None):
         return None
-    converted = pd.to_datetime(value, errors="coerce", dayfirst=True)
-    if pd.isna(converted):
-        return None
-    return converted.date()
+    return parse_date(value)
 
 
 @dataclass(frozen=True)
@@ -74,4 +72,5 @@ def parse_contract_row(row: pd.Series) -> ContractRecord:
         contract_value=contract_value,
         contract_number=str(row.get("contract_number", "")).strip(),
         organ=str(row.get("organ", "")).strip(),
-    )
\ No newline at end of file
+    )
+
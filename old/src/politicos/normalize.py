@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from politicos.engine.values import CNPJ_LENGTH, CPF_LENGTH, DATE_FORMATS
+
+
+def document_digits(values: pd.Series) -> pd.Series:
+    # Colunas lidas como número perdem os zeros à esquerda e, se houver
+    # ausentes, viram float ("123.0"); voltam a inteiro antes de virar texto.
+    if pd.api.types.is_float_dtype(values) or pd.api.types.is_integer_dtype(values):
+        try:
+            values = values.astype("Int64")
+        except (TypeError, ValueError):
+            pass
+    text = values.astype("string")
+    # CPF mascarado do Portal ("***.456.789-**") não identifica ninguém
+    text = text.mask(text.str.contains("*", regex=False, na=False), "")
+    return text.str.replace(r"[^0-9]+", "", regex=True).fillna("").astype(str)
+
+
+def pad_documents(digits: pd.Series) -> pd.Series:
+    # CPF/CNPJ que perderam zeros à esquerda voltam a ter 11/14 dígitos
+    lengths = digits.str.len()
+    padded = digits.copy()
+    for low, width in ((1, CPF_LENGTH), (CPF_LENGTH + 1, CNPJ_LENGTH)):
+        short = lengths.between(low, width - 1)
+        if short.any():
+            padded[short] = digits[short].str.zfill(width)
+    return padded
+
+
+def normalize_documents(values: pd.Series) -> pd.Series:
+    return pad_documents(document_digits(values))
+
+
+def parse_dates(values: pd.Series) -> pd.Series:
+    # Mesmos formatos, na mesma ordem, de politicos.engine.parse_date
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    text = values.astype("string").str.strip()
+    converted = pd.Series(pd.NaT, index=values.index, dtype="datetime64[ns]")
+    for fmt in DATE_FORMATS:
+        rest = converted.isna() & text.notna() & (text != "")
+        if not rest.any():
+            break
+        converted[rest] = pd.to_datetime(text[rest], errors="coerce", format=fmt).astype("datetime64[ns]")
+    return converted
+
+
+def parse_decimals(values: pd.Series) -> pd.Series:
+    # Mesmas regras de politicos.engine.parse_decimal ("1.234,56" e "1234.56")
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.astype("float64")
+    text = values.astype("string").str.replace(r"R\$|\s", "", regex=True)
+    comma = (text.str.count(",") == 1) & (text.str.rfind(",") > text.str.rfind("."))
+    converted = text.str.replace(",", "", regex=False)
+    converted = converted.mask(converted.str.count(r"\.") > 1, converted.str.replace(".", "", regex=False))
+    converted = converted.mask(
+        comma.fillna(False), text.str.replace(".", "", regex=False).str.replace(",", ".", regex=False)
+    )
+    numbers = pd.to_numeric(converted, errors="coerce").astype("float64")
+    return numbers.where(np.isfinite(numbers))
+
+
+def day_numbers(values: pd.Series) -> np.ndarray:
+    # Dias desde 1970-01-01 (NaT vira NO_DAY), a unidade do motor de cruzamento
+    return parse_dates(values).to_numpy(dtype="datetime64[D]").astype(np.int64)
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+
+from politicos.config import Settings
+from politicos.connectors import ceis, contracts, iter_ceis, iter_contracts, load_ceis, load_contracts
+from politicos.connectors.ceis import prepare_ceis
+from politicos.connectors.contracts import prepare_contracts
+from politicos.connectors.csv_loader import memory_bytes
+from politicos.filters import ScanFilters
+from politicos.normalize import normalize_documents
+from politicos.pipeline import write_outputs
+from politicos.rules import find_contracts_during_sanction
+
+
+def partition_of(documents: pd.Series, partitions: int) -> np.ndarray:
+    # Hash estável do documento normalizado: o mesmo CPF/CNPJ cai na mesma
+    # partição nos dois arquivos e em qualquer processo
+    keys = normalize_documents(documents).to_numpy(dtype=object)
+    return (pd.util.hash_array(keys) % partitions).astype(np.int64)
+
+
+def spill(chunks: Iterator[pd.DataFrame], column: str, partitions: int, spill_dir: Path, prefix: str) -> int:
+    # Uma passada: cada bloco é dividido por partição e anexado ao CSV dela,
+    # preservando a ordem original das linhas dentro de cada partição
+    rows = 0
+    started = set()
+    for chunk in chunks:
+        rows += len(chunk)
+        target = partition_of(chunk[column], partitions)
+        for partition in np.unique(target):
+            path = spill_dir / f"{prefix}-{partition:05d}.csv"
+            chunk[target == partition].to_csv(
+                path, mode="a", header=partition not in started, index=False
+            )
+            started.add(partition)
+    return rows
+
+
+def scan_partition(ceis_path: Path, contracts_path: Path, output_path: Path, backend: str) -> dict:
+    sanctions = load_ceis(ceis_path)
+    contracts = load_contracts(contracts_path)
+    flagged = find_contracts_during_sanction(sanctions, contracts, backend)
+    flagged.to_pickle(output_path)
+    return {
+        "output": output_path,
+        "sanctions": memory_bytes(sanctions),
+        "contracts": memory_bytes(contracts),
+    }
+
+
+def merge_partitions(outputs: list[Path]) -> pd.DataFrame:
+    # Um mesmo (data, documento) nunca aparece em duas partições, então a
+    # ordenação estável reproduz a ordem da execução em um único processo
+    if not outputs:
+        return find_contracts_during_sanction(
+            prepare_ceis(pd.DataFrame(columns=ceis.COLUMNS)),
+            prepare_contracts(pd.DataFrame(columns=contracts.COLUMNS)),
+        )
+
+    frames = [pd.read_pickle(path) for path in outputs]
+    categorical = [col for col in frames[0].columns if isinstance(frames[0][col].dtype, pd.CategoricalDtype)]
+    flagged = pd.concat(frames, ignore_index=True)
+    flagged = flagged.astype({col: "category" for col in categorical})
+    return flagged.sort_values(by=["contract_date", "doc_key"], kind="stable").reset_index(drop=True)
+
+
+def run_partitioned(
+    settings: Settings,
+    filters: ScanFilters | None = None,
+    partitions: int = 8,
+    workers: int | None = None,
+) -> dict:
+    workers = workers or os.cpu_count() or 1
+    settings.output_dir.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.TemporaryDirectory(prefix=".spill-", dir=settings.output_dir) as tmp:
+        spill_dir = Path(tmp)
+        sanctions_rows = spill(iter_ceis(settings.ceis_csv, filters), "cnpj_cpf", partitions, spill_dir, "ceis")
+        contracts_rows = spill(
+            iter_contracts(settings.contracts_csv, filters), "supplier_document", partitions, spill_dir, "contracts"
+        )
+
+        # Só partições com sanções e contratos podem gerar cruzamentos
+        tasks = []
+        for partition in range(partitions):
+            ceis_path = spill_dir / f"ceis-{partition:05d}.csv"
+            contracts_path = spill_dir / f"contracts-{partition:05d}.csv"
+            if ceis_path.exists() and contracts_path.exists():
+                tasks.append(
+                    (ceis_path, contracts_path, spill_dir / f"flagged-{partition:05d}.pkl", settings.engine)
+                )
+
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+                results = list(pool.map(scan_partition, *zip(*tasks)))
+        else:
+            results = [scan_partition(*task) for task in tasks]
+
+        flagged = merge_partitions([result["output"] for result in results])
+
+    memory = {
+        "sanctions": max((result["sanctions"] for result in results), default=0),
+        "contracts": max((result["contracts"] for result in results), default=0),
+        "flagged": memory_bytes(flagged),
+    }
+    extra = {"partitions": partitions, "workers": workers}
+    return write_outputs(settings, flagged, sanctions_rows, contracts_rows, memory, filters, extra)
@@ -1,34 +1,119 @@
 from __future__ import annotations
 
 import json
+import os
 from dataclasses import asdict
 from pathlib import Path
 
-from politicos.connectors import load_ceis, load_contracts
+import pandas as pd
+
+from politicos.connectors import load_ceis, load_contracts, normalize_ceis, normalize_contracts
+from politicos.connectors.columnar import SUFFIXES, detect_format, write_columnar
+from politicos.connectors.csv_loader import memory_bytes
 from politicos.config import Settings
+from politicos.engine import resolve_backend
+from politicos.filters import ScanFilters
+from politicos.normalize import parse_dates
 from politicos.rules import find_contracts_during_sanction
 
+PARTITION_COLS = ["year", "organ"]
+
+
+def write_flagged(flagged: pd.DataFrame, output_dir: Path, fmt: str) -> Path:
+    if fmt == "csv":
+        path = output_dir / "contracts_during_sanction.csv"
+        tmp = path.with_name(f".{path.name}.tmp")
+        flagged.to_csv(tmp, index=False)
+        os.replace(tmp, path)
+        return path
+
+    # Parquet/Arrow: diretório particionado por ano do contrato e órgão
+    partitioned = flagged.assign(
+        year=parse_dates(flagged["contract_date"]).dt.year.astype("Int64"),
+        organ=flagged["organ"].astype("string").fillna(""),
+    )
+    return write_columnar(
+        partitioned,
+        output_dir / "contracts_during_sanction",
+        fmt,
+        partition_cols=PARTITION_COLS,
+    )
+
+
+def filters_summary(filters: ScanFilters) -> dict:
+    return {
+        "documents": sorted(filters.documents or []),
+        "since": filters.since.isoformat() if filters.since else None,
+        "until": filters.until.isoformat() if filters.until else None,
+    }
 
-def run_sanctions_vs_contracts(settings: Settings) -> dict:
-    sanctions = load_ceis(settings.ceis_csv)
-    contracts = load_contracts(settings.contracts_csv)
-    flagged = find_contracts_during_sanction(sanctions, contracts)
 
+def write_outputs(
+    settings: Settings,
+    flagged: pd.DataFrame,
+    sanctions_rows: int,
+    contracts_rows: int,
+    memory: dict,
+    filters: ScanFilters | None = None,
+    extra: dict | None = None,
+) -> dict:
     settings.output_dir.mkdir(parents=True, exist_ok=True)
-    csv_path = settings.output_dir / "contracts_during_sanction.csv"
     json_path = settings.output_dir / "summary.json"
 
-    flagged.to_csv(csv_path, index=False)
+    output_path = write_flagged(flagged, settings.output_dir, settings.output_format)
 
     summary = {
-        "sanctions_rows": int(len(sanctions)),
-        "contracts_rows": int(len(contracts)),
+        "sanctions_rows": int(sanctions_rows),
+        "contracts_rows": int(contracts_rows),
         "flagged_rows": int(len(flagged)),
         "flagged_total_value": float(flagged["contract_value"].fillna(0).sum())
         if "contract_value" in flagged.columns
         else 0.0,
-        "output_csv": str(csv_path),
+        "memory_bytes": memory,
+        "engine": resolve_backend(settings.engine),
+        **(extra or {}),
+        "output_format": settings.output_format,
+        "output_path": str(output_path),
     }
+    if settings.output_format == "csv":
+        summary["output_csv"] = str(output_path)
+    if filters is not None and filters.active:
+        summary["filters"] = filters_summary(filters)
+
+    # Troca atômica: quem lê OUTPUT_DIR nunca vê um arquivo pela metade
+    tmp = json_path.with_name(f".{json_path.name}.tmp")
+    tmp.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, json_path)
+    return summary
+
+
+def run_sanctions_vs_contracts(settings: Settings, filters: ScanFilters | None = None) -> dict:
+    sanctions = load_ceis(settings.ceis_csv, filters)
+    contracts = load_contracts(settings.contracts_csv, filters)
+    flagged = find_contracts_during_sanction(sanctions, contracts, settings.engine)
+
+    memory = {
+        "sanctions": memory_bytes(sanctions),
+        "contracts": memory_bytes(contracts),
+        "flagged": memory_bytes(flagged),
+    }
+    return write_outputs(settings, flagged, len(sanctions), len(contracts), memory, filters)
+
+
+def convert_sources(settings: Settings, fmt: str, output_dir: Path | None = None) -> dict:
+    # Grava CEIS e contratos normalizados em formato colunar; scans seguintes
+    # leem só as colunas e linhas necessárias, sem parsear CSV
+    converted = {}
+    for name, path, load, normalize in (
+        ("ceis", settings.ceis_csv, load_ceis, normalize_ceis),
+        ("contracts", settings.contracts_csv, load_contracts, normalize_contracts),
+    ):
+        target_dir = output_dir or path.parent
+        target = target_dir / f"{path.stem}{SUFFIXES[fmt]}"
+        if target.resolve() == path.resolve() or detect_format(path) == fmt:
+            raise ValueError(f"{path} já está no formato {fmt}")
 
-    json_path.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
-    return summary
\ No newline at end of file
+        df = normalize(load(path))
+        write_columnar(df, target, fmt, normalized=True)
+        converted[name] = {"rows": int(len(df)), "source": str(path), "output": str(target)}
+    return converted
@@ -1,52 +1,56 @@
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
+from politicos.engine import overlap_pairs
+from politicos.normalize import day_numbers, normalize_documents, parse_dates
 
-def _digits_only(value: object) -> str:
-    if pd.isna(value):
-        return ""
-    return "".join(ch for ch in str(value) if ch.isdigit())
+
+def _join_pairs(
+    contracts: pd.DataFrame,
+    sanctions: pd.DataFrame,
+    contract_pos: np.ndarray,
+    sanction_pos: np.ndarray,
+) -> pd.DataFrame:
+    left = contracts.iloc[contract_pos].reset_index(drop=True)
+    right = sanctions.drop(columns="doc_key").iloc[sanction_pos].reset_index(drop=True)
+
+    overlap = [col for col in left.columns if col in right.columns]
+    left = left.rename(columns={col: f"{col}_contract" for col in overlap})
+    right = right.rename(columns={col: f"{col}_sanction" for col in overlap})
+    return pd.concat([left, right], axis=1)
 
 
 def find_contracts_during_sanction(
     sanctions: pd.DataFrame,
     contracts: pd.DataFrame,
+    backend: str | None = None,
 ) -> pd.DataFrame:
     sanctions = sanctions.copy()
     contracts = contracts.copy()
 
-    sanctions["doc_key"] = sanctions["cnpj_cpf"].map(_digits_only)
-    contracts["doc_key"] = contracts["supplier_document"].map(_digits_only)
+    sanctions["doc_key"] = normalize_documents(sanctions["cnpj_cpf"])
+    contracts["doc_key"] = normalize_documents(contracts["supplier_document"])
 
-    sanctions["sanction_start"] = pd.to_datetime(
-        sanctions["sanction_start"], errors="coerce", format="mixed", dayfirst=True
-    )
-    sanctions["sanction_end"] = pd.to_datetime(
-        sanctions["sanction_end"], errors="coerce", format="mixed", dayfirst=True
-    )
-    contracts["contract_date"] = pd.to_datetime(
-        contracts["contract_date"], errors="coerce", format="mixed", dayfirst=True
-    )
+    sanctions["sanction_start"] = parse_dates(sanctions["sanction_start"])
+    sanctions["sanction_end"] = parse_dates(sanctions["sanction_end"])
+    contracts["contract_date"] = parse_dates(contracts["contract_date"])
 
     sanctions = sanctions[sanctions["doc_key"] != ""]
     contracts = contracts[contracts["doc_key"] != ""]
     contracts = contracts[contracts["contract_date"].notna()]
     sanctions = sanctions[sanctions["sanction_start"].notna()]
 
-    merged = contracts.merge(
-        sanctions,
-        on="doc_key",
-        suffixes=("_contract", "_sanction"),
-        how="inner",
+    contract_pos, sanction_pos = overlap_pairs(
+        contracts["doc_key"].to_numpy(dtype=str),
+        day_numbers(contracts["contract_date"]),
+        sanctions["doc_key"].to_numpy(dtype=str),
+        day_numbers(sanctions["sanction_start"]),
+        day_numbers(sanctions["sanction_end"]),
+        backend=backend,
     )
-
-    end_date = merged["sanction_end"].fillna(pd.Timestamp.max)
-    in_window = (merged["contract_date"] >= merged["sanction_start"]) & (
-        merged["contract_date"] <= end_date
-    )
-
-    flagged = merged[in_window].copy()
+    flagged = _join_pairs(contracts, sanctions, contract_pos, sanction_pos)
 
     ordered = [
         "doc_key",
@@ -65,4 +69,4 @@ def find_contracts_during_sanction(
         flagged = flagged[existing]
 
     flagged = flagged.sort_values(by=["contract_date", "doc_key"]).reset_index(drop=True)
-    return flagged
\ No newline at end of file
+    return flagged
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Callable
+
+import pandas as pd
+
+from politicos.config import Settings
+from politicos.connectors import load_ceis, load_contracts
+from politicos.connectors.csv_loader import memory_bytes
+from politicos.filters import ScanFilters, filter_contracts, filter_sanctions
+from politicos.pipeline import filters_summary, write_outputs
+from politicos.rules import find_contracts_during_sanction
+
+STAGES = {
+    "ceis": (lambda settings: settings.ceis_csv, load_ceis, filter_sanctions),
+    "contracts": (lambda settings: settings.contracts_csv, load_contracts, filter_contracts),
+}
+
+
+def fingerprint(path: Path) -> str | None:
+    # Caminho, tamanho e mtime de cada arquivo (diretórios particionados incluídos)
+    if not path.exists():
+        return None
+    files = [path] if path.is_file() else sorted(p for p in path.rglob("*") if p.is_file())
+    digest = hashlib.sha1(str(path.resolve()).encode())
+    for file in files:
+        stat = file.stat()
+        digest.update(f"{file.relative_to(path.parent)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def _has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _cache_path(cache_dir: Path, name: str, key: str) -> Path:
+    suffix = ".parquet" if _has_pyarrow() else ".pkl"
+    return cache_dir / f"{name}-{key[:16]}{suffix}"
+
+
+def cached_frame(
+    cache_dir: Path,
+    name: str,
+    path: Path,
+    key: str,
+    loader: Callable[[Path], pd.DataFrame],
+) -> tuple[pd.DataFrame, bool]:
+    # Frame já parseado e tipado, gravado em Parquet e identificado pela
+    # impressão digital do arquivo de origem
+    cached = _cache_path(cache_dir, name, key)
+    if cached.exists():
+        if cached.suffix == ".parquet":
+            return pd.read_parquet(cached), True
+        return pd.read_pickle(cached), True
+
+    df = loader(path)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = cached.with_name(f".{cached.name}.tmp")
+    if cached.suffix == ".parquet":
+        df.to_parquet(tmp, index=False)
+    else:
+        df.to_pickle(tmp)
+    os.replace(tmp, cached)
+
+    for stale in cache_dir.glob(f"{name}-*"):
+        if stale != cached:
+            stale.unlink()
+    return df, False
+
+
+def _previous_run(settings: Settings) -> dict:
+    try:
+        return json.loads((settings.output_dir / "summary.json").read_text(encoding="utf-8"))
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _run_signature(inputs: dict, settings: Settings, filters: ScanFilters | None) -> dict:
+    return {
+        "inputs": inputs,
+        "output_format": settings.output_format,
+        "filters": filters_summary(filters) if filters is not None and filters.active else None,
+    }
+
+
+class Watcher:
+    def __init__(self, settings: Settings, filters: ScanFilters | None = None) -> None:
+        self.settings = settings
+        self.filters = filters
+        self.cache_dir = settings.cache_dir or settings.data_dir / "cache"
+        self.frames: dict[str, tuple[str, pd.DataFrame]] = {}
+
+        previous = _previous_run(settings)
+        self.last = {
+            "inputs": previous.get("inputs"),
+            "output_format": previous.get("output_format"),
+            "filters": previous.get("filters"),
+        }
+
+    def current_inputs(self) -> dict[str, str | None]:
+        return {name: fingerprint(path_of(self.settings)) for name, (path_of, _, _) in STAGES.items()}
+
+    def is_current(self, inputs: dict) -> bool:
+        return _run_signature(inputs, self.settings, self.filters) == self.last
+
+    def run(self, inputs: dict[str, str]) -> dict:
+        # Reparseia só as entradas que mudaram; as demais vêm da memória ou do cache
+        stages = {}
+        filtered = {}
+        for name, (path_of, loader, apply_filters) in STAGES.items():
+            key = inputs[name]
+            if name in self.frames and self.frames[name][0] == key:
+                df, stages[name] = self.frames[name][1], "memory"
+            else:
+                df, hit = cached_frame(self.cache_dir, name, path_of(self.settings), key, loader)
+                stages[name] = "cache" if hit else "parsed"
+                self.frames[name] = (key, df)
+            filtered[name] = apply_filters(df, self.filters)
+
+        sanctions, contracts = filtered["ceis"], filtered["contracts"]
+        flagged = find_contracts_during_sanction(sanctions, contracts, self.settings.engine)
+
+        memory = {
+            "sanctions": memory_bytes(sanctions),
+            "contracts": memory_bytes(contracts),
+            "flagged": memory_bytes(flagged),
+        }
+        summary = write_outputs(
+            self.settings,
+            flagged,
+            len(sanctions),
+            len(contracts),
+            memory,
+            self.filters,
+            extra={"inputs": inputs, "stages": stages},
+        )
+        self.last = _run_signature(inputs, self.settings, self.filters)
+        return summary
+
+    def loop(
+        self,
+        interval: float = 5.0,
+        debounce: float = 2.0,
+        max_runs: int | None = None,
+        echo: Callable[[str], None] = print,
+    ) -> None:
+        # Uma mudança só dispara o scan depois de `debounce` segundos sem novas
+        # alterações (arquivo ainda sendo copiado, vários arquivos chegando)
+        runs = 0
+        pending: dict | None = None
+        changed_at = 0.0
+        missing_reported = False
+
+        while max_runs is None or runs < max_runs:
+            inputs = self.current_inputs()
+            missing = [name for name, key in inputs.items() if key is None]
+
+            if missing:
+                if not missing_reported:
+                    echo(f"Aguardando arquivos de entrada: {', '.join(missing)}")
+                    missing_reported = True
+                pending = None
+            elif self.is_current(inputs):
+                missing_reported = False
+                pending = None
+            elif inputs != pending:
+                missing_reported = False
+                pending, changed_at = inputs, time.monotonic()
+            elif time.monotonic() - changed_at >= debounce:
+                try:
+                    summary = self.run(inputs)
+                    echo(json.dumps(summary, indent=2, ensure_ascii=False))
+                except Exception as exc:
+                    echo(f"Falha no scan: {exc}")
+                    self.last = _run_signature(inputs, self.settings, self.filters)
+                runs += 1
+                pending = None
+
+            time.sleep(min(interval, debounce) if pending else interval)
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import zipfile
+
+import pandas as pd
+import pytest
+
+from politicos.connectors.contracts import iter_contracts, load_contracts
+from politicos.engine import parse_decimal
+from politicos.normalize import parse_decimals
+
+DECIMALS = [
+    ("1234,56", 1234.56),
+    ("1.234,56", 1234.56),
+    ("R$ 1.234.567,89", 1234567.89),
+    ("1234.56", 1234.56),
+    ("1,234.56", 1234.56),
+    ("1.234.567", 1234567.0),
+    ("-0,5", -0.5),
+    ("", None),
+    ("abc", None),
+    ("inf", None),
+]
+
+
+@pytest.fixture
+def portal_contracts(tmp_path):
+    # Como os arquivos do Portal/PNCP: ZIP de CSV latin-1, ";" e vírgula decimal
+    text = (
+        "NÚMERO CONTRATO;CNPJ CPF FORNECEDOR;NOME FORNECEDOR;DATA ASSINATURA;VALOR CONTRATO;ÓRGÃO\n"
+        "1/2024;12.345.678/0001-90;Fornecedora Ltda;10/03/2024;1.234,56;Ministério da Saúde\n"
+        "2/2024;12.345.678/0001-90;Fornecedora Ltda;2024-04-01;987,1;Ministério da Saúde\n"
+        "3/2024;98.765.432/0001-10;Outra S.A.;2024-05-02;não informado;Ministério da Educação\n"
+    )
+    path = tmp_path / "contratos.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("contratos.csv", text.encode("latin-1"))
+    return path
+
+
+@pytest.mark.parametrize("text, expected", DECIMALS)
+def test_parse_decimal(text, expected):
+    assert parse_decimal(text) == expected
+
+
+def test_parse_decimals_matches_scalar_parser():
+    texts = [text for text, _ in DECIMALS]
+    converted = parse_decimals(pd.Series(texts, dtype="string"))
+
+    assert [None if pd.isna(value) else value for value in converted] == [parse_decimal(t) for t in texts]
+    assert parse_decimals(pd.Series([1.5, None])).tolist()[0] == 1.5
+
+
+def test_load_contracts_reads_comma_decimals(portal_contracts):
+    contracts = load_contracts(portal_contracts)
+
+    assert contracts["contract_value"].dtype == "float64"
+    assert contracts["contract_value"].tolist()[:2] == [1234.56, 987.1]
+    assert pd.isna(contracts["contract_value"].iloc[2])
+    assert contracts["organ"].tolist()[0] == "Ministério da Saúde"
+
+
+def test_iter_contracts_reads_comma_decimals(portal_contracts):
+    chunks = list(iter_contracts(portal_contracts, chunksize=2))
+
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert chunks[0]["contract_value"].tolist() == [1234.56, 987.1]
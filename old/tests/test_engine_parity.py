@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from politicos.engine import (
+    NO_DAY,
+    available_backends,
+    coalesce_intervals,
+    day_number,
+    normalize_document,
+    overlap_groups,
+    overlap_pairs,
+)
+from politicos.engine.check import _as_arrays, check_parity, synthetic_inputs
+
+BACKENDS = available_backends()
+VECTORIZED = [backend for backend in BACKENDS if backend != "python"]
+
+
+def day(text: str) -> int:
+    return day_number(date.fromisoformat(text))
+
+
+def pairs(inputs: dict, backend: str) -> list[tuple[int, int]]:
+    contract_pos, sanction_pos = overlap_pairs(**inputs, backend=backend)
+    return [(int(c), int(s)) for c, s in zip(contract_pos, sanction_pos)]
+
+
+def grouped_pairs(inputs: dict, backend: str) -> list[tuple[int, int]]:
+    contracts, groups = overlap_groups(**inputs, backend=backend)
+    return [(contract, sanction) for contract, group in zip(contracts, groups) for sanction in group]
+
+
+def crossing(contracts: list[tuple[str, str]], sanctions: list[tuple[str, str, str | None]]) -> dict:
+    # (documento, data) dos contratos e (documento, início, fim) das sanções,
+    # normalizados como no pipeline
+    return {
+        "contract_keys": [normalize_document(doc) for doc, _ in contracts],
+        "contract_days": [day(signed) for _, signed in contracts],
+        "sanction_keys": [normalize_document(doc) for doc, _, _ in sanctions],
+        "start_days": [day(start) for _, start, _ in sanctions],
+        "end_days": [day(end) if end else NO_DAY for _, _, end in sanctions],
+    }
+
+
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_synthetic_inputs_match_python_backend(backend, seed):
+    inputs = synthetic_inputs(contracts=5_000, sanctions=800, documents=200, seed=seed)
+    reference = pairs(inputs, "python")
+
+    assert reference
+    assert pairs(inputs, backend) == reference
+    assert grouped_pairs(inputs, backend) == reference
+
+
+@pytest.mark.parametrize("backend", VECTORIZED)
+def test_vectorized_backends_accept_arrays(backend):
+    inputs = synthetic_inputs(contracts=5_000, sanctions=800, documents=200, seed=7)
+
+    assert pairs(_as_arrays(inputs), backend) == pairs(inputs, "python")
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_empty_inputs(backend):
+    inputs = crossing([], [])
+
+    assert pairs(inputs, backend) == []
+    assert overlap_groups(**inputs, backend=backend) == ([], [])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_open_ended_sanction_covers_any_later_day(backend):
+    inputs = crossing(
+        [("12345678000190", "2019-12-31"), ("12345678000190", "2020-01-01"), ("12345678000190", "2099-12-31")],
+        [("12345678000190", "2020-01-01", None)],
+    )
+
+    assert pairs(inputs, backend) == [(1, 0), (2, 0)]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_same_day_boundaries_are_inclusive(backend):
+    inputs = crossing(
+        [
+            ("12345678000190", "2020-12-31"),
+            ("12345678000190", "2021-01-01"),
+            ("12345678000190", "2021-06-30"),
+            ("12345678000190", "2021-07-01"),
+        ],
+        [
+            ("12345678000190", "2021-01-01", "2021-06-30"),
+            ("12345678000190", "2022-03-10", "2022-03-10"),
+        ],
+    )
+    inputs["contract_keys"].append("12345678000190")
+    inputs["contract_days"].append(day("2022-03-10"))
+
+    assert pairs(inputs, backend) == [(1, 0), (2, 0), (4, 1)]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_zero_padded_documents_match(backend):
+    # Planilhas perdem os zeros à esquerda de CPFs/CNPJs
+    inputs = crossing(
+        [("1234567000190", "2021-03-01"), ("123.456.789-01", "2021-03-01"), ("23456789012", "2021-03-01")],
+        [("01.234.567/0001-90", "2021-01-01", None), ("12345678901", "2021-01-01", None), ("2345678901", "2021-01-01", None)],
+    )
+
+    assert inputs["contract_keys"][0] == inputs["sanction_keys"][0] == "01234567000190"
+    assert inputs["sanction_keys"][2] == "02345678901"
+    assert pairs(inputs, backend) == [(0, 0), (1, 1)]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_masked_and_missing_documents_never_match(backend):
+    inputs = crossing(
+        [("***.456.789-**", "2021-03-01"), ("", "2021-03-01"), ("12345678901", "2021-03-01")],
+        [("***.456.789-**", "2021-01-01", None), ("", "2021-01-01", None), ("12345678901", "2021-01-01", None)],
+    )
+
+    assert inputs["contract_keys"][0] == inputs["sanction_keys"][0] == ""
+    assert pairs(inputs, backend) == [(2, 2)]
+    assert overlap_groups(**inputs, backend=backend) == ([2], [[2]])
+
+
+def test_coalesce_merges_overlapping_and_adjacent_sanctions():
+    inputs = crossing(
+        [],
+        [
+            ("12345678000190", "2021-01-01", "2021-06-30"),
+            ("12345678000190", "2021-03-01", "2021-12-31"),  # sobrepõe a primeira
+            ("12345678000190", "2022-01-01", "2022-01-31"),  # começa no dia seguinte
+            ("12345678000190", "2022-03-01", None),  # separada, sem fim
+            ("99999999000199", "2021-01-01", "2021-01-31"),
+            ("12345678000190", "2022-05-01", "2022-04-01"),  # fim antes do início
+        ],
+    )
+    intervals = coalesce_intervals(inputs["sanction_keys"], inputs["start_days"], inputs["end_days"])
+
+    assert intervals.keys == ["12345678000190", "12345678000190", "99999999000199"]
+    assert intervals.starts == [day("2021-01-01"), day("2022-03-01"), day("2021-01-01")]
+    assert intervals.ends == [day("2022-01-31"), NO_DAY, day("2021-01-31")]
+    assert intervals.members == [[0, 1, 2], [3], [4]]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_groups_list_only_sanctions_covering_the_contract_day(backend):
+    inputs = crossing(
+        [
+            ("12345678000190", "2021-02-01"),
+            ("12345678000190", "2021-04-15"),
+            ("12345678000190", "2021-12-31"),
+            ("12345678000190", "2022-02-15"),
+            ("12345678000190", "2023-01-01"),
+        ],
+        [
+            ("12345678000190", "2021-01-01", "2021-06-30"),
+            ("12345678000190", "2021-03-01", "2021-12-31"),
+            ("12345678000190", "2021-04-01", "2021-04-30"),
+            ("12345678000190", "2022-03-01", None),
+        ],
+    )
+
+    contracts, groups = overlap_groups(**inputs, backend=backend)
+
+    # 2022-02-15 cai no intervalo entre as sanções
+    assert contracts == [0, 1, 2, 4]
+    assert groups == [[0], [0, 1, 2], [1], [3]]
+    assert grouped_pairs(inputs, backend) == pairs(inputs, "python")
+
+
+def test_check_parity_reports_ok():
+    result = check_parity(contracts=2_000, sanctions=300, documents=80)
+
+    assert result["ok"], result
+    assert set(result["backends"]) == set(BACKENDS)
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pandas as pd
+
+from politicos.models import parse_contract_row, parse_sanction_row
+
+
+def test_sanction_row_normalizes_document_and_dates():
+    record = parse_sanction_row(
+        pd.Series(
+            {
+                "source_id": " 7 ",
+                "cnpj_cpf": "1.234.567/0001-90",
+                "name": "Empresa",
+                "sanction_start": "2025-06-10",
+                "sanction_end": "10/07/2025",
+                "sanction_type": "Inidoneidade",
+            }
+        )
+    )
+
+    assert record.source_id == "7"
+    assert record.cnpj_cpf == "01234567000190"
+    # ISO não é lido como dia primeiro
+    assert record.sanction_start == date(2025, 6, 10)
+    assert record.sanction_end == date(2025, 7, 10)
+
+
+def test_missing_and_invalid_values():
+    sanction = parse_sanction_row(pd.Series({"cnpj_cpf": pd.NA, "sanction_start": pd.NA, "sanction_end": ""}))
+    contract = parse_contract_row(
+        pd.Series({"supplier_document": 1234567000190.0, "contract_date": "2024-13-40", "contract_value": "abc"})
+    )
+
+    assert sanction.cnpj_cpf == ""
+    assert sanction.sanction_start is None and sanction.sanction_end is None
+    assert contract.supplier_document == "01234567000190"
+    assert contract.contract_date is None
+    assert contract.contract_value is None
@@ -4,12 +4,11 @@ Copyright (c) 2019 - present AppSeed.us
 """
 
 import os
-from   flask_migrate import Migrate
-from   flask_minify  import Minify
 from   sys import exit
 
 from apps.config import config_dict
 from apps import create_app, db
+from apps.startup import profile_step, report, warm_up
 
 # WARNING: Don't run with debug turned on in production!
 DEBUG = (os.getenv('DEBUG', 'False') == 'True')
@@ -25,29 +24,41 @@ try:
 except KeyError:
     exit('Error: Invalid <config_mode>. Expected values [Debug, Production] ')
 
-app = create_app(app_config)
+with profile_step('create_app'):
+    app = create_app(app_config)
 
-# Create tables & Fallback to SQLite
-with app.app_context():
+def create_tables():
+    # Create tables & Fallback to SQLite
+    with app.app_context():
     
-    try:
-        db.create_all()
-    except Exception as e:
+        try:
+            db.create_all()
+        except Exception as e:
 
-        print('> Error: DBMS Exception: ' + str(e) )
+            print('> Error: DBMS Exception: ' + str(e) )
 
-        # fallback to SQLite
-        basedir = os.path.abspath(os.path.dirname(__file__))
-        app.config['SQLALCHEMY_DATABASE_URI'] = SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(basedir, 'db.sqlite3')
+            # fallback to SQLite
+            basedir = os.path.abspath(os.path.dirname(__file__))
+            app.config['SQLALCHEMY_DATABASE_URI'] = SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(basedir, 'db.sqlite3')
 
-        print('> Fallback to SQLite ')
-        db.create_all()
+            print('> Fallback to SQLite ')
+            db.create_all()
 
-# Apply all changes
-Migrate(app, db)
+# Schema creation on import is opt-in outside of DEBUG (DB_CREATE_ALL=True); `python run.py` always creates it
+if os.getenv('DB_CREATE_ALL', str(DEBUG)) == 'True':
+    with profile_step('db.create_all'):
+        create_tables()
+
+# Flask-Migrate (alembic) is only needed by the `flask db` commands
+if os.getenv('FLASK_RUN_FROM_CLI') == 'true':
+    from flask_migrate import Migrate
+    Migrate(app, db)
 
 if not DEBUG:
+    from flask_minify import Minify
     Minify(app=app, html=True, js=False, cssless=False)
+
+report()
     
 if DEBUG:
     app.logger.info('DEBUG            = ' + str(DEBUG)             )
@@ -55,4 +66,6 @@ if DEBUG:
     app.logger.info('DBMS             = ' + app_config.SQLALCHEMY_DATABASE_URI)
 
 if __name__ == "__main__":
+    create_tables()
+    warm_up(app)
     app.run()
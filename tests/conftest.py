@@ -0,0 +1,39 @@
+import pytest
+
+from apps import create_app, db
+from apps.config import config_dict
+
+
+@pytest.fixture
+def app(tmp_path):
+    class TestConfig(config_dict['Debug']):
+        TESTING = True
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + str(tmp_path / 'db.sqlite3')
+        DYN_DT_CACHE_DIR = str(tmp_path / 'cache')
+        SNAPSHOT_DIR = str(tmp_path / 'snapshots')
+
+    app = create_app(TestConfig)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def logged_client(app, client):
+    from apps.authentication.models import Users
+
+    user = Users(username='analista', email='analista@example.com', password='senha')
+    db.session.add(user)
+    db.session.commit()
+
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user.id)
+        session['_fresh'] = True
+    return client
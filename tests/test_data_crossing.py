@@ -0,0 +1,26 @@
+import logging
+import zipfile
+
+from apps.home.data_crossing_service import load_contratos_csv
+
+
+def test_contract_values_accept_comma_decimals(tmp_path, caplog):
+    text = (
+        "numero_contrato;cpf_cnpj;nome;data_assinatura;valor;orgao\n"
+        "1/2024;12.345.678/0001-90;Fornecedora Ltda;10/03/2024;1.234,56;Ministério da Saúde\n"
+        "2/2024;12.345.678/0001-90;Fornecedora Ltda;2024-04-01;987.10;Ministério da Saúde\n"
+        "3/2024;98.765.432/0001-10;Outra S.A.;2024-05-02;não informado;Ministério da Educação\n"
+        "4/2024;98.765.432/0001-10;Outra S.A.;2024-05-03;;Ministério da Educação\n"
+    )
+    path = tmp_path / "contratos.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("contratos.csv", text.encode("latin-1"))
+
+    with caplog.at_level(logging.WARNING, logger="apps.home.data_crossing_service"):
+        contratos = load_contratos_csv(path)
+
+    assert [c["valor"] for c in contratos] == [1234.56, 987.1, None, None]
+    assert contratos[0]["orgao"] == "Ministério da Saúde"
+    # Só o valor ilegível é registrado; o vazio é apenas ausente
+    assert len(caplog.records) == 1
+    assert "linha 3" in caplog.text and "não informado" in caplog.text
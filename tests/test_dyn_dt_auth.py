@@ -0,0 +1,58 @@
+import pytest
+
+from apps import db
+from apps.models import RISK_LEVEL, ConsultaIntegridade
+
+DENIED = (302, 401, 403)
+
+TABLES = ['sancoes', 'contratos', 'alertas_integridade', 'consultas_integridade', 'politicos']
+
+
+@pytest.fixture
+def consulta(app):
+    registro = ConsultaIntegridade(
+        cpf_cnpj='52998224725', tipo_documento='CPF', nivel_risco=RISK_LEVEL.baixo, ip_origem='203.0.113.7'
+    )
+    db.session.add(registro)
+    db.session.commit()
+    return registro
+
+
+@pytest.mark.parametrize('table', TABLES)
+def test_anonymous_table_view_is_denied(client, table):
+    assert client.get(f'/dynamic-dt/{table}').status_code in DENIED
+
+
+@pytest.mark.parametrize('query', ['', '?gzip=1'])
+@pytest.mark.parametrize('table', TABLES)
+def test_anonymous_export_is_denied(client, table, query):
+    response = client.get(f'/export/{table}{query}')
+
+    assert response.status_code in DENIED
+    assert response.mimetype not in ('text/csv', 'application/gzip')
+
+
+def test_anonymous_export_does_not_leak_rows(client, consulta):
+    response = client.get('/export/consultas_integridade')
+
+    assert response.status_code in DENIED
+    assert b'203.0.113.7' not in response.data
+
+
+@pytest.mark.parametrize('method, url', [
+    ('get', '/dynamic-dt'),
+    ('post', '/create_filter/sancoes'),
+    ('post', '/create_page_items/sancoes'),
+    ('post', '/create_hide_show_filter/sancoes'),
+    ('get', '/delete_filter/sancoes/1'),
+])
+def test_anonymous_settings_routes_are_denied(client, method, url):
+    assert getattr(client, method)(url).status_code in DENIED
+
+
+def test_logged_user_can_view_and_export(logged_client, consulta):
+    assert logged_client.get('/dynamic-dt/consultas_integridade').status_code == 200
+
+    response = logged_client.get('/export/consultas_integridade')
+    assert response.status_code == 200
+    assert b'203.0.113.7' in response.data